@@ -0,0 +1,90 @@
+import argparse
+import sys
+from backend.config import DB_PATH
+from backend.database.catalogo import CatalogoPalavras
+from backend.database.schema import criar_banco
+from backend.game.avaliacao import (
+    LIMIAR_ATUAL,
+    ResultadoReplay,
+    carregar_dataset,
+    comparar,
+    criar_pontuador,
+    curva_limiares,
+    percentis,
+    reproduzir,
+)
+
+DATASET_PADRAO = "backend/database/respostas_rotuladas.csv"
+
+
+def imprimir_resultado(resultado: ResultadoReplay):
+    print(f"\n=== {resultado.nome} ({len(resultado.esperados)} respostas) ===")
+    latencias = percentis(resultado.latencias_us)
+    minima = latencias.pop("min", 0.0)
+    print(f"Vazão: {resultado.respostas_por_segundo:,.0f} respostas/s | "
+          f"latência (µs, {len(resultado.latencias_us)} medições): "
+          + ", ".join(f"{nome}={valor:.1f}" for nome, valor in latencias.items())
+          + f" | mínima={minima:.1f}")
+    print(f"{'limiar':>7} {'precisão':>9} {'recall':>7} {'f1':>6} {'fp':>4} {'fn':>4}")
+    for ponto in curva_limiares(resultado):
+        marca = "  <- atual" if abs(ponto["limiar"] - LIMIAR_ATUAL) < 1e-9 else ""
+        print(f"{ponto['limiar']:>7.2f} {ponto['precisao']:>9.3f} {ponto['recall']:>7.3f} "
+              f"{ponto['f1']:>6.3f} {ponto['fp']:>4} {ponto['fn']:>4}{marca}")
+
+
+def imprimir_comparacao(base: ResultadoReplay, novo: ResultadoReplay) -> int:
+    diff = comparar(base, novo)
+    print(f"\n=== {base.nome} -> {novo.nome} ===")
+    for nome, chave in (("base", "acuracia_base"), ("novo", "acuracia_nova")):
+        acuracia = diff[chave]
+        print(f"{nome}: precisão {acuracia['precisao']:.3f}, recall {acuracia['recall']:.3f}, f1 {acuracia['f1']:.3f}")
+    if diff["ganho_vazao"]:
+        print(f"Vazão: {diff['ganho_vazao']:.2f}x")
+    print(f"Similaridades diferentes: {diff['similaridades_diferentes']} (maior diferença {diff['maior_diferenca']:.4f})")
+    print(f"Decisões diferentes: {len(diff['decisoes_diferentes'])}")
+    for d in diff["decisoes_diferentes"]:
+        print(f"  [{'certo' if d['esperado'] else 'errado'}] {d['palavra']}: '{d['resposta']}' "
+              f"{d['similaridade_base']:.3f}/{d['acerto_base']} -> {d['similaridade_nova']:.3f}/{d['acerto_novo']}")
+    return len(diff["decisoes_diferentes"])
+
+
+def main():
+    """Reproduz um dataset rotulado contra o avaliador e mede acurácia e desempenho"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--dataset", default=DATASET_PADRAO)
+    parser.add_argument("--pontuador", default="radicais",
+                        help="radicais, sem-correcao, tfidf, incremental ou hashing")
+    parser.add_argument("--comparar", help="Outro pontuador para comparar com o primeiro")
+    parser.add_argument("--base", help="Resultado salvo (--salvar) de outra versão do código")
+    parser.add_argument("--salvar", help="Grava o resultado em JSON para comparações futuras")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    # Garante as tabelas usadas pelos pontuadores em bancos antigos
+    if not criar_banco(DB_PATH):
+        print("❌ Erro ao preparar o banco")
+        sys.exit(2)
+    exemplos = carregar_dataset(args.dataset)
+    catalogo = CatalogoPalavras.construir(DB_PATH)
+
+    resultado = reproduzir(args.pontuador, criar_pontuador(args.pontuador, DB_PATH, catalogo),
+                           exemplos, catalogo, args.repeticoes)
+    imprimir_resultado(resultado)
+    if args.salvar:
+        resultado.salvar(args.salvar)
+        print(f"\n💾 Resultado gravado em {args.salvar}")
+
+    divergencias = 0
+    if args.comparar:
+        outro = reproduzir(args.comparar, criar_pontuador(args.comparar, DB_PATH, catalogo),
+                           exemplos, catalogo, args.repeticoes)
+        imprimir_resultado(outro)
+        divergencias += imprimir_comparacao(resultado, outro)
+    if args.base:
+        divergencias += imprimir_comparacao(ResultadoReplay.carregar(args.base), resultado)
+
+    # Código de saída diferente de zero quando alguma decisão mudou
+    sys.exit(1 if divergencias else 0)
+
+if __name__ == "__main__":
+    main()
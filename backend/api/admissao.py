@@ -0,0 +1,199 @@
+import asyncio
+import heapq
+import itertools
+import json
+import time
+from typing import Dict, List, Optional, Tuple
+
+from backend.config import ADMISSAO_PRIORIDADES, ADMISSAO_RETRY_AFTER, ADMISSAO_ROTAS
+
+CABECALHO_PRIORIDADE = b'x-prioridade'
+
+# Entradas de quem desistiu (timeout ou cancelamento) ficam no heap até serem
+# retiradas pelo `sair`; acima deste número (ou do total de quem ainda espera)
+# o heap é compactado
+_MORTAS_MAXIMAS = 64
+
+
+def interpretar_rotas(config: str) -> Dict[str, Tuple[int, int, float]]:
+    """'/api/x=4:16:10,...' -> {'/api/x': (concorrentes, fila, espera_maxima)}"""
+    rotas = {}
+    for item in filter(None, (parte.strip() for parte in config.split(','))):
+        caminho, limites = item.split('=')
+        concorrentes, fila, espera = limites.split(':')
+        rotas[caminho.strip()] = (int(concorrentes), int(fila), float(espera))
+    return rotas
+
+
+def interpretar_prioridades(config: str) -> Dict[bytes, int]:
+    """'interativa:0,background:1' -> {b'interativa': 0, b'background': 1}"""
+    prioridades = {}
+    for item in filter(None, (parte.strip() for parte in config.split(','))):
+        nome, valor = item.split(':')
+        prioridades[nome.strip().encode('latin-1')] = int(valor)
+    return prioridades
+
+
+class LimitadorRota:
+    """
+    Limite de requisições simultâneas de uma rota, com fila de espera
+    limitada e ordenada por prioridade (menor valor passa antes).
+
+    Quem chega com a fila cheia, ou espera mais que `espera_maxima`
+    segundos, é recusado na hora em vez de ocupar uma thread do pool.
+    O tamanho da fila é um contador dos que ainda esperam; as entradas de
+    quem desistiu são removidas do heap de forma preguiçosa.
+    """
+
+    def __init__(self, nome: str, max_concorrentes: int, max_fila: int, espera_maxima: float):
+        self.nome = nome
+        self.max_concorrentes = max_concorrentes
+        self.max_fila = max_fila
+        self.espera_maxima = espera_maxima
+        self.ativos = 0
+        self._fila: List[tuple] = []  # heap de (prioridade, ordem, future)
+        self._esperando = 0  # futures ainda pendentes no heap
+        self._mortas = 0  # entradas de quem desistiu, ainda no heap
+        self._ordem = itertools.count()
+        self._contadores = {"admitidas": 0, "recusadas_fila_cheia": 0, "recusadas_timeout": 0}
+        self._espera_total = 0.0
+        self._espera_maxima_observada = 0.0
+        self._esperas = 0
+
+    def _desistiu(self, futuro: asyncio.Future):
+        """Cancela a espera e marca a entrada no heap como morta"""
+        futuro.cancel()
+        self._esperando -= 1
+        self._mortas += 1
+        if self._mortas > max(_MORTAS_MAXIMAS, self._esperando):
+            self._fila = [entrada for entrada in self._fila if not entrada[2].done()]
+            heapq.heapify(self._fila)
+            self._mortas = 0
+
+    def _registrar_espera(self, segundos: float):
+        self._espera_total += segundos
+        self._esperas += 1
+        self._espera_maxima_observada = max(self._espera_maxima_observada, segundos)
+
+    async def entrar(self, prioridade: int = 0) -> bool:
+        """Retorna True quando a requisição pode seguir; False se foi recusada"""
+        if self.ativos < self.max_concorrentes and not self._esperando:
+            self.ativos += 1
+            self._contadores["admitidas"] += 1
+            return True
+        if self._esperando >= self.max_fila:
+            self._contadores["recusadas_fila_cheia"] += 1
+            return False
+
+        futuro = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._fila, (prioridade, next(self._ordem), futuro))
+        self._esperando += 1
+        inicio = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(futuro), self.espera_maxima)
+        except asyncio.TimeoutError:
+            if futuro.done() and not futuro.cancelled():
+                # A vaga foi liberada no mesmo instante do timeout
+                self._registrar_espera(time.perf_counter() - inicio)
+                self._contadores["admitidas"] += 1
+                return True
+            self._desistiu(futuro)
+            self._contadores["recusadas_timeout"] += 1
+            return False
+        except asyncio.CancelledError:
+            # Cliente desistiu: devolve a vaga se ela já tinha sido repassada
+            if futuro.done() and not futuro.cancelled():
+                self.sair()
+            else:
+                self._desistiu(futuro)
+            raise
+        self._registrar_espera(time.perf_counter() - inicio)
+        self._contadores["admitidas"] += 1
+        return True
+
+    def sair(self):
+        """Libera a vaga, repassando-a direto ao próximo da fila se houver"""
+        while self._fila:
+            _, _, futuro = heapq.heappop(self._fila)
+            if not futuro.done():
+                futuro.set_result(True)
+                self._esperando -= 1
+                return
+            self._mortas -= 1
+        self.ativos -= 1
+
+    def metricas(self) -> dict:
+        return {
+            **self._contadores,
+            "ativos": self.ativos,
+            "na_fila": self._esperando,
+            "entradas_mortas": self._mortas,
+            "espera_media_ms": round(self._espera_total / self._esperas * 1000, 3) if self._esperas else 0.0,
+            "espera_maxima_ms": round(self._espera_maxima_observada * 1000, 3),
+        }
+
+
+class ControleAdmissao:
+    """
+    Conjunto de limitadores por rota. Rotas presas ao LLM ganham limites
+    próprios e não conseguem esgotar o threadpool usado pelas rotas baratas.
+    A prioridade vem do cabeçalho X-Prioridade (ex.: 'interativa' ou
+    'background'), mapeado por ADMISSAO_PRIORIDADES.
+    """
+
+    def __init__(self, rotas: Optional[Dict[str, Tuple[int, int, float]]] = None,
+                 prioridades: Optional[Dict[bytes, int]] = None,
+                 retry_after: int = ADMISSAO_RETRY_AFTER):
+        rotas = interpretar_rotas(ADMISSAO_ROTAS) if rotas is None else rotas
+        self.limitadores = {
+            caminho: LimitadorRota(caminho, *limites) for caminho, limites in rotas.items()
+        }
+        self.prioridades = interpretar_prioridades(ADMISSAO_PRIORIDADES) if prioridades is None else prioridades
+        self.prioridade_padrao = min(self.prioridades.values(), default=0)
+        self.retry_after = retry_after
+
+    def prioridade(self, headers: List[tuple]) -> int:
+        for nome, valor in headers:
+            if nome == CABECALHO_PRIORIDADE:
+                return self.prioridades.get(valor.lower(), self.prioridade_padrao)
+        return self.prioridade_padrao
+
+    def metricas(self) -> dict:
+        return {caminho: limitador.metricas() for caminho, limitador in self.limitadores.items()}
+
+
+class MiddlewareAdmissao:
+    """
+    Middleware ASGI que passa cada requisição pelo limitador da sua rota e
+    responde 503 com Retry-After, sem chegar ao endpoint, quando ela é
+    recusada. Rotas sem limitador passam direto.
+    """
+
+    def __init__(self, app, controle: ControleAdmissao):
+        self.app = app
+        self.controle = controle
+
+    async def __call__(self, scope, receive, send):
+        limitador = self.controle.limitadores.get(scope["path"]) if scope["type"] == "http" else None
+        if limitador is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await limitador.entrar(self.controle.prioridade(scope.get("headers", []))):
+            corpo = json.dumps({"detail": "Servidor ocupado, tente novamente"}).encode('utf-8')
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(corpo)).encode('latin-1')),
+                    (b"retry-after", str(self.controle.retry_after).encode('latin-1')),
+                ],
+            })
+            await send({"type": "http.response.body", "body": corpo})
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limitador.sair()
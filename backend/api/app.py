@@ -0,0 +1,61 @@
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+from backend import metricas
+from backend.api.admissao import ControleAdmissao, MiddlewareAdmissao
+from backend.api.endpoints import router
+from backend.api.profiling import MiddlewareProfiling, Perfilador
+from backend.api.servicos import criar_servicos, encerrar_servicos, iniciar_servicos, limpar_frases
+from backend.config import DB_PATH, PROFILING_ATIVO
+from backend.database.migracoes import migrar
+from backend.database.schema import criar_banco
+
+
+# FastAPI com lifespan para criar banco, limpar frases em dev e montar os
+# serviços compartilhados (uma vez por processo)
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    if not criar_banco(DB_PATH):
+        raise RuntimeError("Falha ao criar banco")
+    # Leva bancos existentes até a versão atual do esquema e roda ANALYZE
+    migrar(DB_PATH)
+    limpar_frases(DB_PATH)
+    servicos = criar_servicos(DB_PATH)
+    iniciar_servicos(servicos)
+    app.state.servicos = servicos
+    yield
+    encerrar_servicos(servicos)
+
+
+def criar_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    # Controle de admissão por rota; registrado antes do CORS para ficar por
+    # dentro dele e as respostas 503 também levarem os cabeçalhos CORS
+    admissao = ControleAdmissao()
+    app.add_middleware(MiddlewareAdmissao, controle=admissao)
+    metricas.registrar_provedor("admissao", admissao.metricas)
+    app.state.admissao = admissao
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://localhost:5173"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Profiling opcional: sem PROFILING_ATIVO o middleware nem é registrado
+    perfilador = Perfilador() if PROFILING_ATIVO else None
+    if perfilador:
+        if perfilador.token is None:
+            print("[WARN] PROFILING_TOKEN não configurado: os perfis são gravados, mas /api/debug/perfis fica fechado")
+        app.add_middleware(MiddlewareProfiling, perfilador=perfilador)
+        metricas.registrar_provedor("profiling", perfilador.metricas)
+    app.state.perfilador = perfilador
+
+    app.include_router(router)
+    return app
@@ -0,0 +1,77 @@
+import sqlite3
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from fastapi import Depends, HTTPException, Request
+
+from backend.api.profiling import Perfilador
+from backend.api.servicos import Servicos
+from backend.config import ADMISSAO_RETRY_AFTER
+from backend.database.catalogo import CatalogoPalavras
+from backend.database.pool import PoolEsgotado
+from backend.game.gerador_frases import GeradorFrases
+from backend.game.processamento import AvaliadorRespostas
+
+
+def obter_servicos(request: Request) -> Servicos:
+    return request.app.state.servicos
+
+
+def obter_catalogo(servicos: Servicos = Depends(obter_servicos)) -> CatalogoPalavras:
+    return servicos.catalogo
+
+
+def obter_avaliador(servicos: Servicos = Depends(obter_servicos)) -> AvaliadorRespostas:
+    return servicos.avaliador
+
+
+def obter_gerador(servicos: Servicos = Depends(obter_servicos)) -> GeradorFrases:
+    return servicos.gerador
+
+
+def obter_perfilador(request: Request) -> Optional[Perfilador]:
+    return request.app.state.perfilador
+
+
+@contextmanager
+def conexao_primario(servicos: Servicos) -> Iterator[sqlite3.Connection]:
+    """Conexão do pool com o banco principal pelo tempo do bloco; pool esgotado vira 503"""
+    try:
+        conn = servicos.pool.adquirir()
+    except PoolEsgotado as e:
+        raise HTTPException(status_code=503, detail=str(e),
+                            headers={"Retry-After": str(ADMISSAO_RETRY_AFTER)})
+    try:
+        yield conn
+    finally:
+        servicos.pool.devolver(conn)
+
+
+@contextmanager
+def conexao_leitura(servicos: Servicos) -> Iterator[sqlite3.Connection]:
+    """Conexão somente leitura pelo tempo do bloco: réplica quando ativas, senão o pool do primário"""
+    if not servicos.replicas:
+        with conexao_primario(servicos) as conn:
+            yield conn
+        return
+    conn = servicos.replicas.conectar()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+# As dependências abaixo seguram a conexão até o fim da requisição; rotas que
+# chamam o LLM usam os blocos acima só em volta dos acessos ao banco
+
+
+def obter_conexao(servicos: Servicos = Depends(obter_servicos)) -> Iterator[sqlite3.Connection]:
+    """Conexão do pool com o banco principal, devolvida ao fim da requisição"""
+    with conexao_primario(servicos) as conn:
+        yield conn
+
+
+def obter_conexao_leitura(servicos: Servicos = Depends(obter_servicos)) -> Iterator[sqlite3.Connection]:
+    """Conexão para consultas somente leitura: réplica quando ativas, senão o pool do primário"""
+    with conexao_leitura(servicos) as conn:
+        yield conn
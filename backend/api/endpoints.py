@@ -1,25 +1,286 @@
-from fastapi import APIRouter, HTTPException
-from backend.database import get_palavra_por_termo
-from backend.game.processamento import AvaliadorRespostas
-from .models import VerificacaoRequest, VerificacaoResposta
+import sqlite3
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 
+from backend import metricas
+from backend.api.dependencias import (
+    conexao_leitura, conexao_primario, obter_avaliador, obter_catalogo, obter_conexao_leitura,
+    obter_gerador, obter_perfilador, obter_servicos,
+)
+from backend.api.models import (
+    BuscaResposta, GerarFraseRequest, GerarFraseResponse, PalavraResposta, RankingResposta,
+    Sugestao, VerificacaoRequest, VerificacaoResposta,
+)
+from backend.api.profiling import Perfilador, executar_em_thread
+from backend.api.servicos import Servicos
+from backend.config import LIMITE_FRASES, RANKING_K
+from backend.database.busca import TIPOS_BUSCA, autocompletar, buscar
+from backend.database.catalogo import CatalogoPalavras
+from backend.database.models import Tentativa
+from backend.database.queries import SQL_FRASES_DA_PALAVRA, SQL_TOTAL_FRASES, SQL_ULTIMA_FRASE
+from backend.database.tentativas import agora_utc
+from backend.game.frases import gerar_frase_distinta
+from backend.game.gerador_frases import GeradorFrases
+from backend.game.processamento import AvaliadorRespostas
+from backend.game.selecao import DISTRIBUICAO_POR_NIVEL
 
+# As rotas são assíncronas; tudo o que bloqueia (SQLite, pontuação, chamadas
+# ao LLM) roda no threadpool via executar_em_thread, fora do event loop
 router = APIRouter(prefix="/api")
 
-@router.post("/verificar", response_model=VerificacaoResposta)
-async def verificar_resposta(request: VerificacaoRequest):
+
+def _frases_da_palavra(conn: sqlite3.Connection, palavra_id: int) -> List[str]:
+    return [r['frase'] for r in conn.execute(SQL_FRASES_DA_PALAVRA, (palavra_id,)).fetchall()]
+
+
+def _atualizar_elegibilidade(servicos: Servicos, palavra_id: int, total: int):
+    """Retira a palavra do sorteio ao atingir o limite de frases ou a devolve se ainda houver vaga"""
+    if total >= LIMITE_FRASES:
+        servicos.seletor.remover(palavra_id)
+        return
+    palavra = servicos.catalogo.por_id(palavra_id) if servicos.catalogo else None
+    if palavra:
+        servicos.seletor.adicionar(palavra_id, palavra.categoria_nome, palavra.dificuldade)
+
+
+def _garantir_frase_inicial(servicos: Servicos, gerador: GeradorFrases, palavra) -> List[str]:
+    """Frases da palavra no primário; se não houver nenhuma, gera e grava a inicial"""
+    with conexao_primario(servicos) as conn:
+        frases = _frases_da_palavra(conn, palavra.id)
+    if frases:
+        return frases
+    print(f"[DEBUG] Gerando frase inicial para palavra ID={palavra.id}")
+    # Nenhuma conexão fica presa durante a chamada ao LLM
+    resultado = gerar_frase_distinta(
+        lambda: conexao_primario(servicos), gerador, servicos.detector, palavra.id, palavra.palavra,
+        palavra.definicao, palavra.categoria_nome,
+    )
+    _atualizar_elegibilidade(servicos, palavra.id, resultado.total)
+    print(f"[DEBUG] Frase inicial gerada: {resultado.frase}")
+    if resultado.frase is None:
+        # Outra requisição gravou as frases enquanto esta gerava
+        with conexao_primario(servicos) as conn:
+            return _frases_da_palavra(conn, palavra.id)
+    return [resultado.frase]
+
+
+# GET /api/palavra-aleatoria
+@router.get("/palavra-aleatoria", response_model=PalavraResposta)
+async def palavra_aleatoria(
+    categoria: Optional[str] = None,
+    dificuldade: Optional[int] = Query(None, ge=1, le=5),
+    nivel: Optional[int] = Query(None, ge=min(DISTRIBUICAO_POR_NIVEL), le=max(DISTRIBUICAO_POR_NIVEL)),
+    servicos: Servicos = Depends(obter_servicos),
+    catalogo: CatalogoPalavras = Depends(obter_catalogo),
+    gerador: GeradorFrases = Depends(obter_gerador),
+):
+    print("[DEBUG] Iniciando busca de palavra aleatória")
+    palavra_id = servicos.seletor.sortear(categoria=categoria, dificuldade=dificuldade, nivel=nivel)
+    if palavra_id is None:
+        print("[DEBUG] Nenhuma palavra encontrada")
+        raise HTTPException(status_code=404, detail="Todas as palavras completaram as frases")
+
+    palavra = catalogo.por_id(palavra_id)
+    print("[DEBUG] Palavra sorteada:", palavra.palavra if palavra else None)
+    if not palavra:
+        print("[DEBUG] Palavra sorteada não existe mais")
+        servicos.seletor.remover(palavra_id)
+        raise HTTPException(status_code=404, detail="Palavra não encontrada")
+
     try:
-        palavra = get_palavra_por_termo(DB_PATH, request.palavra)
-        if not palavra:
-            raise HTTPException(status_code=404, detail="Palavra não encontrada")
-        
-        similaridade, aceita = avaliador.avaliar_resposta(request.resposta, palavra.definicao)
-        
-        return {
-            "acerto": aceita,
-            "similaridade": float(similaridade),
-            "definicao_correta": palavra.definicao if not aceita else None
+        # Busca frases existentes; a conexão de leitura é devolvida antes de
+        # uma eventual geração, que pode demorar
+        def ler_frases():
+            with conexao_leitura(servicos) as leitura:
+                return _frases_da_palavra(leitura, palavra.id)
+        frases = await executar_em_thread(ler_frases)
+        print("[DEBUG] Frases encontradas:", frases)
+
+        # Se não tem nenhuma frase, gera a frase inicial (a réplica pode estar
+        # atrás do primário, então ele é reconsultado antes)
+        if not frases:
+            frases = await executar_em_thread(_garantir_frase_inicial, servicos, gerador, palavra)
+
+        resposta = {
+            "id": palavra.id,
+            "termo": palavra.palavra,
+            "categoria": palavra.categoria_nome,
+            "definicao": palavra.definicao,
+            "dificuldade": palavra.dificuldade,
+            "frases": frases,
         }
+        print("[DEBUG] Resposta final:", resposta)
+        return resposta
+    except HTTPException:
+        raise
     except Exception as e:
+        print(f"[ERROR] Erro ao buscar palavra aleatória: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# POST /api/verificar
+@router.post("/verificar", response_model=VerificacaoResposta)
+async def verificar(
+    request: VerificacaoRequest,
+    servicos: Servicos = Depends(obter_servicos),
+    catalogo: CatalogoPalavras = Depends(obter_catalogo),
+    avaliador: AvaliadorRespostas = Depends(obter_avaliador),
+):
+    linha = catalogo.linha_por_termo(request.palavra)
+    if linha is None:
+        raise HTTPException(status_code=404, detail=f"Palavra '{request.palavra}' não encontrada")
+    definicao = catalogo.definicoes[linha]
+    sim, ok = await executar_em_thread(
+        avaliador.avaliar_resposta, request.resposta.lower().strip(), definicao.lower(),
+        palavra_id=catalogo.ids[linha],
+    )
+    # Registro assíncrono: a gravação acontece em lote fora do caminho da
+    # requisição; o registro em si pode esperar (backpressure), então vai
+    # para o threadpool
+    await executar_em_thread(servicos.buffer_tentativas.registrar, Tentativa(
+        jogador=(request.jogador or "").strip()[:64] or "anonimo",
+        palavra_id=catalogo.ids[linha],
+        categoria=catalogo.categoria(linha),
+        resposta=request.resposta,
+        similaridade=float(sim),
+        acerto=bool(ok),
+        pontos=1 if ok else 0,
+        data_criacao=agora_utc(),
+    ))
+    feedback = (
+        "✅ Correto!" if ok else
+        f"⚠️ Quase! ({sim:.0%})" if sim > 0.7 else
+        "❌ Incorreto"
+    )
+    return {"acerto": ok, "similaridade": sim, "definicao_correta": None if ok else definicao, "feedback": feedback}
+
+
+def _gerar_frase(servicos: Servicos, gerador: GeradorFrases, request: GerarFraseRequest) -> dict:
+    try:
+        with conexao_primario(servicos) as conn:
+            total = conn.execute(SQL_TOTAL_FRASES, (request.palavra_id,)).fetchone()["total"]
+        if total < LIMITE_FRASES:
+            # gerar (quase duplicatas são regeneradas e nunca ocupam vaga);
+            # o limite é reconferido na transação que grava, e nenhuma
+            # conexão fica presa durante a chamada ao LLM
+            resultado = gerar_frase_distinta(
+                lambda: conexao_primario(servicos), gerador, servicos.detector, request.palavra_id, request.palavra, request.definicao,
+                request.categoria,
+            )
+            total = resultado.total
+            _atualizar_elegibilidade(servicos, request.palavra_id, total)
+            if resultado.frase is not None:
+                return {"frase": resultado.frase, "frases_restantes": max(0, LIMITE_FRASES - total)}
+            if not resultado.no_limite:
+                raise HTTPException(
+                    status_code=409,
+                    detail="Nenhuma frase nova: todas as tentativas repetiram frases existentes",
+                )
+        servicos.seletor.remover(request.palavra_id)
+        with conexao_primario(servicos) as conn:
+            ultima = conn.execute(SQL_ULTIMA_FRASE, (request.palavra_id,)).fetchone()["frase"]
+        return {"frase": ultima, "frases_restantes": 0}
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"[ERROR] gerar-frase: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# POST /api/gerar-frase
+@router.post("/gerar-frase", response_model=GerarFraseResponse)
+async def gerar_frase(
+    request: GerarFraseRequest,
+    servicos: Servicos = Depends(obter_servicos),
+    gerador: GeradorFrases = Depends(obter_gerador),
+):
+    return await executar_em_thread(_gerar_frase, servicos, gerador, request)
+
+# GET /api/busca
+@router.get("/busca", response_model=BuscaResposta)
+async def busca(
+    q: str = Query(..., min_length=1, max_length=200),
+    tipo: str = "palavras",
+    pagina: int = Query(1, ge=1),
+    tamanho: int = Query(20, ge=1, le=100),
+    conn: sqlite3.Connection = Depends(obter_conexao_leitura),
+):
+    if tipo not in TIPOS_BUSCA:
+        raise HTTPException(status_code=400, detail=f"Tipo inválido: {tipo}")
+    try:
+        resultados, tem_mais = await executar_em_thread(buscar, conn, q, tipo, pagina, tamanho)
+    except sqlite3.Error as e:
+        raise HTTPException(status_code=400, detail=f"Consulta inválida: {e}")
+    return {"consulta": q, "pagina": pagina, "tamanho": tamanho, "resultados": resultados, "tem_mais": tem_mais}
+
+# GET /api/autocomplete
+@router.get("/autocomplete", response_model=List[Sugestao])
+async def autocomplete(
+    prefixo: str = Query(..., min_length=1, max_length=100),
+    limite: int = Query(10, ge=1, le=50),
+    conn: sqlite3.Connection = Depends(obter_conexao_leitura),
+):
+    return await executar_em_thread(autocompletar, conn, prefixo, limite)
+
+# GET /api/ranking
+@router.get("/ranking", response_model=RankingResposta)
+async def obter_ranking(
+    response: Response,
+    escopo: str = "global",
+    valor: Optional[str] = None,
+    k: int = Query(10, ge=1, le=RANKING_K),
+    if_none_match: Optional[str] = Header(None),
+    servicos: Servicos = Depends(obter_servicos),
+):
+    ranking = servicos.ranking
+    try:
+        escopo, valor, versao, itens = ranking.consultar(escopo, valor, k)
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
-    
\ No newline at end of file
+
+    etag = f'"{ranking.instancia}-{escopo}-{valor or ""}-{k}-{versao}"'
+    if if_none_match == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return {
+        "escopo": escopo,
+        "valor": valor,
+        "itens": [
+            {"posicao": i, "jogador": jogador, "pontos": pontos}
+            for i, (jogador, pontos) in enumerate(itens, 1)
+        ],
+    }
+
+# GET /api/metricas
+@router.get("/metricas")
+async def obter_metricas():
+    return metricas.coletar()
+
+# GET /api/debug/perfis
+@router.get("/debug/perfis")
+async def listar_perfis(
+    limite: int = Query(20, ge=1, le=100),
+    x_profile: Optional[str] = Header(None),
+    perfilador: Optional[Perfilador] = Depends(obter_perfilador),
+):
+    if not perfilador:
+        raise HTTPException(status_code=404, detail="Profiling desativado")
+    if not perfilador.autorizado(x_profile):
+        raise HTTPException(status_code=403, detail="Token de profiling inválido")
+    return perfilador.mais_lentas(limite)
+
+# GET /api/debug/perfis/{perfil_id}
+@router.get("/debug/perfis/{perfil_id}", response_class=PlainTextResponse)
+async def obter_perfil(
+    perfil_id: int,
+    x_profile: Optional[str] = Header(None),
+    perfilador: Optional[Perfilador] = Depends(obter_perfilador),
+):
+    if not perfilador:
+        raise HTTPException(status_code=404, detail="Profiling desativado")
+    if not perfilador.autorizado(x_profile):
+        raise HTTPException(status_code=403, detail="Token de profiling inválido")
+    perfil = perfilador.perfil(perfil_id)
+    if perfil is None:
+        raise HTTPException(status_code=404, detail="Perfil não encontrado")
+    return perfil
@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PalavraResposta(BaseModel):
+    id: int
+    termo: str
+    categoria: str
+    definicao: str
+    frases: List[str] = []
+    dificuldade: Optional[int] = None
+
+class VerificacaoRequest(BaseModel):
+    palavra: str
+    resposta: str
+    jogador: Optional[str] = None
+
+class VerificacaoResposta(BaseModel):
+    acerto: bool
+    similaridade: float
+    definicao_correta: Optional[str] = None
+    feedback: str
+
+class GerarFraseRequest(BaseModel):
+    palavra_id: int
+    palavra: str
+    definicao: str
+    categoria: str
+
+class GerarFraseResponse(BaseModel):
+    frase: str
+    frases_restantes: int
+
+class ResultadoBusca(BaseModel):
+    tipo: str
+    palavra_id: int
+    termo: str
+    trecho: str
+
+class BuscaResposta(BaseModel):
+    consulta: str
+    pagina: int
+    tamanho: int
+    resultados: List[ResultadoBusca] = []
+    tem_mais: bool = False
+
+class Sugestao(BaseModel):
+    id: int
+    termo: str
+
+class ItemRanking(BaseModel):
+    posicao: int
+    jogador: str
+    pontos: int
+
+class RankingResposta(BaseModel):
+    escopo: str
+    valor: Optional[str] = None
+    itens: List[ItemRanking] = []
@@ -0,0 +1,251 @@
+import hmac
+import itertools
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+
+from backend.config import (
+    PROFILING_DIR,
+    PROFILING_INTERVALO,
+    PROFILING_MAX_ARQUIVOS,
+    PROFILING_TAXA,
+    PROFILING_TOKEN,
+)
+
+CABECALHO_PROFILING = b'x-profile'
+
+# Threads cujo frame mais interno está nestes arquivos estão ociosas
+# (esperando trabalho) e não entram nas amostras
+_ARQUIVOS_OCIOSOS = ('threading.py', 'selectors.py', 'queue.py')
+
+
+def _rotulo(frame) -> str:
+    codigo = frame.f_code
+    return f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{frame.f_lineno})"
+
+
+class SessaoPerfil:
+    __slots__ = ('id', 'inicio', 'fim', 'amostras', 'frame', 'threads')
+
+    def __init__(self, id: int, frame=None):
+        self.id = id
+        self.inicio = time.perf_counter()
+        self.fim: Optional[float] = None
+        self.amostras: Counter = Counter()
+        self.frame = frame  # frame da corrotina da requisição no event loop
+        self.threads: Set[int] = set()  # threads do pool trabalhando para a requisição
+
+
+# Sessão da requisição em andamento, herdada pelas funções enviadas ao threadpool
+_sessao_atual: ContextVar[Optional[SessaoPerfil]] = ContextVar('sessao_perfil', default=None)
+
+
+def _na_sessao(sessao: SessaoPerfil, func: Callable, *args, **kwargs):
+    ident = threading.get_ident()
+    sessao.threads.add(ident)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sessao.threads.discard(ident)
+
+
+async def executar_em_thread(func: Callable, *args, **kwargs):
+    """
+    run_in_threadpool que, numa requisição perfilada, associa a thread do
+    pool à sessão da requisição enquanto `func` executa
+    """
+    sessao = _sessao_atual.get()
+    if sessao is None:
+        return await run_in_threadpool(func, *args, **kwargs)
+    return await run_in_threadpool(_na_sessao, sessao, func, *args, **kwargs)
+
+
+class Perfilador:
+    """
+    Perfilador por amostragem de pilhas para requisições selecionadas.
+
+    Enquanto houver ao menos uma requisição sendo perfilada, uma thread
+    captura as pilhas das threads ativas a cada `intervalo` segundos. Cada
+    pilha vai só para a sessão dona dela: no event loop, a que tem o frame
+    da sua corrotina na pilha; no threadpool, a que enviou o trabalho por
+    `executar_em_thread`. Cada perfil vira um arquivo em formato de pilhas
+    colapsadas (flamegraph), mantendo apenas os `max_arquivos` mais
+    recentes. Os perfis só podem ser consultados com PROFILING_TOKEN
+    configurado.
+    """
+
+    def __init__(self, diretorio: str | Path = PROFILING_DIR, taxa: float = PROFILING_TAXA,
+                 token: str = PROFILING_TOKEN, max_arquivos: int = PROFILING_MAX_ARQUIVOS,
+                 intervalo: float = PROFILING_INTERVALO):
+        self.diretorio = Path(diretorio)
+        self.taxa = taxa
+        self.token = token.encode('latin-1') if token else None
+        self.max_arquivos = max_arquivos
+        self.intervalo = intervalo
+
+        self._ids = itertools.count(1)
+        self._sessoes: Dict[int, SessaoPerfil] = {}
+        self._registros: deque = deque(maxlen=max_arquivos)
+        self._lock = threading.Lock()
+        self._ativo = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._contadores = {"perfiladas": 0, "amostras": 0}
+        # Perfis de execuções anteriores não são consultáveis, mas ocupam disco
+        self._podar()
+
+    def _podar(self):
+        """Mantém no diretório só os `max_arquivos` perfis mais recentes"""
+        try:
+            arquivos = sorted(self.diretorio.glob("*.folded"), key=lambda a: a.stat().st_mtime_ns)
+            for arquivo in arquivos[:max(0, len(arquivos) - self.max_arquivos)]:
+                arquivo.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[WARN] Não foi possível podar os perfis: {e}")
+
+    def autorizado(self, token: Optional[str]) -> bool:
+        """Sem token configurado, a consulta dos perfis fica fechada"""
+        return self.token is not None and hmac.compare_digest((token or "").encode('latin-1'), self.token)
+
+    def deve_perfilar(self, headers: List[tuple]) -> bool:
+        if self.token is not None:
+            for nome, valor in headers:
+                if nome == CABECALHO_PROFILING:
+                    return hmac.compare_digest(valor, self.token)
+        return self.taxa > 0 and random.random() < self.taxa
+
+    def iniciar(self, frame=None) -> SessaoPerfil:
+        sessao = SessaoPerfil(next(self._ids), frame)
+        with self._lock:
+            self._sessoes[sessao.id] = sessao
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._amostrar, name="perfilador", daemon=True)
+                self._thread.start()
+        self._ativo.set()
+        return sessao
+
+    def _amostrar(self):
+        proprio = threading.get_ident()
+        while True:
+            self._ativo.wait()
+            time.sleep(self.intervalo)
+            with self._lock:
+                sessoes = list(self._sessoes.values())
+            por_thread = {ident: sessao for sessao in sessoes for ident in list(sessao.threads)}
+            por_frame = {id(sessao.frame): sessao for sessao in sessoes if sessao.frame is not None}
+
+            pilhas = []
+            for ident, frame in sys._current_frames().items():
+                if ident == proprio or os.path.basename(frame.f_code.co_filename) in _ARQUIVOS_OCIOSOS:
+                    continue
+                dona = por_thread.get(ident)
+                rotulos = []
+                while frame is not None:
+                    if dona is None:
+                        dona = por_frame.get(id(frame))
+                    rotulos.append(_rotulo(frame))
+                    frame = frame.f_back
+                if dona is not None:
+                    pilhas.append((dona, ";".join(reversed(rotulos))))
+            with self._lock:
+                for sessao, pilha in pilhas:
+                    if sessao.id in self._sessoes:
+                        sessao.amostras[pilha] += 1
+                self._contadores["amostras"] += 1
+
+    def finalizar(self, sessao: SessaoPerfil, metodo: str, caminho: str, status: int):
+        """Encerra a sessão e grava o perfil em disco (chamar fora do event loop)"""
+        duracao_ms = ((sessao.fim or time.perf_counter()) - sessao.inicio) * 1000
+        with self._lock:
+            self._sessoes.pop(sessao.id, None)
+            if not self._sessoes:
+                self._ativo.clear()
+            self._contadores["perfiladas"] += 1
+
+        arquivo = self.diretorio / f"{int(time.time() * 1000)}-{sessao.id}.folded"
+        try:
+            self.diretorio.mkdir(parents=True, exist_ok=True)
+            with open(arquivo, 'w', encoding='utf-8') as f:
+                for pilha, quantidade in sessao.amostras.most_common():
+                    f.write(f"{pilha} {quantidade}\n")
+        except OSError as e:
+            print(f"[WARN] Não foi possível gravar o perfil: {e}")
+            return
+
+        registro = {
+            "id": sessao.id,
+            "metodo": metodo,
+            "caminho": caminho,
+            "status": status,
+            "duracao_ms": round(duracao_ms, 3),
+            "amostras": sum(sessao.amostras.values()),
+            "arquivo": arquivo.name,
+        }
+        with self._lock:
+            if len(self._registros) == self._registros.maxlen:
+                antigo = self._registros.popleft()
+                (self.diretorio / antigo["arquivo"]).unlink(missing_ok=True)
+            self._registros.append(registro)
+
+    def mais_lentas(self, limite: int = 20) -> List[dict]:
+        with self._lock:
+            registros = list(self._registros)
+        return sorted(registros, key=lambda r: r["duracao_ms"], reverse=True)[:limite]
+
+    def perfil(self, id: int) -> Optional[str]:
+        with self._lock:
+            registro = next((r for r in self._registros if r["id"] == id), None)
+        if registro is None:
+            return None
+        try:
+            return (self.diretorio / registro["arquivo"]).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def metricas(self) -> dict:
+        with self._lock:
+            return {**self._contadores, "em_andamento": len(self._sessoes), "retidas": len(self._registros)}
+
+
+class MiddlewareProfiling:
+    """
+    Middleware ASGI que perfila uma amostra das requisições (PROFILING_TAXA)
+    ou as que trazem o cabeçalho X-Profile com o token configurado.
+    Só é registrado quando PROFILING_ATIVO está ligado; fora da amostra o
+    custo é um sorteio e uma busca de cabeçalho.
+    """
+
+    def __init__(self, app, perfilador: Perfilador):
+        self.app = app
+        self.perfilador = perfilador
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.perfilador.deve_perfilar(scope.get("headers", [])):
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        sessao = self.perfilador.iniciar(sys._getframe())
+        token = _sessao_atual.set(sessao)
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _sessao_atual.reset(token)
+            sessao.fim = time.perf_counter()
+            sessao.frame = None
+            # A gravação do perfil vai para o threadpool, fora do event loop
+            await run_in_threadpool(self.perfilador.finalizar, sessao, scope["method"], scope["path"], status)
@@ -0,0 +1,188 @@
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from backend import metricas
+from backend.config import (
+    ARTEFATOS_DIR, AVALIADOR_BACKEND, AVALIADOR_TFIDF, CATALOGO_INTERVALO, DB_PATH, MANUTENCAO_ATIVA,
+    REPLICAS_ATIVAS, SNAPSHOT_PATH, SNAPSHOT_VERIFICAR,
+)
+from backend.database.catalogo import AtualizadorCatalogo, CatalogoPalavras
+from backend.database.manutencao import AgendadorManutencao
+from backend.database.pool import PoolConexoes
+from backend.database.queries import get_variacoes_aceitas
+from backend.database.replicas import PublicadorReplicas
+from backend.database.schema import get_versao_dados
+from backend.database.tentativas import BufferTentativas
+from backend.game.deduplicacao import DetectorDuplicatas
+from backend.game.gerador_frases import GeradorFrases  # Modelo remoto (Mistral/Gemini)
+from backend.game.limitador import CLASSE_BACKGROUND
+from backend.game.processamento import AvaliadorRespostas
+from backend.game.ranking import ServicoRanking
+from backend.game.selecao import SeletorPalavras
+from backend.snapshot import carregar_snapshot
+
+
+@dataclass
+class Servicos:
+    """
+    Estado compartilhado pelos endpoints, criado uma vez por processo no
+    lifespan e guardado em `app.state.servicos`. Os endpoints recebem as
+    partes de que precisam pelas dependências de `backend.api.dependencias`,
+    que podem ser substituídas (`app.dependency_overrides`) em testes e
+    benchmarks.
+    """
+    db_path: str
+    pool: PoolConexoes
+    avaliador: AvaliadorRespostas
+    gerador: GeradorFrases
+    detector: DetectorDuplicatas
+    seletor: SeletorPalavras
+    buffer_tentativas: BufferTentativas
+    ranking: ServicoRanking
+    replicas: Optional[PublicadorReplicas] = None  # réplicas somente leitura (opcionais)
+    manutencao: Optional[AgendadorManutencao] = None  # manutenção periódica do banco (opcional)
+    catalogo: Optional[CatalogoPalavras] = field(default=None)  # montado em `iniciar_servicos`
+    atualizador_catalogo: Optional[AtualizadorCatalogo] = None  # reconstrói o catálogo quando o banco muda
+
+
+def criar_servicos(db_path: str | Path = DB_PATH) -> Servicos:
+    seletor = SeletorPalavras()
+    buffer_tentativas = BufferTentativas(db_path)
+    ranking = ServicoRanking(db_path)
+    buffer_tentativas.ao_gravar(ranking.aplicar)
+    detector = DetectorDuplicatas()
+    manutencao = None
+    if MANUTENCAO_ATIVA:
+        # Frases geradas pela manutenção usam o orçamento de segundo plano do
+        # limitador; sem teste de conexão, que esperaria por ele na inicialização
+        manutencao = AgendadorManutencao(
+            db_path, gerador=GeradorFrases(classe=CLASSE_BACKGROUND, testar_conexao=False), detector=detector,
+            seletor=seletor,
+        )
+    return Servicos(
+        db_path=str(db_path),
+        pool=PoolConexoes(db_path),
+        avaliador=AvaliadorRespostas(),
+        gerador=GeradorFrases(),
+        detector=detector,
+        seletor=seletor,
+        buffer_tentativas=buffer_tentativas,
+        ranking=ranking,
+        replicas=PublicadorReplicas(db_path) if REPLICAS_ATIVAS else None,
+        manutencao=manutencao,
+    )
+
+
+def iniciar_servicos(servicos: Servicos):
+    """Aquece o catálogo e o avaliador e inicia as threads de segundo plano"""
+    db_path = servicos.db_path
+    avaliador = servicos.avaliador
+    # Usa o snapshot pré-compilado se ele corresponder à versão atual do banco
+    snapshot = carregar_snapshot(SNAPSHOT_PATH, db_path, verificar=SNAPSHOT_VERIFICAR)
+    if snapshot:
+        print(f"[INFO] Snapshot anexado: {SNAPSHOT_PATH}")
+        servicos.catalogo = snapshot.catalogo
+        versao_catalogo = snapshot.versao_dados
+        avaliador.anexar_snapshot(snapshot, usar_tfidf=AVALIADOR_TFIDF and snapshot.tem_tfidf)
+    else:
+        with sqlite3.connect(str(db_path)) as conn:
+            versao_catalogo = get_versao_dados(conn)
+        servicos.catalogo = CatalogoPalavras.construir(db_path)
+        if AVALIADOR_TFIDF:
+            avaliador.treinar_modelo([d.lower() for d in servicos.catalogo.definicoes])
+    textos_vocabulario = list(servicos.catalogo.definicoes) + get_variacoes_aceitas(db_path)
+    if not avaliador.carregar_artefatos(ARTEFATOS_DIR, textos_vocabulario):
+        print("[INFO] Montando índice de correção ortográfica")
+        avaliador.construir_indice_correcao(textos_vocabulario)
+        avaliador.salvar_artefatos(ARTEFATOS_DIR)
+    if AVALIADOR_BACKEND != "padrao":
+        backend = avaliador.ativar_backend(AVALIADOR_BACKEND, db_path)
+        metricas.registrar_provedor(f"backend_{backend.nome}", backend.metricas)
+        backend.iniciar(db_path)
+    servicos.seletor.carregar(db_path)
+    if CATALOGO_INTERVALO > 0:
+        servicos.atualizador_catalogo = AtualizadorCatalogo(db_path, servicos.catalogo, versao_catalogo)
+        servicos.atualizador_catalogo.ao_atualizar(
+            lambda antigo, novo: _aplicar_catalogo(servicos, antigo, novo)
+        )
+        servicos.atualizador_catalogo.iniciar()
+    servicos.ranking.carregar()
+    servicos.buffer_tentativas.iniciar()
+    if servicos.replicas:
+        servicos.replicas.iniciar()
+    if servicos.manutencao:
+        servicos.manutencao.iniciar()
+
+    metricas.registrar_provedor("pool_conexoes", servicos.pool.metricas)
+    metricas.registrar_provedor("buffer_tentativas", servicos.buffer_tentativas.metricas)
+    metricas.registrar_provedor("limitador_llm", servicos.gerador.limitador.metricas)
+    if servicos.replicas:
+        metricas.registrar_provedor("replicas", servicos.replicas.metricas)
+    if servicos.manutencao:
+        metricas.registrar_provedor("manutencao", servicos.manutencao.metricas)
+    if servicos.atualizador_catalogo:
+        metricas.registrar_provedor("catalogo", servicos.atualizador_catalogo.metricas)
+
+
+def _aplicar_catalogo(servicos: Servicos, antigo: CatalogoPalavras, novo: CatalogoPalavras):
+    """Leva um catálogo reconstruído aos endpoints, ao avaliador e ao sorteio de palavras"""
+    avaliador = servicos.avaliador
+    if avaliador.artefatos is not None:
+        # Os artefatos do snapshot são indexados pelas linhas do catálogo
+        # antigo: saem antes de os endpoints verem o catálogo novo
+        avaliador.desanexar_snapshot()
+    servicos.catalogo = novo
+
+    anteriores = {
+        antigo.ids[linha]: (antigo.categoria(linha), antigo.dificuldades[linha], antigo.definicoes[linha])
+        for linha in range(len(antigo))
+    }
+    alteradas, definicoes_novas = [], []
+    for linha in range(len(novo)):
+        palavra_id = novo.ids[linha]
+        atual = (novo.categoria(linha), novo.dificuldades[linha], novo.definicoes[linha])
+        anterior = anteriores.pop(palavra_id, None)
+        if anterior == atual:
+            continue
+        if anterior and anterior[:2] != atual[:2]:
+            servicos.seletor.remover(palavra_id)  # mudou de balde (categoria ou dificuldade)
+        alteradas.append(palavra_id)
+        if not anterior or anterior[2] != atual[2]:
+            definicoes_novas.append(atual[2])
+            # O vetor em cache é o da definição antiga
+            avaliador.definicoes_vetorizadas.pop(palavra_id)
+    for palavra_id in anteriores:
+        servicos.seletor.remover(palavra_id)
+        avaliador.definicoes_vetorizadas.pop(palavra_id)
+    if alteradas:
+        with sqlite3.connect(servicos.db_path) as conn:
+            servicos.seletor.reavaliar(conn, alteradas)
+    # Com backend de similaridade, a sincronização dele já alimenta o índice de correção
+    if definicoes_novas and not avaliador.backend:
+        avaliador.incorporar_textos(definicoes_novas)
+
+
+def encerrar_servicos(servicos: Servicos):
+    if servicos.atualizador_catalogo:
+        servicos.atualizador_catalogo.parar()
+    if servicos.manutencao:
+        servicos.manutencao.parar()
+    if servicos.replicas:
+        servicos.replicas.parar()
+    if servicos.avaliador.backend:
+        servicos.avaliador.backend.parar()
+    # Grava as tentativas pendentes antes de encerrar
+    servicos.buffer_tentativas.parar()
+    servicos.pool.fechar()
+
+
+def limpar_frases(db_path: str | Path):
+    """Apaga as frases geradas (ambiente de desenvolvimento)"""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("DELETE FROM frases;")
+        conn.commit()
+    finally:
+        conn.close()
@@ -5,4 +5,96 @@ from dotenv import load_dotenv, find_dotenv
 load_dotenv(find_dotenv())
 
 # Constantes
-DB_PATH = os.getenv('DB_PATH', "backend/database/banco_palavras.db") 
\ No newline at end of file
+DB_PATH = os.getenv('DB_PATH', "backend/database/banco_palavras.db") 
+
+# Pool de conexões com o banco principal usado pelos endpoints
+DB_POOL_TAMANHO = int(os.getenv('DB_POOL_TAMANHO', 8))
+DB_POOL_ESPERA = float(os.getenv('DB_POOL_ESPERA', 5.0))  # segundos esperando uma conexão livre
+DB_BUSY_TIMEOUT = float(os.getenv('DB_BUSY_TIMEOUT', 5.0))  # segundos esperando uma trava do SQLite
+DB_WAL = os.getenv('DB_WAL', 'true').lower() == 'true'  # journal em WAL: leituras não esperam escritas
+
+# Máximo de frases de exemplo por palavra
+LIMITE_FRASES = int(os.getenv('LIMITE_FRASES', 4))
+
+# Detecção de frases quase duplicadas (Jaccard estimado via MinHash)
+LIMIAR_DUPLICATA = float(os.getenv('LIMIAR_DUPLICATA', 0.7))
+TENTATIVAS_REGERACAO = int(os.getenv('TENTATIVAS_REGERACAO', 3))
+
+# Buffer de escrita das tentativas de resposta
+BUFFER_TAMANHO_LOTE = int(os.getenv('BUFFER_TAMANHO_LOTE', 200))
+BUFFER_INTERVALO = float(os.getenv('BUFFER_INTERVALO', 2.0))  # segundos
+BUFFER_CAPACIDADE = int(os.getenv('BUFFER_CAPACIDADE', 10000))
+BUFFER_POLITICA = os.getenv('BUFFER_POLITICA', 'descartar')  # 'descartar' ou 'bloquear'
+BUFFER_ESPERA_MAXIMA = float(os.getenv('BUFFER_ESPERA_MAXIMA', 0.05))  # segundos
+
+# Ranking (quantidade máxima de posições e placares de período mantidos em memória)
+RANKING_K = int(os.getenv('RANKING_K', 100))
+RANKING_PERIODOS_RETIDOS = int(os.getenv('RANKING_PERIODOS_RETIDOS', 4))
+
+# Diretório dos artefatos de pontuação pré-calculados
+ARTEFATOS_DIR = os.getenv('ARTEFATOS_DIR', "backend/artefatos")
+
+# Snapshot pré-compilado do caminho de leitura (catálogo + pontuação)
+SNAPSHOT_PATH = os.getenv('SNAPSHOT_PATH', "backend/artefatos/snapshot.bin")
+SNAPSHOT_VERIFICAR = os.getenv('SNAPSHOT_VERIFICAR', 'true').lower() == 'true'
+
+# Intervalo entre verificações do carimbo versao_dados; quando ele muda o
+# catálogo em memória é reconstruído (0 desliga)
+CATALOGO_INTERVALO = float(os.getenv('CATALOGO_INTERVALO', 30.0))  # segundos
+
+# Usa a similaridade TF-IDF além da comparação por radicais
+AVALIADOR_TFIDF = os.getenv('AVALIADOR_TFIDF', 'false').lower() == 'true'
+
+# Profiling por amostragem de requisições (desligado por padrão)
+PROFILING_ATIVO = os.getenv('PROFILING_ATIVO', 'false').lower() == 'true'
+PROFILING_TAXA = float(os.getenv('PROFILING_TAXA', 0.0))  # fração das requisições perfiladas
+PROFILING_TOKEN = os.getenv('PROFILING_TOKEN', '')  # valor do cabeçalho X-Profile
+PROFILING_DIR = os.getenv('PROFILING_DIR', "backend/artefatos/perfis")
+PROFILING_MAX_ARQUIVOS = int(os.getenv('PROFILING_MAX_ARQUIVOS', 50))
+PROFILING_INTERVALO = float(os.getenv('PROFILING_INTERVALO', 0.005))  # segundos entre amostras
+
+# Controle de admissão por rota: caminho=concorrentes:fila:espera_maxima(s)
+# As rotas que chamam o LLM ficam abaixo do tamanho do threadpool (40)
+ADMISSAO_ROTAS = os.getenv(
+    'ADMISSAO_ROTAS',
+    "/api/gerar-frase=4:16:10,/api/palavra-aleatoria=8:32:10,/api/verificar=16:64:2",
+)
+# Classes do cabeçalho X-Prioridade (menor valor é atendido antes; a menor é o padrão)
+ADMISSAO_PRIORIDADES = os.getenv('ADMISSAO_PRIORIDADES', "interativa:0,background:1")
+ADMISSAO_RETRY_AFTER = int(os.getenv('ADMISSAO_RETRY_AFTER', 2))  # segundos
+
+# Limitador de chamadas ao provedor do LLM, compartilhado entre processos
+MISTRAL_BASE_URL = os.getenv('MISTRAL_BASE_URL', "https://api.mistral.ai/v1")
+LIMITADOR_PATH = os.getenv('LIMITADOR_PATH', "backend/artefatos/limitador.db")
+# Orçamento por classe: chamadas/s:rajada:espera_maxima(s); taxa 0 = só a rajada
+LIMITADOR_INTERATIVO = os.getenv('LIMITADOR_INTERATIVO', "1:5:3")
+LIMITADOR_BACKGROUND = os.getenv('LIMITADOR_BACKGROUND', "0.2:2:60")
+LIMITADOR_TENTATIVAS_429 = int(os.getenv('LIMITADOR_TENTATIVAS_429', 2))
+
+# Réplicas somente leitura para os endpoints de leitura (desligado por padrão)
+REPLICAS_ATIVAS = os.getenv('REPLICAS_ATIVAS', 'false').lower() == 'true'
+REPLICAS_DIR = os.getenv('REPLICAS_DIR', "backend/artefatos/replicas")
+REPLICAS_INTERVALO = float(os.getenv('REPLICAS_INTERVALO', 5.0))  # segundos entre publicações
+# Idade máxima da réplica; acima disso as leituras voltam ao banco principal
+REPLICAS_OBSOLESCENCIA_MAXIMA = float(os.getenv('REPLICAS_OBSOLESCENCIA_MAXIMA', 30.0))
+
+# Modelo TF-IDF incremental (atualiza IDF e linhas quando o banco muda)
+AVALIADOR_INCREMENTAL = os.getenv('AVALIADOR_INCREMENTAL', 'false').lower() == 'true'
+AVALIADOR_CACHE_VETORES = int(os.getenv('AVALIADOR_CACHE_VETORES', 5000))  # vetores de definição em cache
+AVALIADOR_COMPACTACAO_INTERVALO = float(os.getenv('AVALIADOR_COMPACTACAO_INTERVALO', 60.0))  # segundos
+
+# Backend de similaridade vetorial: padrao (TF-IDF opcional + radicais),
+# incremental (TF-IDF incremental) ou hashing (n-gramas de caracteres, sem treino)
+AVALIADOR_BACKEND = os.getenv('AVALIADOR_BACKEND', 'incremental' if AVALIADOR_INCREMENTAL else 'padrao').lower()
+AVALIADOR_HASHING_DIMENSAO = int(os.getenv('AVALIADOR_HASHING_DIMENSAO', 2 ** 18))  # colunas do espaço de hashing
+AVALIADOR_HASHING_NGRAMAS = tuple(int(n) for n in os.getenv('AVALIADOR_HASHING_NGRAMAS', "3:5").split(':'))
+
+# Manutenção periódica do banco: tarefa=intervalo(s)
+MANUTENCAO_ATIVA = os.getenv('MANUTENCAO_ATIVA', 'true').lower() == 'true'
+MANUTENCAO_TAREFAS = os.getenv(
+    'MANUTENCAO_TAREFAS',
+    "checkpoint=60,estatisticas=3600,vacuo=600,podar_frases=600,substituir_frases=300",
+)
+# Tempo máximo que cada passo pode segurar uma trava do banco
+MANUTENCAO_TRAVA_MAXIMA = float(os.getenv('MANUTENCAO_TRAVA_MAXIMA', 0.05))  # segundos
+MANUTENCAO_FRASES_POR_CICLO = int(os.getenv('MANUTENCAO_FRASES_POR_CICLO', 5))  # frases genéricas trocadas por ciclo
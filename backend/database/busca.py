@@ -0,0 +1,86 @@
+import re
+import sqlite3
+from typing import Dict, List, Tuple
+
+TIPOS_BUSCA = ('palavras', 'frases')
+
+
+def consulta_fts(texto: str, prefixo: bool = False) -> str:
+    """
+    Converte o texto digitado em uma consulta FTS5 segura: cada palavra vira
+    um termo entre aspas (sem operadores do usuário) e todas são exigidas.
+    Com `prefixo`, o último termo casa como prefixo.
+    """
+    tokens = re.findall(r'\w+', texto.lower())
+    if not tokens:
+        return ""
+    termos = [f'"{token}"' for token in tokens]
+    if prefixo:
+        termos[-1] += '*'
+    return " ".join(termos)
+
+
+def buscar(conn: sqlite3.Connection, texto: str, tipo: str = 'palavras',
+           pagina: int = 1, tamanho: int = 20) -> Tuple[List[Dict], bool]:
+    """
+    Busca textual ordenada por relevância (bm25).
+
+    Args:
+        conn: Conexão com o banco
+        texto: Texto digitado pelo usuário
+        tipo: 'palavras' (termo e definição) ou 'frases'
+        pagina: Página a partir de 1
+        tamanho: Resultados por página
+
+    Returns:
+        (resultados da página, se existe próxima página)
+    """
+    consulta = consulta_fts(texto)
+    if not consulta:
+        return [], False
+
+    if tipo == 'frases':
+        sql = """
+            SELECT p.id, p.palavra, snippet(frases_fts, 0, '[', ']', '…', 12) AS trecho
+            FROM frases_fts
+            JOIN frases f ON f.id = frases_fts.rowid
+            JOIN palavras p ON p.id = f.palavra_id
+            WHERE frases_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """
+    else:
+        sql = """
+            SELECT rowid, palavra, snippet(palavras_fts, 1, '[', ']', '…', 12) AS trecho
+            FROM palavras_fts
+            WHERE palavras_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        """
+
+    # Busca um item a mais para saber se há próxima página sem contar tudo
+    linhas = conn.execute(sql, (consulta, tamanho + 1, (pagina - 1) * tamanho)).fetchall()
+    resultados = [
+        {"tipo": tipo[:-1], "palavra_id": linha[0], "termo": linha[1], "trecho": linha[2]}
+        for linha in linhas[:tamanho]
+    ]
+    return resultados, len(linhas) > tamanho
+
+
+def autocompletar(conn: sqlite3.Connection, prefixo: str, limite: int = 10) -> List[Dict]:
+    """
+    Termos que começam com o prefixo digitado, usando o índice de prefixos
+    do FTS5 e a âncora de início de coluna (^). Sem ORDER BY a consulta para
+    no `limite`-ésimo resultado; a página é ordenada por tamanho do termo.
+    """
+    tokens = re.findall(r'\w+', prefixo.lower())
+    if not tokens:
+        return []
+    # Uma única frase ancorada: "habeas cor"* casa com "Habeas Corpus"
+    consulta = f'palavra : ^ "{" ".join(tokens)}"*'
+    linhas = conn.execute(
+        "SELECT rowid, palavra FROM palavras_fts WHERE palavras_fts MATCH ? LIMIT ?",
+        (consulta, limite),
+    ).fetchall()
+    linhas.sort(key=lambda linha: (len(linha[1]), linha[1]))
+    return [{"id": linha[0], "termo": linha[1]} for linha in linhas]
@@ -0,0 +1,264 @@
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from backend.config import CATALOGO_INTERVALO
+from .models import Palavra
+from .schema import get_versao_dados
+
+
+def termo_canonico(termo: str) -> str:
+    """Forma usada nas buscas por termo (sem espaços nas pontas, minúsculas)"""
+    return termo.strip().lower()
+
+
+def _hash_termo(termo: str) -> int:
+    # CRC32 é estável entre processos (ao contrário de hash()), o que permite
+    # gravar a tabela de dispersão junto com o catálogo
+    return zlib.crc32(termo.encode('utf-8'))
+
+
+class ColunaTexto:
+    """
+    Coluna de textos guardada como um único bloco UTF-8 mais um array de
+    deslocamentos; o texto i fica em dados[offsets[i]:offsets[i + 1]].
+    Aceita bytes ou memoryview, então funciona sobre um arquivo mapeado.
+    """
+
+    __slots__ = ('dados', 'offsets')
+
+    def __init__(self, dados, offsets):
+        self.dados = dados
+        self.offsets = offsets
+
+    @classmethod
+    def de_textos(cls, textos: Iterable[str]) -> 'ColunaTexto':
+        offsets = array('I', [0])
+        partes = []
+        total = 0
+        for texto in textos:
+            codificado = texto.encode('utf-8')
+            partes.append(codificado)
+            total += len(codificado)
+            offsets.append(total)
+        return cls(b''.join(partes), offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.dados[self.offsets[i]:self.offsets[i + 1]], 'utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    def tamanho_bytes(self) -> int:
+        return len(self.dados) + len(self.offsets) * self.offsets.itemsize
+
+
+class CatalogoPalavras:
+    """
+    Catálogo somente leitura das palavras, em colunas compactas.
+
+    Cada palavra ocupa uma linha; ids, dificuldades e códigos de categoria
+    ficam em arrays e textos em blocos UTF-8 (ColunaTexto). As frases não
+    entram: mudam sem alterar versao_dados e são lidas do banco. As buscas
+    por id (array direto) e por termo canônico (tabela de dispersão com
+    endereçamento aberto) são O(1).
+    """
+
+    __slots__ = (
+        'ids', 'dificuldades', 'categorias', 'nomes_categorias', 'ids_categorias',
+        'termos', 'definicoes', 'linha_por_id_', 'tabela_termos',
+    )
+
+    def __init__(self, ids, dificuldades, categorias, nomes_categorias: Sequence[str],
+                 ids_categorias: Sequence[int], termos: ColunaTexto, definicoes: ColunaTexto,
+                 linha_por_id=None, tabela_termos=None):
+        self.ids = ids
+        self.dificuldades = dificuldades
+        self.categorias = categorias
+        self.nomes_categorias = tuple(sys.intern(nome) for nome in nomes_categorias)
+        self.ids_categorias = tuple(ids_categorias)
+        self.termos = termos
+        self.definicoes = definicoes
+        self.linha_por_id_ = linha_por_id if linha_por_id is not None else self._indexar_ids()
+        self.tabela_termos = tabela_termos if tabela_termos is not None else self._indexar_termos()
+
+    @classmethod
+    def construir(cls, db_path: str | Path) -> 'CatalogoPalavras':
+        """Lê palavras e categorias do banco e monta o catálogo"""
+        with sqlite3.connect(str(db_path)) as conn:
+            categorias = conn.execute("SELECT id, nome FROM categorias ORDER BY id").fetchall()
+            palavras = conn.execute(
+                "SELECT id, palavra, definicao, categoria_id, dificuldade FROM palavras ORDER BY id"
+            ).fetchall()
+        return cls.de_linhas(categorias, palavras)
+
+    @classmethod
+    def de_linhas(cls, categorias: Sequence[Tuple[int, str]],
+                  palavras: Sequence[Tuple[int, str, str, int, Optional[int]]]) -> 'CatalogoPalavras':
+        """Monta o catálogo a partir de linhas (id, ...) já ordenadas por id"""
+        codigo_categoria = {cat_id: codigo for codigo, (cat_id, _) in enumerate(categorias)}
+
+        return cls(
+            ids=array('i', (p[0] for p in palavras)),
+            dificuldades=array('b', (p[4] or 1 for p in palavras)),
+            categorias=array('H', (codigo_categoria[p[3]] for p in palavras)),
+            nomes_categorias=[nome for _, nome in categorias],
+            ids_categorias=[cat_id for cat_id, _ in categorias],
+            termos=ColunaTexto.de_textos(p[1] for p in palavras),
+            definicoes=ColunaTexto.de_textos(p[2] for p in palavras),
+        )
+
+    def _indexar_ids(self) -> array:
+        maior = max(self.ids, default=0)
+        linha_por_id = array('i', bytes(4 * (maior + 1)))
+        for linha, palavra_id in enumerate(self.ids):
+            linha_por_id[palavra_id] = linha + 1  # 0 marca ausência
+        return linha_por_id
+
+    def _indexar_termos(self) -> array:
+        capacidade = 8
+        while capacidade < 2 * len(self.ids):
+            capacidade <<= 1
+        tabela = array('i', bytes(4 * capacidade))
+        mascara = capacidade - 1
+        for linha in range(len(self.ids)):
+            posicao = _hash_termo(termo_canonico(self.termos[linha])) & mascara
+            while tabela[posicao]:
+                posicao = (posicao + 1) & mascara
+            tabela[posicao] = linha + 1
+        return tabela
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def linha_por_id(self, palavra_id: int) -> Optional[int]:
+        if 0 <= palavra_id < len(self.linha_por_id_):
+            linha = self.linha_por_id_[palavra_id]
+            return linha - 1 if linha else None
+        return None
+
+    def linha_por_termo(self, termo: str) -> Optional[int]:
+        canonico = termo_canonico(termo)
+        mascara = len(self.tabela_termos) - 1
+        posicao = _hash_termo(canonico) & mascara
+        while True:
+            linha = self.tabela_termos[posicao]
+            if not linha:
+                return None
+            if termo_canonico(self.termos[linha - 1]) == canonico:
+                return linha - 1
+            posicao = (posicao + 1) & mascara
+
+    def categoria(self, linha: int) -> str:
+        return self.nomes_categorias[self.categorias[linha]]
+
+    def palavra(self, linha: int) -> Palavra:
+        codigo = self.categorias[linha]
+        return Palavra(
+            id=self.ids[linha],
+            palavra=self.termos[linha],
+            definicao=self.definicoes[linha],
+            categoria_id=self.ids_categorias[codigo],
+            dificuldade=self.dificuldades[linha],
+            categoria_nome=self.nomes_categorias[codigo],
+        )
+
+    def por_id(self, palavra_id: int) -> Optional[Palavra]:
+        linha = self.linha_por_id(palavra_id)
+        return None if linha is None else self.palavra(linha)
+
+    def por_termo(self, termo: str) -> Optional[Palavra]:
+        linha = self.linha_por_termo(termo)
+        return None if linha is None else self.palavra(linha)
+
+    def tamanho_bytes(self) -> int:
+        """Memória aproximada ocupada pelas colunas"""
+        arrays = (self.ids, self.dificuldades, self.categorias, self.linha_por_id_, self.tabela_termos)
+        return (
+            sum(len(a) * a.itemsize for a in arrays)
+            + self.termos.tamanho_bytes() + self.definicoes.tamanho_bytes()
+        )
+
+
+class AtualizadorCatalogo:
+    """
+    Mantém o catálogo em memória em dia com o banco.
+
+    A cada `intervalo` segundos lê o carimbo `versao_dados` (alterado por
+    triggers em palavras, categorias e variações); se ele mudou, monta um
+    catálogo novo fora de qualquer trava e troca a referência. As funções
+    registradas em `ao_atualizar` recebem (antigo, novo) para ajustar o que
+    depende do catálogo.
+    """
+
+    def __init__(self, db_path: str | Path, catalogo: CatalogoPalavras,
+                 versao_dados: Optional[tuple] = None, intervalo: float = CATALOGO_INTERVALO):
+        self.db_path = str(db_path)
+        self.catalogo = catalogo
+        self.versao_dados = versao_dados
+        self.intervalo = intervalo
+        self._callbacks: List[Callable[[CatalogoPalavras, CatalogoPalavras], None]] = []
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._contadores = {"atualizacoes": 0, "falhas": 0}
+        self._ultima_duracao = 0.0
+
+    def ao_atualizar(self, callback: Callable[[CatalogoPalavras, CatalogoPalavras], None]):
+        self._callbacks.append(callback)
+
+    def verificar(self) -> bool:
+        """Reconstrói o catálogo se a versão dos dados mudou; retorna True se trocou"""
+        with sqlite3.connect(self.db_path) as conn:
+            versao = get_versao_dados(conn)
+        if versao == self.versao_dados:
+            return False
+        inicio = time.perf_counter()
+        # A versão é lida antes da construção: uma mudança durante ela só
+        # faz a próxima verificação reconstruir de novo
+        novo = CatalogoPalavras.construir(self.db_path)
+        antigo, self.catalogo, self.versao_dados = self.catalogo, novo, versao
+        for callback in self._callbacks:
+            callback(antigo, novo)
+        self._contadores["atualizacoes"] += 1
+        self._ultima_duracao = time.perf_counter() - inicio
+        print(f"[INFO] Catálogo atualizado: {len(antigo)} -> {len(novo)} palavras (versão {versao[1]})")
+        return True
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.verificar()
+            except Exception as e:
+                # Qualquer erro (banco ou callback) não pode matar a thread
+                self._contadores["falhas"] += 1
+                print(f"[WARN] Falha ao atualizar o catálogo: {e}")
+
+    def iniciar(self):
+        if self.versao_dados is None:
+            with sqlite3.connect(self.db_path) as conn:
+                self.versao_dados = get_versao_dados(conn)
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="catalogo", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def metricas(self) -> dict:
+        return {
+            **self._contadores,
+            "palavras": len(self.catalogo),
+            "versao_dados": self.versao_dados[1] if self.versao_dados else None,
+            "ultima_atualizacao_ms": round(self._ultima_duracao * 1000, 3),
+        }
@@ -0,0 +1,340 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from backend.config import (
+    DB_PATH,
+    LIMITE_FRASES,
+    MANUTENCAO_FRASES_POR_CICLO,
+    MANUTENCAO_TAREFAS,
+    MANUTENCAO_TRAVA_MAXIMA,
+)
+from backend.database.migracoes import LIMITE_ANALISE
+from backend.game.deduplicacao import DetectorDuplicatas, assinatura_minhash
+from backend.game.frases import FRASE_FALLBACK
+from backend.game.gerador_frases import FRASES_PADRAO, GeradorFrases
+from backend.game.selecao import SeletorPalavras
+
+# Modelos das frases genéricas que podem ter sido gravadas no lugar de frases reais
+MODELOS_GENERICOS = [*FRASES_PADRAO, FRASE_FALLBACK]
+
+# Limite de passos por execução de uma tarefa; o que sobrar fica para o próximo ciclo
+_PASSOS_MAXIMOS = 200
+_LOTE_INICIAL = 64
+_LOTE_MAXIMO = 4096
+
+
+def interpretar_tarefas(config: str) -> Dict[str, float]:
+    """'checkpoint=60,vacuo=600' -> {'checkpoint': 60.0, 'vacuo': 600.0}"""
+    tarefas = {}
+    for item in filter(None, (parte.strip() for parte in config.split(','))):
+        nome, intervalo = item.split('=')
+        tarefas[nome.strip()] = float(intervalo)
+    return tarefas
+
+
+def eh_generica(frase: str, palavra: str) -> bool:
+    return frase in {modelo.format(palavra=palavra) for modelo in MODELOS_GENERICOS}
+
+
+def ativar_vacuo_incremental(db_path: str | Path = DB_PATH) -> bool:
+    """
+    Converte um banco criado sem auto_vacuum para o modo INCREMENTAL. Exige
+    um VACUUM completo (reescreve o arquivo e trava o banco enquanto isso),
+    então é feito uma vez, fora do horário de uso.
+    """
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+            return False
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return True
+    finally:
+        conn.close()
+
+
+class EstadoTarefa:
+    __slots__ = ('nome', 'intervalo', 'proxima', 'execucoes', 'falhas', 'adiadas',
+                 'duracoes', 'maior_trava', 'travas_acima', 'ultimo_resultado')
+
+    def __init__(self, nome: str, intervalo: float):
+        self.nome = nome
+        self.intervalo = intervalo
+        self.proxima = time.monotonic() + intervalo
+        self.execucoes = 0
+        self.falhas = 0
+        self.adiadas = 0
+        self.duracoes: deque = deque(maxlen=50)
+        self.maior_trava = 0.0
+        self.travas_acima = 0
+        self.ultimo_resultado: dict = {}
+
+
+class AgendadorManutencao:
+    """
+    Manutenção periódica do banco em uma thread de segundo plano.
+
+    Tarefas (cada uma com seu intervalo em MANUTENCAO_TAREFAS):
+      checkpoint:         checkpoint PASSIVE do WAL (não espera leitores nem escritores)
+      estatisticas:       ANALYZE tabela a tabela (amostragem limitada) e PRAGMA optimize
+      vacuo:              incremental_vacuum em passos, devolvendo páginas livres ao sistema
+      podar_frases:       remove frases além de LIMITE_FRASES por palavra (genéricas primeiro)
+      substituir_frases:  troca frases genéricas gravadas por frases geradas pelo modelo
+
+    O trabalho é dividido em passos curtos, cada um em sua própria transação;
+    o tamanho dos lotes é ajustado para que nenhum passo segure a trava do
+    banco por mais de `trava_maxima` segundos. Se a trava não sai dentro
+    desse mesmo tempo, a tarefa é adiada para o próximo ciclo. As chamadas
+    ao modelo acontecem fora de qualquer transação. Com um `seletor`, as
+    palavras cujas frases foram podadas são reavaliadas para o sorteio.
+    """
+
+    def __init__(self, db_path: str | Path = DB_PATH, gerador: Optional[GeradorFrases] = None,
+                 detector: Optional[DetectorDuplicatas] = None,
+                 tarefas: Optional[Dict[str, float]] = None,
+                 trava_maxima: float = MANUTENCAO_TRAVA_MAXIMA,
+                 frases_por_ciclo: int = MANUTENCAO_FRASES_POR_CICLO,
+                 seletor: Optional[SeletorPalavras] = None):
+        self.db_path = str(db_path)
+        self.gerador = gerador
+        self.seletor = seletor
+        self.detector = detector or DetectorDuplicatas()
+        self.trava_maxima = trava_maxima
+        self.frases_por_ciclo = frases_por_ciclo
+
+        funcoes: Dict[str, Callable[[sqlite3.Connection, EstadoTarefa], dict]] = {
+            "checkpoint": self.checkpoint,
+            "estatisticas": self.estatisticas,
+            "vacuo": self.vacuo,
+            "podar_frases": self.podar_frases,
+            "substituir_frases": self.substituir_frases,
+        }
+        tarefas = interpretar_tarefas(MANUTENCAO_TAREFAS) if tarefas is None else dict(tarefas)
+        if gerador is None:
+            tarefas.pop("substituir_frases", None)
+        desconhecidas = set(tarefas) - set(funcoes)
+        if desconhecidas:
+            raise ValueError(f"Tarefas de manutenção desconhecidas: {', '.join(sorted(desconhecidas))}")
+        self._funcoes = funcoes
+        self.tarefas = {nome: EstadoTarefa(nome, intervalo) for nome, intervalo in tarefas.items()}
+        self._lotes = {"vacuo": _LOTE_INICIAL, "podar_frases": _LOTE_INICIAL}
+
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Controle do tempo de trava
+
+    def _registrar_trava(self, estado: EstadoTarefa, duracao: float):
+        estado.maior_trava = max(estado.maior_trava, duracao)
+        if duracao > self.trava_maxima:
+            estado.travas_acima += 1
+
+    def _ajustar_lote(self, chave: str, duracao: float) -> int:
+        """Dobra o lote enquanto o passo usar menos da metade do orçamento; divide ao estourar"""
+        lote = self._lotes[chave]
+        if duracao > self.trava_maxima:
+            lote = max(1, lote // 2)
+        elif duracao < self.trava_maxima / 2:
+            lote = min(_LOTE_MAXIMO, lote * 2)
+        self._lotes[chave] = lote
+        return lote
+
+    @contextmanager
+    def _transacao(self, conn: sqlite3.Connection, estado: EstadoTarefa) -> Iterator[sqlite3.Cursor]:
+        conn.execute("BEGIN IMMEDIATE")
+        inicio = time.perf_counter()
+        try:
+            yield conn.cursor()
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._registrar_trava(estado, time.perf_counter() - inicio)
+
+    def _medir(self, conn: sqlite3.Connection, estado: EstadoTarefa, sql: str) -> tuple:
+        """Executa uma instrução em autocommit medindo quanto ela segura o banco"""
+        inicio = time.perf_counter()
+        linhas = conn.execute(sql).fetchall()
+        duracao = time.perf_counter() - inicio
+        self._registrar_trava(estado, duracao)
+        return linhas, duracao
+
+    # Tarefas
+
+    def checkpoint(self, conn: sqlite3.Connection, estado: EstadoTarefa) -> dict:
+        (ocupado, paginas_wal, copiadas), = self._medir(conn, estado, "PRAGMA wal_checkpoint(PASSIVE)")[0]
+        if paginas_wal < 0:
+            return {"wal": False}
+        return {"paginas_wal": paginas_wal, "copiadas": copiadas, "ocupado": bool(ocupado)}
+
+    def estatisticas(self, conn: sqlite3.Connection, estado: EstadoTarefa) -> dict:
+        conn.execute(f"PRAGMA analysis_limit={LIMITE_ANALISE}")
+        tabelas = [linha[0] for linha in conn.execute(
+            "SELECT DISTINCT tbl_name FROM sqlite_master WHERE type = 'index' ORDER BY tbl_name"
+        )]
+        for tabela in tabelas:
+            self._medir(conn, estado, f'ANALYZE "{tabela}"')
+        self._medir(conn, estado, "PRAGMA optimize")
+        return {"tabelas": len(tabelas)}
+
+    def vacuo(self, conn: sqlite3.Connection, estado: EstadoTarefa) -> dict:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Banco criado antes do auto_vacuum: ver ativar_vacuo_incremental
+            return {"incremental": False}
+        liberadas = 0
+        for _ in range(_PASSOS_MAXIMOS):
+            livres = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            if not livres:
+                break
+            paginas = min(self._lotes["vacuo"], livres)
+            # Pelo execute o pragma libera uma página só; o executescript o roda até o fim
+            inicio = time.perf_counter()
+            conn.executescript(f"PRAGMA incremental_vacuum({paginas});")
+            duracao = time.perf_counter() - inicio
+            self._registrar_trava(estado, duracao)
+            self._ajustar_lote("vacuo", duracao)
+            restantes = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            liberadas += livres - restantes
+            if restantes >= livres:
+                break
+        return {"paginas_liberadas": liberadas,
+                "paginas_livres": conn.execute("PRAGMA freelist_count").fetchone()[0]}
+
+    def podar_frases(self, conn: sqlite3.Connection, estado: EstadoTarefa) -> dict:
+        excedentes = conn.execute(
+            """
+            SELECT f.palavra_id, p.palavra
+            FROM frases f JOIN palavras p ON p.id = f.palavra_id
+            GROUP BY f.palavra_id HAVING COUNT(*) > ?
+            """,
+            (LIMITE_FRASES,),
+        ).fetchall()
+        remover: List[int] = []
+        for palavra_id, palavra in excedentes:
+            linhas = conn.execute(
+                "SELECT id, frase FROM frases WHERE palavra_id = ? ORDER BY id", (palavra_id,)
+            ).fetchall()
+            # Fica com as frases reais mais antigas; as genéricas saem primeiro
+            ordenadas = sorted(linhas, key=lambda linha: (eh_generica(linha[1], palavra), linha[0]))
+            remover += [frase_id for frase_id, _ in ordenadas[LIMITE_FRASES:]]
+
+        removidas = 0
+        for _ in range(_PASSOS_MAXIMOS):
+            if removidas >= len(remover):
+                break
+            lote = remover[removidas:removidas + self._lotes["podar_frases"]]
+            inicio = time.perf_counter()
+            with self._transacao(conn, estado) as cur:
+                cur.executemany("DELETE FROM frases WHERE id = ?", [(frase_id,) for frase_id in lote])
+            self._ajustar_lote("podar_frases", time.perf_counter() - inicio)
+            removidas += len(lote)
+        if self.seletor and removidas:
+            self.seletor.reavaliar(conn, [palavra_id for palavra_id, _ in excedentes])
+        return {"palavras": len(excedentes), "removidas": removidas, "restantes": len(remover) - removidas}
+
+    def substituir_frases(self, conn: sqlite3.Connection, estado: EstadoTarefa) -> dict:
+        condicao = " OR ".join("f.frase LIKE ?" for _ in MODELOS_GENERICOS)
+        candidatas = conn.execute(
+            f"""
+            SELECT f.id, f.palavra_id, f.frase, p.palavra, p.definicao, c.nome
+            FROM frases f
+            JOIN palavras p ON p.id = f.palavra_id
+            JOIN categorias c ON c.id = p.categoria_id
+            WHERE {condicao}
+            ORDER BY f.id
+            LIMIT ?
+            """,
+            (*(modelo.format(palavra='%') for modelo in MODELOS_GENERICOS), self.frases_por_ciclo * 4),
+        ).fetchall()
+        genericas = [linha for linha in candidatas if eh_generica(linha[2], linha[3])][:self.frases_por_ciclo]
+
+        resumo = {"genericas": len(genericas), "substituidas": 0, "duplicadas": 0, "sem_modelo": False}
+        for frase_id, palavra_id, antiga, palavra, definicao, categoria in genericas:
+            # Geração fora de transação; sem modelo (ou limite de chamadas)
+            # volta uma frase genérica e o restante fica para o próximo ciclo
+            nova = self.gerador.gerar_frase_unica(palavra, definicao, categoria)
+            if not nova or eh_generica(nova, palavra):
+                resumo["sem_modelo"] = True
+                break
+            with self._transacao(conn, estado) as cur:
+                if self.detector.encontrar_duplicata(cur, palavra_id, nova) is not None:
+                    resumo["duplicadas"] += 1
+                    continue
+                cur.execute("UPDATE frases SET frase = ? WHERE id = ? AND frase = ?", (nova, frase_id, antiga))
+                if cur.rowcount:
+                    self.detector.registrar(cur, frase_id, palavra_id, assinatura_minhash(nova))
+                    resumo["substituidas"] += 1
+        return resumo
+
+    # Agendamento
+
+    def executar_tarefa(self, nome: str) -> dict:
+        """Executa uma tarefa agora, registrando duração e resultado"""
+        estado = self.tarefas[nome]
+        inicio = time.perf_counter()
+        conn = sqlite3.connect(self.db_path, timeout=self.trava_maxima, isolation_level=None)
+        try:
+            resultado = self._funcoes[nome](conn, estado)
+        except sqlite3.OperationalError as e:
+            if "locked" not in str(e) and "busy" not in str(e):
+                raise
+            # A trava não saiu dentro do orçamento: tenta de novo no próximo ciclo
+            with self._lock:
+                estado.adiadas += 1
+            resultado = {"adiada": str(e)}
+        finally:
+            conn.close()
+            with self._lock:
+                estado.execucoes += 1
+                estado.duracoes.append(time.perf_counter() - inicio)
+        with self._lock:
+            estado.ultimo_resultado = resultado
+        return resultado
+
+    def _executar(self):
+        while self.tarefas:
+            estado = min(self.tarefas.values(), key=lambda t: t.proxima)
+            if self._parar.wait(max(0.0, estado.proxima - time.monotonic())):
+                break
+            try:
+                self.executar_tarefa(estado.nome)
+            except Exception as e:
+                with self._lock:
+                    estado.falhas += 1
+                print(f"[WARN] Falha na manutenção '{estado.nome}': {e}")
+            estado.proxima = time.monotonic() + estado.intervalo
+
+    def iniciar(self):
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="manutencao", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def metricas(self) -> dict:
+        with self._lock:
+            return {
+                nome: {
+                    "execucoes": estado.execucoes,
+                    "falhas": estado.falhas,
+                    "adiadas": estado.adiadas,
+                    "ultima_ms": round(estado.duracoes[-1] * 1000, 3) if estado.duracoes else None,
+                    "media_ms": round(sum(estado.duracoes) / len(estado.duracoes) * 1000, 3) if estado.duracoes else None,
+                    "maior_ms": round(max(estado.duracoes) * 1000, 3) if estado.duracoes else None,
+                    "maior_trava_ms": round(estado.maior_trava * 1000, 3),
+                    "travas_acima_orcamento": estado.travas_acima,
+                    "ultimo_resultado": estado.ultimo_resultado,
+                }
+                for nome, estado in self.tarefas.items()
+            }
@@ -0,0 +1,115 @@
+import sqlite3
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+from backend.database.queries import SQL_FRASES_DA_PALAVRA, SQL_TOTAL_FRASES, SQL_ULTIMA_FRASE
+from backend.game.deduplicacao import NUM_BANDAS, sql_candidatas
+from backend.game.ranking import SQL_PLACAR_CATEGORIA, SQL_PLACAR_PERIODO
+
+# Limite de linhas amostradas por índice no ANALYZE, para que ele não
+# pese na inicialização de bancos grandes
+LIMITE_ANALISE = 1000
+
+
+def _garantir_coluna(cursor: sqlite3.Cursor, tabela: str, coluna: str, definicao: str):
+    """Adiciona a coluna em bancos criados antes dela existir"""
+    cursor.execute(f"PRAGMA table_info({tabela})")
+    if coluna not in {row[1] for row in cursor.fetchall()}:
+        cursor.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {definicao}")
+
+
+def _m001_assinatura_frases(cursor: sqlite3.Cursor):
+    _garantir_coluna(cursor, "frases", "assinatura", "BLOB")
+
+
+# Migrações em ordem: (versão, descrição, função). `criar_banco` já cria o
+# esquema atual em bancos novos, então cada migração precisa funcionar
+# também quando a mudança já estiver presente.
+MIGRACOES: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, "assinatura MinHash das frases", _m001_assinatura_frases),
+]
+
+# Consultas executadas a cada requisição (backend/api/endpoints.py,
+# backend/game/frases.py, deduplicacao.py e ranking.py), com parâmetros de exemplo
+CONSULTAS_QUENTES: List[Tuple[str, str, tuple]] = [
+    ("frases_da_palavra", SQL_FRASES_DA_PALAVRA, (1,)),
+    ("total_frases", SQL_TOTAL_FRASES, (1,)),
+    ("ultima_frase", SQL_ULTIMA_FRASE, (1,)),
+    ("candidatas_duplicata", sql_candidatas(NUM_BANDAS), (1, *range(NUM_BANDAS))),
+    ("placar_categoria", SQL_PLACAR_CATEGORIA, ("Medicina",)),
+    ("placar_periodo", SQL_PLACAR_PERIODO, ("2024-01-01", "2024-01-08")),
+]
+
+
+def versao_esquema(conn: sqlite3.Connection) -> int:
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS schema_version (
+        versao INTEGER PRIMARY KEY,
+        descricao TEXT NOT NULL,
+        aplicada_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    return conn.execute("SELECT COALESCE(MAX(versao), 0) FROM schema_version").fetchone()[0]
+
+
+def migrar(db_path: str | Path) -> List[int]:
+    """
+    Aplica as migrações pendentes, cada uma em sua própria transação e
+    registrada em `schema_version`, e atualiza as estatísticas do
+    planejador (ANALYZE).
+
+    Returns:
+        Versões aplicadas nesta chamada
+    """
+    conn = sqlite3.connect(str(db_path), isolation_level=None)
+    try:
+        atual = versao_esquema(conn)
+        aplicadas = []
+        for versao, descricao, migracao in MIGRACOES:
+            if versao <= atual:
+                continue
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                migracao(conn.cursor())
+                conn.execute(
+                    "INSERT INTO schema_version (versao, descricao) VALUES (?, ?)", (versao, descricao)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            print(f"[INFO] Migração {versao} aplicada: {descricao}")
+            aplicadas.append(versao)
+
+        conn.execute(f"PRAGMA analysis_limit={LIMITE_ANALISE}")
+        conn.execute("ANALYZE")
+        return aplicadas
+    finally:
+        conn.close()
+
+
+def _varredura_completa(detalhe: str) -> bool:
+    """Linha do EXPLAIN QUERY PLAN que lê a tabela inteira sem índice"""
+    return (detalhe.startswith("SCAN ")
+            and "INDEX" not in detalhe
+            and "VIRTUAL TABLE" not in detalhe
+            and "CONSTANT ROW" not in detalhe)
+
+
+def planos_consultas(db_path: str | Path) -> List[Tuple[str, List[str]]]:
+    """Plano (EXPLAIN QUERY PLAN) de cada consulta quente"""
+    with sqlite3.connect(str(db_path)) as conn:
+        return [
+            (nome, [linha[3] for linha in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parametros)])
+            for nome, sql, parametros in CONSULTAS_QUENTES
+        ]
+
+
+def verificar_planos(db_path: str | Path) -> List[Tuple[str, str]]:
+    """Consultas quentes cujo plano cai em varredura completa de tabela"""
+    return [
+        (nome, detalhe)
+        for nome, detalhes in planos_consultas(db_path)
+        for detalhe in detalhes
+        if _varredura_completa(detalhe)
+    ]
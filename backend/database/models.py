@@ -1,13 +1,13 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class Categoria:
     id: int
     nome: str
     descricao: Optional[str] = None
 
-@dataclass
+@dataclass(slots=True)
 class Palavra:
     id: int
     palavra: str
@@ -18,14 +18,25 @@ class Palavra:
     variacoes: List[str] = None
     categoria_nome: Optional[str] = None  
 
-@dataclass
+@dataclass(slots=True)
 class Frase:
     id: int
     conteudo: str
     palavra_id: int
 
-@dataclass
+@dataclass(slots=True)
 class VariacaoAceita:
     id: int
     variacao: str
-    palavra_id: int
\ No newline at end of file
+    palavra_id: int
+
+@dataclass(slots=True)
+class Tentativa:
+    jogador: str
+    palavra_id: int
+    categoria: str
+    resposta: str
+    similaridade: float
+    acerto: bool
+    pontos: int
+    data_criacao: str
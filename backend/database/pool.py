@@ -0,0 +1,117 @@
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from backend.config import DB_BUSY_TIMEOUT, DB_PATH, DB_POOL_ESPERA, DB_POOL_TAMANHO, DB_WAL
+
+
+class PoolEsgotado(Exception):
+    """Nenhuma conexão ficou livre dentro do tempo de espera"""
+
+
+class PoolConexoes:
+    """
+    Conjunto fixo de conexões SQLite com o banco principal, reaproveitadas
+    entre as requisições.
+
+    As conexões são abertas uma vez, com `check_same_thread=False` (a
+    dependência do FastAPI e o threadpool podem usá-las em threads
+    diferentes, mas nunca duas ao mesmo tempo) e, com `wal`, em modo WAL
+    para que as leituras não esperem pelas escritas. Uma conexão devolvida
+    com transação aberta é desfeita antes de voltar ao pool.
+    """
+
+    def __init__(self, db_path: str | Path = DB_PATH, tamanho: int = DB_POOL_TAMANHO,
+                 espera: float = DB_POOL_ESPERA, wal: bool = DB_WAL,
+                 busy_timeout: float = DB_BUSY_TIMEOUT):
+        self.db_path = str(db_path)
+        self.tamanho = tamanho
+        self.espera = espera
+        self.wal = wal
+        self.busy_timeout = busy_timeout
+        self._livres: queue.LifoQueue = queue.LifoQueue()
+        self._abertas = 0
+        self._lock = threading.Lock()
+        self._contadores = {"emprestimos": 0, "esgotado": 0}
+        self._espera_total = 0.0
+
+    def _abrir(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=self.busy_timeout, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.wal:
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Com WAL, NORMAL só sincroniza no checkpoint e continua seguro contra corrupção
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def adquirir(self) -> sqlite3.Connection:
+        inicio = time.perf_counter()
+        try:
+            conn = self._livres.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                abrir = self._abertas < self.tamanho
+                if abrir:
+                    self._abertas += 1
+            if abrir:
+                try:
+                    conn = self._abrir()
+                except sqlite3.Error:
+                    with self._lock:
+                        self._abertas -= 1
+                    raise
+            else:
+                try:
+                    conn = self._livres.get(timeout=self.espera)
+                except queue.Empty:
+                    with self._lock:
+                        self._contadores["esgotado"] += 1
+                    raise PoolEsgotado(f"Nenhuma conexão livre em {self.espera}s")
+        with self._lock:
+            self._contadores["emprestimos"] += 1
+            self._espera_total += time.perf_counter() - inicio
+        return conn
+
+    def devolver(self, conn: sqlite3.Connection):
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # Conexão inutilizável: fecha e libera a vaga para uma nova
+            conn.close()
+            with self._lock:
+                self._abertas -= 1
+            return
+        self._livres.put(conn)
+
+    @contextmanager
+    def conexao(self) -> Iterator[sqlite3.Connection]:
+        conn = self.adquirir()
+        try:
+            yield conn
+        finally:
+            self.devolver(conn)
+
+    def fechar(self):
+        while True:
+            try:
+                conn = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._abertas -= 1
+
+    def metricas(self) -> dict:
+        with self._lock:
+            emprestimos = self._contadores["emprestimos"]
+            return {
+                **self._contadores,
+                "abertas": self._abertas,
+                "livres": self._livres.qsize(),
+                "espera_media_ms": round(self._espera_total / emprestimos * 1000, 3) if emprestimos else 0.0,
+            }
@@ -3,6 +3,11 @@ from pathlib import Path
 from typing import Optional, List, Dict
 from .models import Palavra, Categoria
 
+# Consultas do caminho das requisições (verificadas por migracoes.verificar_planos)
+SQL_FRASES_DA_PALAVRA = "SELECT frase FROM frases WHERE palavra_id=? ORDER BY rowid ASC"
+SQL_TOTAL_FRASES = "SELECT COUNT(*) as total FROM frases WHERE palavra_id=?"
+SQL_ULTIMA_FRASE = "SELECT frase FROM frases WHERE palavra_id=? ORDER BY rowid DESC LIMIT 1"
+
 def get_db_connection(db_path: str | Path):
     """Cria e retorna uma conexão com o banco configurada"""
     conn = sqlite3.connect(str(db_path) if isinstance(db_path, Path) else db_path)
@@ -107,4 +112,15 @@ def get_categorias(db_path: str | Path) -> List[Dict[str, any]]:
             ]
     except sqlite3.Error as e:
         print(f"Erro ao buscar categorias: {e}")
-        return []
\ No newline at end of file
+        return []
+
+def get_variacoes_aceitas(db_path: str | Path) -> List[str]:
+    """Retorna o texto de todas as variações aceitas"""
+    try:
+        with get_db_connection(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT variacao FROM variacoes_aceitas")
+            return [row['variacao'] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Erro ao buscar variações: {e}")
+        return []
@@ -0,0 +1,199 @@
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from backend.config import (
+    DB_PATH,
+    REPLICAS_DIR,
+    REPLICAS_INTERVALO,
+    REPLICAS_OBSOLESCENCIA_MAXIMA,
+)
+
+# Páginas copiadas por passo do backup; entre os passos o primário fica
+# livre para as escritas
+_PAGINAS_POR_PASSO = 1024
+
+
+def _processo_vivo(pid: int) -> bool:
+    if os.name == 'nt':
+        # os.kill(pid, 0) no Windows envia CTRL_C_EVENT: na dúvida, considera vivo
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # existe, mas pertence a outro usuário
+    return True
+
+
+class PublicadorReplicas:
+    """
+    Publica cópias somente leitura do banco principal para os endpoints de
+    leitura.
+
+    A cada `intervalo` segundos, se o primário mudou, uma cópia nova é feita
+    com a API de backup online do SQLite em um arquivo novo. Só depois de
+    completa ela passa a ser a réplica atual; a troca é apenas a atualização
+    de uma referência. As conexões de leitura abrem a réplica atual com
+    `mode=ro&immutable=1`, sem travas nem leitura de journal, então as
+    escritas no primário não afetam as leituras. Se a réplica ficar mais
+    velha que `obsolescencia_maxima` (publicação falhando), as leituras
+    voltam ao primário.
+    """
+
+    def __init__(self, db_path: str | Path = DB_PATH, diretorio: str | Path = REPLICAS_DIR,
+                 intervalo: float = REPLICAS_INTERVALO,
+                 obsolescencia_maxima: float = REPLICAS_OBSOLESCENCIA_MAXIMA):
+        self.db_path = Path(db_path)
+        self.diretorio = Path(diretorio)
+        self.intervalo = intervalo
+        self.obsolescencia_maxima = obsolescencia_maxima
+
+        self._sequencia = itertools.count(1)
+        self._atual: Optional[Tuple[Path, float]] = None  # (arquivo, momento da cópia)
+        self._publicadas: List[Path] = []
+        self._assinatura_primario = None
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._contadores = {"publicadas": 0, "leituras_replica": 0, "leituras_primario": 0, "falhas": 0}
+        self._ultima_duracao = 0.0
+
+    def _assinatura(self):
+        """Tamanho e data de modificação do primário e do seu WAL"""
+        partes = []
+        for caminho in (self.db_path, Path(f"{self.db_path}-wal")):
+            try:
+                info = caminho.stat()
+                partes.append((info.st_size, info.st_mtime_ns))
+            except FileNotFoundError:
+                partes.append(None)
+        return tuple(partes)
+
+    def publicar(self, forcar: bool = False) -> bool:
+        """Copia o primário para uma nova réplica; retorna False se nada mudou"""
+        assinatura = self._assinatura()
+        if not forcar and assinatura == self._assinatura_primario:
+            # Nada mudou: a réplica atual continua fiel ao primário
+            with self._lock:
+                if self._atual:
+                    self._atual = (self._atual[0], time.time())
+            return False
+
+        inicio = time.perf_counter()
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        destino = self.diretorio / f"replica-{os.getpid()}-{next(self._sequencia)}.db"
+        temporario = destino.with_suffix('.tmp')
+        momento = time.time()
+        origem = sqlite3.connect(str(self.db_path))
+        copia = sqlite3.connect(str(temporario))
+        try:
+            origem.backup(copia, pages=_PAGINAS_POR_PASSO)
+            # A réplica é um arquivo isolado: sem WAL para acompanhar
+            copia.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            copia.close()
+            origem.close()
+        os.replace(temporario, destino)
+
+        with self._lock:
+            self._atual = (destino, momento)
+            self._publicadas.append(destino)
+            antigas = self._publicadas[:-2]
+            self._publicadas = self._publicadas[-2:]
+            self._assinatura_primario = assinatura
+            self._contadores["publicadas"] += 1
+            self._ultima_duracao = time.perf_counter() - inicio
+        # Conexões ainda abertas sobre uma réplica antiga continuam válidas
+        # até fechar (o arquivo só some de fato depois disso)
+        for antiga in antigas:
+            try:
+                antiga.unlink()
+            except OSError:
+                pass
+        return True
+
+    def _executar(self):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.publicar()
+            except (sqlite3.Error, OSError) as e:
+                with self._lock:
+                    self._contadores["falhas"] += 1
+                print(f"[WARN] Falha ao publicar réplica: {e}")
+
+    def limpar_orfas(self) -> int:
+        """
+        Apaga réplicas (e cópias .tmp) deixadas por processos que já
+        terminaram; o PID de quem gravou faz parte do nome do arquivo
+        """
+        removidas = 0
+        for arquivo in self.diretorio.glob("replica-*-*.*"):
+            if arquivo.suffix not in ('.db', '.tmp'):
+                continue
+            try:
+                pid = int(arquivo.stem.split('-')[1])
+            except ValueError:
+                continue
+            if pid == os.getpid() or _processo_vivo(pid):
+                continue
+            try:
+                arquivo.unlink()
+                removidas += 1
+            except OSError:
+                pass
+        if removidas:
+            print(f"[INFO] {removidas} réplica(s) órfã(s) removida(s) de {self.diretorio}")
+        return removidas
+
+    def iniciar(self):
+        """Limpa réplicas órfãs, publica a primeira e inicia a republicação periódica"""
+        self.limpar_orfas()
+        self.publicar(forcar=True)
+        self._parar.clear()
+        self._thread = threading.Thread(target=self._executar, name="replicas", daemon=True)
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def conectar(self) -> sqlite3.Connection:
+        """
+        Conexão somente leitura com a réplica atual, ou com o primário se ela
+        estiver velha demais. Pode ser usada fora da thread que a abriu (as
+        dependências do FastAPI e o threadpool), mas por uma thread de cada vez.
+        """
+        with self._lock:
+            atual = self._atual
+            if atual is None or time.time() - atual[1] > self.obsolescencia_maxima:
+                atual = None
+                self._contadores["leituras_primario"] += 1
+            else:
+                self._contadores["leituras_replica"] += 1
+        if atual is None:
+            conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        else:
+            conn = sqlite3.connect(
+                f"{atual[0].resolve().as_uri()}?mode=ro&immutable=1", uri=True, check_same_thread=False
+            )
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def metricas(self) -> dict:
+        with self._lock:
+            atual = self._atual
+            contadores = dict(self._contadores)
+            ultima_duracao = self._ultima_duracao
+        return {
+            **contadores,
+            "idade_s": round(time.time() - atual[1], 3) if atual else None,
+            "ultima_publicacao_ms": round(ultima_duracao * 1000, 3),
+        }
@@ -1,6 +1,58 @@
 import sqlite3
 from pathlib import Path
 
+def get_versao_dados(conn: sqlite3.Connection) -> tuple:
+    """Retorna (instancia, versao) do carimbo de versão dos dados"""
+    row = conn.execute("SELECT instancia, versao FROM versao_dados WHERE id = 1").fetchone()
+    return (row[0], row[1]) if row else ("", 0)
+
+def criar_indices_busca(cursor: sqlite3.Cursor):
+    """Cria as tabelas FTS5 e seus triggers, populando-as se forem novas"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('palavras_fts', 'frases_fts')")
+    existentes = {row[0] for row in cursor.fetchall()}
+
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS palavras_fts USING fts5(
+        palavra, definicao,
+        content='palavras', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3 4'
+    )
+    """)
+    cursor.execute("""
+    CREATE VIRTUAL TABLE IF NOT EXISTS frases_fts USING fts5(
+        frase,
+        content='frases', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """)
+
+    for tabela, colunas in (("palavras", ("palavra", "definicao")), ("frases", ("frase",))):
+        fts = f"{tabela}_fts"
+        lista = ", ".join(colunas)
+        novos = ", ".join(f"new.{c}" for c in colunas)
+        antigos = ", ".join(f"old.{c}" for c in colunas)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {tabela}
+        BEGIN
+            INSERT INTO {fts} (rowid, {lista}) VALUES (new.id, {novos});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {tabela}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+        END
+        """)
+        cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {lista} ON {tabela}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {lista}) VALUES ('delete', old.id, {antigos});
+            INSERT INTO {fts} (rowid, {lista}) VALUES (new.id, {novos});
+        END
+        """)
+        if fts not in existentes:
+            cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
 def criar_banco(db_path: str) -> bool:
     """
     Cria o banco de dados com as tabelas necessárias se não existirem.
@@ -12,6 +64,9 @@ def criar_banco(db_path: str) -> bool:
         
         conn = sqlite3.connect(db_path)
         cursor = conn.cursor()
+        # Só tem efeito em bancos novos (vazios); permite a manutenção
+        # devolver páginas livres aos poucos com incremental_vacuum
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
         
         # Cria tabela de categorias
         cursor.execute("""
@@ -42,10 +97,27 @@ def criar_banco(db_path: str) -> bool:
             frase TEXT NOT NULL,
             gerada_automaticamente BOOLEAN DEFAULT TRUE,
             data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            assinatura BLOB,
             FOREIGN KEY (palavra_id) REFERENCES palavras (id)
         )
         """)
 
+        # Cria tabela de chaves LSH das frases (detecção de quase duplicatas)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS frases_lsh (
+            frase_id INTEGER NOT NULL,
+            palavra_id INTEGER NOT NULL,
+            chave INTEGER NOT NULL,
+            FOREIGN KEY (frase_id) REFERENCES frases (id)
+        )
+        """)
+        cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_frases_lsh_delete AFTER DELETE ON frases
+        BEGIN
+            DELETE FROM frases_lsh WHERE frase_id = old.id;
+        END
+        """)
+
         # Cria tabela de variações aceitas
         cursor.execute("""
         CREATE TABLE IF NOT EXISTS variacoes_aceitas (
@@ -56,10 +128,70 @@ def criar_banco(db_path: str) -> bool:
         )
         """)
         
+        # Cria tabela de tentativas de resposta (gravada em lotes)
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tentativas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            jogador TEXT NOT NULL,
+            palavra_id INTEGER NOT NULL,
+            categoria TEXT,
+            resposta TEXT NOT NULL,
+            similaridade REAL NOT NULL,
+            acerto BOOLEAN NOT NULL,
+            pontos INTEGER NOT NULL DEFAULT 0,
+            data_criacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (palavra_id) REFERENCES palavras (id)
+        )
+        """)
+
+        # Cria tabela de pontuação acumulada por jogador
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS pontuacoes (
+            jogador TEXT PRIMARY KEY,
+            pontos INTEGER NOT NULL DEFAULT 0,
+            acertos INTEGER NOT NULL DEFAULT 0,
+            tentativas INTEGER NOT NULL DEFAULT 0,
+            atualizado_em TIMESTAMP
+        )
+        """)
+
+        # Carimbo de versão dos dados de leitura (palavras, categorias e
+        # variações), usado para saber se um snapshot ainda vale para o banco
+        cursor.execute("""
+        CREATE TABLE IF NOT EXISTS versao_dados (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            instancia TEXT NOT NULL,
+            versao INTEGER NOT NULL DEFAULT 0
+        )
+        """)
+        cursor.execute(
+            "INSERT OR IGNORE INTO versao_dados (id, instancia, versao) VALUES (1, lower(hex(randomblob(8))), 0)"
+        )
+        for tabela in ("palavras", "categorias", "variacoes_aceitas"):
+            for operacao in ("INSERT", "UPDATE", "DELETE"):
+                cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_versao_{tabela}_{operacao.lower()}
+                AFTER {operacao} ON {tabela}
+                BEGIN
+                    UPDATE versao_dados SET versao = versao + 1 WHERE id = 1;
+                END
+                """)
+
+        # Índices de busca textual (FTS5) sobre palavras, definições e frases,
+        # sincronizados por triggers; o índice de prefixo atende o autocompletar
+        criar_indices_busca(cursor)
+
         # Cria índices para melhor performance
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_palavras_categoria ON palavras (categoria_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_frases_palavra ON frases (palavra_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_variacoes_palavra ON variacoes_aceitas (palavra_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_frases_lsh_palavra_chave ON frases_lsh (palavra_id, chave)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_frases_lsh_frase ON frases_lsh (frase_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tentativas_jogador ON tentativas (jogador)")
+        # Índices de cobertura para reconstruir os placares sem ler a tabela
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tentativas_categoria_placar ON tentativas (categoria, jogador, pontos)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tentativas_data_placar ON tentativas (data_criacao, jogador, pontos)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pontuacoes_placar ON pontuacoes (pontos DESC, jogador)")
         
         conn.commit()
         conn.close()
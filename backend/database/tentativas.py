@@ -0,0 +1,212 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from backend.config import (
+    BUFFER_CAPACIDADE,
+    BUFFER_ESPERA_MAXIMA,
+    BUFFER_INTERVALO,
+    BUFFER_POLITICA,
+    BUFFER_TAMANHO_LOTE,
+)
+from .models import Tentativa
+
+
+def agora_utc() -> str:
+    """Timestamp no mesmo formato do CURRENT_TIMESTAMP do SQLite"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+
+
+def gravar_lote(conn: sqlite3.Connection, lote: List[Tentativa]):
+    """Grava as tentativas e atualiza a pontuação acumulada em uma transação"""
+    acumulado: Dict[str, tuple] = {}
+    for t in lote:
+        pontos, acertos, total, atualizado = acumulado.get(t.jogador, (0, 0, 0, t.data_criacao))
+        acumulado[t.jogador] = (
+            pontos + t.pontos,
+            acertos + int(t.acerto),
+            total + 1,
+            max(atualizado, t.data_criacao),
+        )
+
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO tentativas
+            (jogador, palavra_id, categoria, resposta, similaridade, acerto, pontos, data_criacao)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (t.jogador, t.palavra_id, t.categoria, t.resposta,
+                 t.similaridade, t.acerto, t.pontos, t.data_criacao)
+                for t in lote
+            ],
+        )
+        conn.executemany(
+            """
+            INSERT INTO pontuacoes (jogador, pontos, acertos, tentativas, atualizado_em)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(jogador) DO UPDATE SET
+                pontos = pontos + excluded.pontos,
+                acertos = acertos + excluded.acertos,
+                tentativas = tentativas + excluded.tentativas,
+                atualizado_em = excluded.atualizado_em
+            """,
+            [(jogador, *valores) for jogador, valores in acumulado.items()],
+        )
+
+
+class BufferTentativas:
+    """
+    Fila em memória (write-behind) das tentativas de resposta.
+
+    `registrar` apenas enfileira; uma thread grava em lote quando a fila
+    atinge `tamanho_lote` ou a cada `intervalo` segundos. A fila é limitada a
+    `capacidade` itens: com a política 'descartar' a tentativa excedente é
+    descartada na hora; com 'bloquear' o chamador espera até `espera_maxima`
+    segundos por espaço antes de descartar. `parar` grava tudo o que restar.
+    """
+
+    def __init__(self, db_path: str | Path,
+                 tamanho_lote: int = BUFFER_TAMANHO_LOTE,
+                 intervalo: float = BUFFER_INTERVALO,
+                 capacidade: int = BUFFER_CAPACIDADE,
+                 politica: str = BUFFER_POLITICA,
+                 espera_maxima: float = BUFFER_ESPERA_MAXIMA):
+        if politica not in ('descartar', 'bloquear'):
+            raise ValueError(f"Política de buffer inválida: {politica}")
+        self.db_path = str(db_path)
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.capacidade = capacidade
+        self.politica = politica
+        self.espera_maxima = espera_maxima
+
+        self._fila: deque = deque()
+        self._cond = threading.Condition()
+        self._parando = False
+        self._thread = None
+        self._ao_gravar: List[Callable[[List[Tentativa]], None]] = []
+        self._contadores = {
+            "enfileiradas": 0,
+            "gravadas": 0,
+            "descartadas": 0,
+            "esperas_backpressure": 0,
+            "lotes": 0,
+            "falhas": 0,
+        }
+        self._ultimo_lote_ms = 0.0
+
+    def ao_gravar(self, callback: Callable[[List[Tentativa]], None]):
+        """Registra uma função chamada com cada lote após o commit"""
+        self._ao_gravar.append(callback)
+
+    def registrar(self, tentativa: Tentativa) -> bool:
+        """Enfileira a tentativa; retorna False se ela foi descartada"""
+        with self._cond:
+            if len(self._fila) >= self.capacidade:
+                if self.politica == 'bloquear':
+                    self._contadores["esperas_backpressure"] += 1
+                    self._cond.notify_all()
+                    self._cond.wait_for(
+                        lambda: len(self._fila) < self.capacidade, timeout=self.espera_maxima
+                    )
+                if len(self._fila) >= self.capacidade:
+                    self._contadores["descartadas"] += 1
+                    return False
+            self._fila.append(tentativa)
+            self._contadores["enfileiradas"] += 1
+            if len(self._fila) >= self.tamanho_lote:
+                self._cond.notify_all()
+            return True
+
+    def iniciar(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._parando = False
+        self._thread = threading.Thread(target=self._executar, name="buffer-tentativas", daemon=True)
+        self._thread.start()
+
+    def parar(self, timeout: float = 10.0):
+        """Interrompe a thread e grava todas as tentativas pendentes"""
+        with self._cond:
+            self._parando = True
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+        # Garante a gravação mesmo se a thread não estava rodando
+        self.descarregar()
+
+    def descarregar(self) -> int:
+        """Grava imediatamente tudo o que está na fila; retorna o total gravado"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            total = 0
+            while gravadas := self._gravar_proximo_lote(conn):
+                total += gravadas
+            return total
+        finally:
+            conn.close()
+
+    def _executar(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(
+                        lambda: self._parando or len(self._fila) >= self.tamanho_lote,
+                        timeout=self.intervalo,
+                    )
+                    parando = self._parando
+                while self._gravar_proximo_lote(conn):
+                    pass
+                if parando:
+                    return
+        finally:
+            conn.close()
+
+    def _gravar_proximo_lote(self, conn: sqlite3.Connection) -> int:
+        with self._cond:
+            if not self._fila:
+                return 0
+            lote = [self._fila.popleft() for _ in range(min(self.tamanho_lote, len(self._fila)))]
+            self._cond.notify_all()  # libera quem espera por espaço
+
+        inicio = time.perf_counter()
+        try:
+            gravar_lote(conn, lote)
+        except sqlite3.Error as e:
+            print(f"[ERROR] Falha ao gravar lote de tentativas: {e}")
+            with self._cond:
+                self._contadores["falhas"] += 1
+                # Devolve à frente da fila o que couber; o resto é descartado
+                espaco = max(0, self.capacidade - len(self._fila))
+                self._fila.extendleft(reversed(lote[:espaco]))
+                self._contadores["descartadas"] += len(lote) - min(espaco, len(lote))
+            return 0
+
+        with self._cond:
+            self._contadores["gravadas"] += len(lote)
+            self._contadores["lotes"] += 1
+            self._ultimo_lote_ms = (time.perf_counter() - inicio) * 1000
+
+        for callback in self._ao_gravar:
+            try:
+                callback(lote)
+            except Exception as e:
+                print(f"[WARN] Callback de lote falhou: {e}")
+        return len(lote)
+
+    def metricas(self) -> dict:
+        with self._cond:
+            return {
+                **self._contadores,
+                "pendentes": len(self._fila),
+                "capacidade": self.capacidade,
+                "ultimo_lote_ms": round(self._ultimo_lote_ms, 3),
+            }
@@ -0,0 +1,176 @@
+import csv
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.config import DB_PATH
+from backend.database.catalogo import CatalogoPalavras
+from backend.database.queries import get_variacoes_aceitas
+
+# Assinatura de um pontuador: (resposta, definição, palavra_id) -> (similaridade, acerto)
+Pontuador = Callable[[str, str, Optional[int]], Tuple[float, bool]]
+
+LIMIARES_PADRAO = tuple(round(0.3 + 0.05 * i, 2) for i in range(14))  # 0.30 a 0.95
+LIMIAR_ATUAL = 0.65
+PERCENTIS = (50, 90, 99)
+
+
+@dataclass(slots=True)
+class ExemploRotulado:
+    palavra: str
+    resposta: str
+    esperado: bool
+
+
+@dataclass
+class ResultadoReplay:
+    nome: str
+    similaridades: List[float]
+    acertos: List[bool]
+    esperados: List[bool]
+    latencias_us: List[float]  # todas as medições (respostas x repetições), em rodadas
+    respostas_por_segundo: float
+    exemplos: List[Tuple[str, str]] = field(default_factory=list)  # (palavra, resposta)
+
+    def salvar(self, caminho: str | Path):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False)
+
+    @classmethod
+    def carregar(cls, caminho: str | Path) -> 'ResultadoReplay':
+        with open(caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        dados["exemplos"] = [tuple(e) for e in dados.get("exemplos", [])]
+        return cls(**dados)
+
+
+def carregar_dataset(caminho: str | Path) -> List[ExemploRotulado]:
+    """CSV com as colunas palavra, resposta e esperado (1/0)"""
+    with open(caminho, encoding='utf-8', newline='') as f:
+        return [
+            ExemploRotulado(linha["palavra"], linha["resposta"], linha["esperado"].strip() in ("1", "sim", "true"))
+            for linha in csv.DictReader(f)
+            if linha.get("palavra")
+        ]
+
+
+def criar_pontuador(nome: str, db_path: str | Path = DB_PATH,
+                    catalogo: Optional[CatalogoPalavras] = None) -> Pontuador:
+    """
+    Monta uma configuração do avaliador como o servidor faria no lifespan:
+      radicais:        comparação por radicais + correção ortográfica (padrão)
+      sem-correcao:    só comparação por radicais
+      tfidf:           TF-IDF treinado nas definições + radicais + correção
+      incremental:     modelo TF-IDF incremental + radicais + correção
+      hashing:         n-gramas de caracteres com hashing (sem treino) + radicais + correção
+    """
+    from backend.game.processamento import AvaliadorRespostas
+
+    catalogo = catalogo or CatalogoPalavras.construir(db_path)
+    avaliador = AvaliadorRespostas()
+    if nome != "sem-correcao":
+        avaliador.construir_indice_correcao(list(catalogo.definicoes) + get_variacoes_aceitas(db_path))
+    if nome == "tfidf":
+        avaliador.treinar_modelo([d.lower() for d in catalogo.definicoes])
+    elif nome in ("incremental", "hashing"):
+        avaliador.ativar_backend(nome, db_path)
+    elif nome not in ("radicais", "sem-correcao"):
+        raise ValueError(f"Pontuador desconhecido: {nome}")
+    return avaliador.avaliar_resposta
+
+
+def reproduzir(nome: str, pontuador: Pontuador, exemplos: Sequence[ExemploRotulado],
+               catalogo: CatalogoPalavras, repeticoes: int = 1) -> ResultadoReplay:
+    """
+    Passa o dataset pelo pontuador do mesmo jeito que o /api/verificar.
+    Faz uma rodada de aquecimento e mede `repeticoes` rodadas, guardando
+    todas as medições: os percentis saem da distribuição completa, não só
+    do melhor caso de cada resposta.
+    """
+    entradas = []
+    for exemplo in exemplos:
+        linha = catalogo.linha_por_termo(exemplo.palavra)
+        if linha is None:
+            raise ValueError(f"Palavra do dataset não está no banco: {exemplo.palavra}")
+        entradas.append((exemplo.resposta.lower().strip(), catalogo.definicoes[linha].lower(), catalogo.ids[linha]))
+
+    for resposta, definicao, palavra_id in entradas:
+        pontuador(resposta, definicao, palavra_id)
+
+    latencias = []
+    resultados = []
+    inicio_total = time.perf_counter()
+    for _ in range(repeticoes):
+        resultados = []
+        for resposta, definicao, palavra_id in entradas:
+            inicio = time.perf_counter_ns()
+            resultados.append(pontuador(resposta, definicao, palavra_id))
+            latencias.append((time.perf_counter_ns() - inicio) / 1000)
+    duracao = time.perf_counter() - inicio_total
+
+    return ResultadoReplay(
+        nome=nome,
+        similaridades=[float(similaridade) for similaridade, _ in resultados],
+        acertos=[bool(acerto) for _, acerto in resultados],
+        esperados=[exemplo.esperado for exemplo in exemplos],
+        latencias_us=latencias,
+        respostas_por_segundo=len(entradas) * repeticoes / duracao if duracao else 0.0,
+        exemplos=[(exemplo.palavra, exemplo.resposta) for exemplo in exemplos],
+    )
+
+
+def matriz_confusao(previstos: Sequence[bool], esperados: Sequence[bool]) -> Dict[str, float]:
+    vp = sum(p and e for p, e in zip(previstos, esperados))
+    fp = sum(p and not e for p, e in zip(previstos, esperados))
+    fn = sum(e and not p for p, e in zip(previstos, esperados))
+    precisao = vp / (vp + fp) if vp + fp else 1.0
+    recall = vp / (vp + fn) if vp + fn else 1.0
+    f1 = 2 * precisao * recall / (precisao + recall) if precisao + recall else 0.0
+    return {"vp": vp, "fp": fp, "fn": fn, "precisao": precisao, "recall": recall, "f1": f1}
+
+
+def curva_limiares(resultado: ResultadoReplay,
+                   limiares: Sequence[float] = LIMIARES_PADRAO) -> List[Dict[str, float]]:
+    """Precisão e recall se o acerto fosse `similaridade > limiar`"""
+    return [
+        {"limiar": limiar, **matriz_confusao([s > limiar for s in resultado.similaridades], resultado.esperados)}
+        for limiar in limiares
+    ]
+
+
+def percentis(valores: Sequence[float], pontos: Sequence[int] = PERCENTIS) -> Dict[str, float]:
+    """Mínimo (melhor caso, à parte), percentis e máximo dos valores"""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return {}
+    return {"min": ordenados[0]} | {
+        f"p{ponto}": ordenados[min(len(ordenados) - 1, int(len(ordenados) * ponto / 100))]
+        for ponto in pontos
+    } | {"max": ordenados[-1]}
+
+
+def comparar(base: ResultadoReplay, novo: ResultadoReplay, tolerancia: float = 1e-6) -> Dict:
+    """Diferenças de decisão e de similaridade entre duas execuções do mesmo dataset"""
+    if base.exemplos and novo.exemplos and base.exemplos != novo.exemplos:
+        raise ValueError("As execuções não usaram o mesmo dataset")
+    decisoes = [
+        {
+            "palavra": palavra, "resposta": resposta, "esperado": esperado,
+            "similaridade_base": sb, "similaridade_nova": sn, "acerto_base": ab, "acerto_novo": an,
+        }
+        for (palavra, resposta), esperado, sb, sn, ab, an in zip(
+            novo.exemplos, novo.esperados, base.similaridades, novo.similaridades, base.acertos, novo.acertos
+        )
+        if ab != an
+    ]
+    diferencas = [abs(sb - sn) for sb, sn in zip(base.similaridades, novo.similaridades)]
+    return {
+        "decisoes_diferentes": decisoes,
+        "similaridades_diferentes": sum(d > tolerancia for d in diferencas),
+        "maior_diferenca": max(diferencas, default=0.0),
+        "acuracia_base": matriz_confusao(base.acertos, base.esperados),
+        "acuracia_nova": matriz_confusao(novo.acertos, novo.esperados),
+        "ganho_vazao": novo.respostas_por_segundo / base.respostas_por_segundo if base.respostas_por_segundo else None,
+    }
@@ -1,22 +1,35 @@
 # backend/game/core.py
-from backend.database.queries import get_palavras_e_definicoes
-from backend.game.processamento import ProcessadorTexto
+from typing import Optional
+from backend.database.catalogo import CatalogoPalavras
+from backend.game.processamento import AvaliadorRespostas
 
 class Jogo:
-    def __init__(self, db_path: str):
-        self.dados = get_palavras_e_definicoes(db_path)
-        self.processador = ProcessadorTexto()
-        self._treinar_processador()
+    def __init__(self, db_path: str, catalogo: Optional[CatalogoPalavras] = None,
+                 avaliador: Optional[AvaliadorRespostas] = None):
+        self.catalogo = catalogo or CatalogoPalavras.construir(db_path)
+        if avaliador is None:
+            avaliador = AvaliadorRespostas()
+            self.avaliador = avaliador
+            self._treinar_avaliador()
+        else:
+            # Avaliador compartilhado (ex.: o dos serviços do app) já chega aquecido
+            self.avaliador = avaliador
+
+    @classmethod
+    def de_servicos(cls, servicos) -> 'Jogo':
+        """Jogo sobre o catálogo e o avaliador já montados no lifespan do app"""
+        return cls(servicos.db_path, catalogo=servicos.catalogo, avaliador=servicos.avaliador)
     
-    def _treinar_processador(self):
-        """Treina o modelo com todas as definições do banco"""
-        definicoes = [item["definicao"] for item in self.dados]
-        self.processador.treinar_modelo(definicoes)
+    def _treinar_avaliador(self):
+        """Treina o modelo com todas as definições do catálogo"""
+        self.avaliador.treinar_modelo(list(self.catalogo.definicoes))
     
     def avaliar_resposta(self, palavra_alvo: str, resposta_jogador: str) -> float:
         """Compara a resposta com a definição correta"""
-        definicao_correta = next(
-            item["definicao"] for item in self.dados 
-            if item["palavra"] == palavra_alvo
+        linha = self.catalogo.linha_por_termo(palavra_alvo)
+        if linha is None:
+            raise ValueError(f"Palavra '{palavra_alvo}' não encontrada")
+        similaridade, _ = self.avaliador.avaliar_resposta(
+            resposta_jogador, self.catalogo.definicoes[linha], palavra_id=self.catalogo.ids[linha]
         )
-        return self.processador.comparar_textos(resposta_jogador, definicao_correta)
\ No newline at end of file
+        return similaridade
@@ -0,0 +1,167 @@
+import pickle
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+VERSAO_INDICE = 1
+
+
+def distancia_edicao(a: str, b: str, limite: int) -> int:
+    """
+    Distância de Damerau-Levenshtein restrita (transposições adjacentes).
+    Retorna limite + 1 assim que a distância ultrapassa o limite.
+    """
+    if abs(len(a) - len(b)) > limite:
+        return limite + 1
+    anterior2 = None
+    anterior = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        atual = [i] + [0] * len(b)
+        menor = atual[0]
+        for j in range(1, len(b) + 1):
+            custo = 0 if a[i - 1] == b[j - 1] else 1
+            atual[j] = min(anterior[j] + 1, atual[j - 1] + 1, anterior[j - 1] + custo)
+            if (anterior2 is not None and i > 1 and j > 1
+                    and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]):
+                atual[j] = min(atual[j], anterior2[j - 2] + 1)
+            menor = min(menor, atual[j])
+        if menor > limite:
+            return limite + 1
+        anterior2, anterior = anterior, atual
+    return anterior[-1]
+
+
+def _delecoes(token: str, distancia: int) -> Set[str]:
+    """Todas as variantes do token com até `distancia` caracteres removidos"""
+    resultado = {token}
+    fronteira = {token}
+    for _ in range(distancia):
+        proxima = set()
+        for palavra in fronteira:
+            for i in range(len(palavra)):
+                proxima.add(palavra[:i] + palavra[i + 1:])
+        resultado |= proxima
+        fronteira = proxima
+    return resultado
+
+
+class IndiceCorrecao:
+    """
+    Índice de deleção simétrica (SymSpell) sobre o vocabulário das definições
+    e variações aceitas.
+
+    Na construção, cada token do vocabulário gera suas variantes com até
+    `distancia_maxima` deleções. Na consulta, as deleções do token digitado
+    são procuradas no mesmo dicionário, e só os candidatos encontrados passam
+    pelo cálculo da distância de edição. O custo não depende do tamanho do
+    vocabulário.
+    """
+
+    def __init__(self, distancia_maxima: int = 2, tamanho_minimo: int = 3):
+        self.distancia_maxima = distancia_maxima
+        self.tamanho_minimo = tamanho_minimo
+        self.vocabulario: Dict[str, Tuple[str, int]] = {}  # token -> (radical, frequência)
+        self.delecoes: Dict[str, Tuple[str, ...]] = {}
+        self.assinatura_fonte: Optional[str] = None
+
+    def _distancia_para(self, token: str) -> int:
+        # Tokens curtos toleram menos erros para não virar outra palavra
+        return 1 if len(token) <= 4 else self.distancia_maxima
+
+    def construir(self, textos: Iterable[str], preprocessar: Callable[[str], str],
+                  radical: Callable[[str], str]):
+        """Monta o índice a partir de textos crus (definições, variações)"""
+        frequencias = Counter(
+            token
+            for texto in textos
+            for token in preprocessar(texto).split()
+            if len(token) >= self.tamanho_minimo
+        )
+        self.vocabulario = {token: (radical(token), freq) for token, freq in frequencias.items()}
+
+        delecoes: Dict[str, List[str]] = {}
+        for token in self.vocabulario:
+            for variante in _delecoes(token, self._distancia_para(token)):
+                delecoes.setdefault(variante, []).append(token)
+        self.delecoes = {variante: tuple(tokens) for variante, tokens in delecoes.items()}
+
+    def adicionar(self, textos: Iterable[str], preprocessar: Callable[[str], str],
+                  radical: Callable[[str], str]):
+        """Acrescenta ao índice os tokens de novos textos, sem reconstruí-lo"""
+        frequencias = Counter(
+            token
+            for texto in textos
+            for token in preprocessar(texto).split()
+            if len(token) >= self.tamanho_minimo
+        )
+        for token, freq in frequencias.items():
+            if token in self.vocabulario:
+                raiz, anterior = self.vocabulario[token]
+                self.vocabulario[token] = (raiz, anterior + freq)
+                continue
+            self.vocabulario[token] = (radical(token), freq)
+            for variante in _delecoes(token, self._distancia_para(token)):
+                self.delecoes[variante] = self.delecoes.get(variante, ()) + (token,)
+
+    def corrigir_token(self, token: str) -> Optional[str]:
+        """Token do vocabulário mais próximo (menor distância, depois mais frequente)"""
+        if token in self.vocabulario:
+            return token
+        if len(token) < self.tamanho_minimo:
+            return None
+
+        limite = self._distancia_para(token)
+        melhor, melhor_chave = None, None
+        vistos = set()
+        for variante in _delecoes(token, limite):
+            for candidato in self.delecoes.get(variante, ()):
+                if candidato in vistos:
+                    continue
+                vistos.add(candidato)
+                distancia = distancia_edicao(token, candidato, limite)
+                if distancia > limite:
+                    continue
+                chave = (distancia, -self.vocabulario[candidato][1], candidato)
+                if melhor_chave is None or chave < melhor_chave:
+                    melhor, melhor_chave = candidato, chave
+        return melhor
+
+    def radical(self, token: str) -> Optional[str]:
+        """Radical do token do vocabulário mais próximo, se houver"""
+        corrigido = self.corrigir_token(token)
+        return self.vocabulario[corrigido][0] if corrigido else None
+
+    def corrigir_texto(self, texto_preprocessado: str) -> str:
+        """Substitui cada token fora do vocabulário pelo vizinho mais próximo"""
+        return " ".join(
+            self.corrigir_token(token) or token for token in texto_preprocessado.split()
+        )
+
+    def salvar(self, caminho: str | Path):
+        caminho = Path(caminho)
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        with open(caminho, 'wb') as f:
+            pickle.dump({
+                "versao": VERSAO_INDICE,
+                "distancia_maxima": self.distancia_maxima,
+                "tamanho_minimo": self.tamanho_minimo,
+                "vocabulario": self.vocabulario,
+                "delecoes": self.delecoes,
+                "assinatura_fonte": self.assinatura_fonte,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def carregar(cls, caminho: str | Path) -> Optional['IndiceCorrecao']:
+        """Lê um índice salvo; retorna None se não existir ou for de outra versão"""
+        try:
+            with open(caminho, 'rb') as f:
+                dados = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        if dados.get("versao") != VERSAO_INDICE:
+            return None
+        indice = cls(dados["distancia_maxima"], dados["tamanho_minimo"])
+        indice.vocabulario = dados["vocabulario"]
+        indice.delecoes = dados["delecoes"]
+        indice.assinatura_fonte = dados["assinatura_fonte"]
+        return indice
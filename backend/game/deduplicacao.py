@@ -0,0 +1,193 @@
+import random
+import re
+import sqlite3
+import unicodedata
+import zlib
+from array import array
+from typing import Iterable, List, Optional, Set
+
+from backend.config import LIMIAR_DUPLICATA
+
+# Parâmetros do MinHash/LSH: 16 bandas de 4 linhas dão ~50% de chance de
+# colisão para Jaccard 0.5 e >99% para Jaccard 0.8
+NUM_PERMUTACOES = 64
+LINHAS_POR_BANDA = 4
+NUM_BANDAS = NUM_PERMUTACOES // LINHAS_POR_BANDA
+TAMANHO_SHINGLE = 5
+
+_PRIMO = (1 << 61) - 1
+_MASCARA = 0xFFFFFFFF
+
+# Coeficientes fixos: as assinaturas ficam gravadas no banco e precisam ser
+# reprodutíveis entre processos e versões
+_gerador = random.Random(20240601)
+_COEFICIENTES = [
+    (_gerador.randrange(1, _PRIMO), _gerador.randrange(0, _PRIMO))
+    for _ in range(NUM_PERMUTACOES)
+]
+
+
+def normalizar_frase(frase: str) -> str:
+    """Minúsculas, sem acentos, sem pontuação e com espaços colapsados"""
+    texto = unicodedata.normalize('NFKD', frase.lower()).encode('ASCII', 'ignore').decode('utf-8')
+    texto = re.sub(r'[\W_]+', ' ', texto)
+    return texto.strip()
+
+
+def shingles(frase: str) -> Set[int]:
+    """Conjunto de shingles de caracteres (hash CRC32) da frase normalizada"""
+    texto = normalizar_frase(frase)
+    if len(texto) <= TAMANHO_SHINGLE:
+        return {zlib.crc32(texto.encode('utf-8'))}
+    return {
+        zlib.crc32(texto[i:i + TAMANHO_SHINGLE].encode('utf-8'))
+        for i in range(len(texto) - TAMANHO_SHINGLE + 1)
+    }
+
+
+def assinatura_minhash(frase: str) -> array:
+    """Assinatura MinHash com NUM_PERMUTACOES valores de 32 bits"""
+    conjunto = shingles(frase)
+    return array('I', (
+        min(((a * s + b) % _PRIMO) & _MASCARA for s in conjunto)
+        for a, b in _COEFICIENTES
+    ))
+
+
+def assinatura_de_bytes(dados: bytes) -> array:
+    assinatura = array('I')
+    assinatura.frombytes(dados)
+    return assinatura
+
+
+def chaves_lsh(assinatura: array) -> List[int]:
+    """Uma chave por banda; o índice da banda fica nos bits altos"""
+    chaves = []
+    for banda in range(NUM_BANDAS):
+        inicio = banda * LINHAS_POR_BANDA
+        trecho = assinatura[inicio:inicio + LINHAS_POR_BANDA].tobytes()
+        chaves.append((banda << 32) | zlib.crc32(trecho))
+    return chaves
+
+
+def similaridade_estimada(a: array, b: array) -> float:
+    """Estimativa do índice de Jaccard a partir de duas assinaturas"""
+    iguais = sum(1 for x, y in zip(a, b) if x == y)
+    return iguais / NUM_PERMUTACOES
+
+
+def sql_candidatas(num_chaves: int) -> str:
+    """Frases que compartilham alguma das chaves LSH, para uma palavra"""
+    marcadores = ",".join("?" * num_chaves)
+    return f"""
+        SELECT DISTINCT f.id, f.frase, f.assinatura
+        FROM frases_lsh l
+        JOIN frases f ON f.id = l.frase_id
+        WHERE l.palavra_id = ? AND l.chave IN ({marcadores})
+    """
+
+
+class DetectorDuplicatas:
+    """
+    Detecta frases quase idênticas da mesma palavra.
+
+    Cada linha de `frases` guarda sua assinatura MinHash e as chaves LSH
+    correspondentes ficam em `frases_lsh`, indexadas por (palavra_id, chave).
+    Uma verificação custa uma consulta indexada com NUM_BANDAS chaves e a
+    comparação apenas com as candidatas que colidiram.
+    """
+
+    def __init__(self, limiar: float = LIMIAR_DUPLICATA):
+        self.limiar = limiar
+
+    def _candidatas(self, cursor: sqlite3.Cursor, palavra_id: int, chaves: List[int]):
+        cursor.execute(sql_candidatas(len(chaves)), (palavra_id, *chaves))
+        return cursor.fetchall()
+
+    def encontrar_duplicata(self, cursor: sqlite3.Cursor, palavra_id: int, frase: str) -> Optional[str]:
+        """Retorna a frase já gravada que é quase idêntica a `frase`, se houver"""
+        assinatura = assinatura_minhash(frase)
+        for _, existente, dados in self._candidatas(cursor, palavra_id, chaves_lsh(assinatura)):
+            if dados and similaridade_estimada(assinatura, assinatura_de_bytes(dados)) >= self.limiar:
+                return existente
+        return None
+
+    def registrar(self, cursor: sqlite3.Cursor, frase_id: int, palavra_id: int, assinatura: array):
+        """Grava assinatura e chaves LSH de uma frase já existente"""
+        cursor.execute(
+            "UPDATE frases SET assinatura = ? WHERE id = ?", (assinatura.tobytes(), frase_id)
+        )
+        cursor.execute("DELETE FROM frases_lsh WHERE frase_id = ?", (frase_id,))
+        cursor.executemany(
+            "INSERT INTO frases_lsh (frase_id, palavra_id, chave) VALUES (?, ?, ?)",
+            [(frase_id, palavra_id, chave) for chave in chaves_lsh(assinatura)],
+        )
+
+    def inserir(self, cursor: sqlite3.Cursor, palavra_id: int, frase: str) -> int:
+        """Insere a frase junto com sua assinatura e retorna o id gerado"""
+        assinatura = assinatura_minhash(frase)
+        cursor.execute(
+            "INSERT INTO frases (palavra_id, frase, assinatura) VALUES (?, ?, ?)",
+            (palavra_id, frase, assinatura.tobytes()),
+        )
+        frase_id = cursor.lastrowid
+        cursor.executemany(
+            "INSERT INTO frases_lsh (frase_id, palavra_id, chave) VALUES (?, ?, ?)",
+            [(frase_id, palavra_id, chave) for chave in chaves_lsh(assinatura)],
+        )
+        return frase_id
+
+    def inserir_se_distinta(self, cursor: sqlite3.Cursor, palavra_id: int, frase: str) -> Optional[int]:
+        """Insere a frase apenas se não houver quase duplicata; retorna o id ou None"""
+        if self.encontrar_duplicata(cursor, palavra_id, frase) is not None:
+            return None
+        return self.inserir(cursor, palavra_id, frase)
+
+    def deduplicar(self, conn: sqlite3.Connection, palavra_ids: Optional[Iterable[int]] = None) -> dict:
+        """
+        Remove quase duplicatas já gravadas, mantendo a frase mais antiga de
+        cada grupo, e preenche assinaturas que estejam faltando.
+
+        Returns:
+            Dicionário com o total de frases analisadas, assinaturas
+            preenchidas e duplicatas removidas
+        """
+        cursor = conn.cursor()
+        if palavra_ids is None:
+            cursor.execute("SELECT DISTINCT palavra_id FROM frases")
+            palavra_ids = [row[0] for row in cursor.fetchall()]
+
+        resumo = {"analisadas": 0, "assinadas": 0, "removidas": 0}
+        for palavra_id in palavra_ids:
+            cursor.execute(
+                "SELECT id, frase, assinatura FROM frases WHERE palavra_id = ? ORDER BY id",
+                (palavra_id,),
+            )
+            mantidas: dict = {}  # chave LSH -> assinaturas mantidas com essa chave
+            remover = []
+            for frase_id, frase, dados in cursor.fetchall():
+                resumo["analisadas"] += 1
+                if dados:
+                    assinatura = assinatura_de_bytes(dados)
+                else:
+                    assinatura = assinatura_minhash(frase)
+                    self.registrar(cursor, frase_id, palavra_id, assinatura)
+                    resumo["assinadas"] += 1
+
+                chaves = chaves_lsh(assinatura)
+                duplicada = any(
+                    similaridade_estimada(assinatura, outra) >= self.limiar
+                    for chave in chaves
+                    for outra in mantidas.get(chave, ())
+                )
+                if duplicada:
+                    remover.append((frase_id,))
+                    continue
+                for chave in chaves:
+                    mantidas.setdefault(chave, []).append(assinatura)
+
+            if remover:
+                cursor.executemany("DELETE FROM frases WHERE id = ?", remover)
+                resumo["removidas"] += len(remover)
+            conn.commit()
+        return resumo
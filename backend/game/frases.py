@@ -0,0 +1,71 @@
+import sqlite3
+import time
+from typing import Callable, ContextManager, NamedTuple, Optional
+
+from backend.config import LIMITE_FRASES, TENTATIVAS_REGERACAO
+from backend.game.deduplicacao import DetectorDuplicatas
+from backend.database.queries import SQL_TOTAL_FRASES
+from backend.game.gerador_frases import GeradorFrases
+
+# Frase gravada quando todas as tentativas de geração falham
+FRASE_FALLBACK = "Exemplo usando a palavra '{palavra}'."
+
+
+def gerar_com_retry(gerador: GeradorFrases, palavra: str, definicao: str, categoria: str,
+                    max_retries: int = 5) -> str:
+    """Geração com retry e fallback simples"""
+    delay = 1
+    for tentativa in range(1, max_retries + 1):
+        try:
+            return gerador.gerar_frase_unica(palavra, definicao, categoria)
+        except Exception as e:
+            print(f"[WARN] tentativa {tentativa} falhou: {e}")
+            time.sleep(delay)
+            delay *= 2
+    # fallback: frase genérica
+    print("[INFO] fallback genérico acionado")
+    return FRASE_FALLBACK.format(palavra=palavra)
+
+
+class ResultadoGeracao(NamedTuple):
+    """Resultado de gerar_frase_distinta"""
+    frase: Optional[str]  # frase gravada; None quando nenhuma frase nova entrou
+    total: int  # frases da palavra depois da tentativa
+    no_limite: bool = False  # a palavra já estava no limite de frases
+
+
+def gerar_frase_distinta(conexao: Callable[[], ContextManager[sqlite3.Connection]], gerador: GeradorFrases, detector: DetectorDuplicatas,
+                         palavra_id: int, palavra: str, definicao: str, categoria: str,
+                         limite: int = LIMITE_FRASES,
+                         max_tentativas: int = TENTATIVAS_REGERACAO) -> ResultadoGeracao:
+    """
+    Gera e grava uma frase que não seja quase duplicata das já existentes.
+
+    A geração (chamada ao LLM) roda sem conexão nem transação: `conexao`
+    fornece uma conexão com o primário só para a gravação, que abre BEGIN
+    IMMEDIATE e reconfere o limite e as duplicatas contra o que outras
+    requisições gravaram nesse meio tempo. Regenera enquanto a frase
+    colidir com uma já gravada; se todas as tentativas forem duplicatas,
+    nada é gravado e `frase` volta None.
+    """
+    total = 0
+    for tentativa in range(1, max_tentativas + 1):
+        nova = gerar_com_retry(gerador, palavra, definicao, categoria)
+        with conexao() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = conn.cursor()
+                total = cur.execute(SQL_TOTAL_FRASES, (palavra_id,)).fetchone()[0]
+                if total >= limite:
+                    conn.commit()
+                    return ResultadoGeracao(None, total, no_limite=True)
+                if detector.encontrar_duplicata(cur, palavra_id, nova) is None:
+                    detector.inserir(cur, palavra_id, nova)
+                    conn.commit()
+                    return ResultadoGeracao(nova, total + 1)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        print(f"[INFO] frase quase duplicada descartada (tentativa {tentativa}): {nova}")
+    return ResultadoGeracao(None, total)
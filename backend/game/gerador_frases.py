@@ -1,13 +1,36 @@
 from typing import List
 import os
-from openai import OpenAI
+from openai import OpenAI, RateLimitError
 from dotenv import load_dotenv, find_dotenv
 import sqlite3
-from backend.config import DB_PATH
+from backend.config import DB_PATH, MISTRAL_BASE_URL
+from backend.game.deduplicacao import DetectorDuplicatas
+from backend.game.limitador import CLASSE_INTERATIVA, LimiteExcedido, LimitadorTaxa
+
+# Frases genéricas usadas quando o modelo não está disponível
+FRASES_PADRAO = [
+    "Esta é uma frase de exemplo usando a palavra '{palavra}'.",
+    "Aqui está outro exemplo com '{palavra}'.",
+    "E esta é a terceira frase com '{palavra}'.",
+]
 
 class GeradorFrases:
-    def __init__(self):
-        """Inicializa o gerador de frases com o Mistral AI"""
+    def __init__(self, classe: str = CLASSE_INTERATIVA, limitador: LimitadorTaxa = None,
+                 testar_conexao: bool = True):
+        """
+        Inicializa o gerador de frases com o Mistral AI.
+
+        Args:
+            classe: Orçamento do limitador usado pelas chamadas
+                ('interativa' para endpoints, 'background' para scripts e tarefas)
+            limitador: Limitador compartilhado; por padrão usa o arquivo LIMITADOR_PATH
+            testar_conexao: Faz uma chamada de teste ao modelo (passando pelo
+                limitador, o que pode esperar); desligue para geradores
+                criados na inicialização do servidor
+        """
+        self.classe = classe
+        self.limitador = limitador or LimitadorTaxa()
+
         # Carrega o arquivo .env do diretório raiz
         load_dotenv(find_dotenv())
         
@@ -22,15 +45,19 @@ class GeradorFrases:
             )
             
         try:
-            # Configura o cliente OpenAI com o endpoint do Mistral
+            # Configura o cliente OpenAI com o endpoint do Mistral. As novas
+            # tentativas em 429 ficam a cargo do limitador, não do cliente
             self.client = OpenAI(
                 api_key=api_key,
-                base_url="https://api.mistral.ai/v1"
+                base_url=MISTRAL_BASE_URL,
+                max_retries=0
             )
             
+            if not testar_conexao:
+                return
+
             # Testa a conexão
-            response = self.client.chat.completions.create(
-                model="mistral-tiny",
+            response = self._completar(
                 messages=[{"role": "user", "content": "Teste de conexão"}],
                 max_tokens=10
             )
@@ -38,18 +65,23 @@ class GeradorFrases:
                 raise ValueError("Não foi possível conectar ao modelo Mistral")
             print("✅ Modelo Mistral inicializado com sucesso")
             
+        except (LimiteExcedido, RateLimitError):
+            # Limite de taxa não indica falha do cliente; mantém o modelo ativo
+            print("⚠️ Teste de conexão adiado: limite de chamadas atingido")
         except Exception as e:
             print(f"⚠️ Erro ao inicializar Mistral: {str(e)}")
             self.client = None
+
+    def _completar(self, **parametros):
+        """Chamada ao modelo passando pelo limitador de taxa compartilhado"""
+        return self.limitador.executar(
+            lambda: self.client.chat.completions.create(model="mistral-tiny", **parametros),
+            self.classe,
+        )
             
     def gerar_frase_padrao(self, palavra: str, indice: int = 0) -> str:
         """Gera uma frase padrão quando o modelo não está disponível"""
-        frases_padrao = [
-            f"Esta é uma frase de exemplo usando a palavra '{palavra}'.",
-            f"Aqui está outro exemplo com '{palavra}'.",
-            f"E esta é a terceira frase com '{palavra}'."
-        ]
-        return frases_padrao[indice % len(frases_padrao)]
+        return FRASES_PADRAO[indice % len(FRASES_PADRAO)].format(palavra=palavra)
         
     def gerar_frases(self, palavra: str, definicao: str, categoria: str, palavra_id: int = None) -> List[str]:
         """
@@ -121,8 +153,7 @@ class GeradorFrases:
         """
         
         try:
-            response = self.client.chat.completions.create(
-                model="mistral-tiny",
+            response = self._completar(
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=200,
                 temperature=0.7
@@ -148,12 +179,10 @@ class GeradorFrases:
                     conn = sqlite3.connect(DB_PATH)
                     cursor = conn.cursor()
                     
-                    # Salvamos cada frase nova
+                    # Salvamos cada frase nova, descartando quase duplicatas
+                    detector = DetectorDuplicatas()
                     for frase in frases:
-                        cursor.execute(
-                            "INSERT INTO frases (palavra_id, frase) VALUES (?, ?)",
-                            (palavra_id, frase)
-                        )
+                        detector.inserir_se_distinta(cursor, palavra_id, frase)
                     
                     conn.commit()
                     conn.close()
@@ -197,8 +226,7 @@ class GeradorFrases:
             Durante o jantar, fiquei impressionado com o discurso eloquente do professor sobre arte.
             """
             
-            response = self.client.chat.completions.create(
-                model="mistral-tiny",
+            response = self._completar(
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=100,
                 temperature=0.7
@@ -0,0 +1,214 @@
+import math
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from backend.config import AVALIADOR_CACHE_VETORES, AVALIADOR_COMPACTACAO_INTERVALO
+from backend.game.similaridade import BackendSimilaridade
+
+Vetor = Dict[str, float]
+
+
+def _normalizar(pesos: Vetor) -> Vetor:
+    norma = math.sqrt(sum(p * p for p in pesos.values()))
+    return {termo: p / norma for termo, p in pesos.items()} if norma else {}
+
+
+class LRUVetores:
+    """Cache limitado de vetores por palavra_id (o menos usado sai primeiro)"""
+
+    def __init__(self, capacidade: int = AVALIADOR_CACHE_VETORES):
+        self.capacidade = capacidade
+        self._itens: OrderedDict = OrderedDict()
+        self.acertos = 0
+        self.faltas = 0
+
+    def get(self, chave, versao=None):
+        """Item da chave; com `versao`, um item (versão, valor) de outra versão conta como falta"""
+        item = self._itens.get(chave)
+        if item is None or (versao is not None and item[0] != versao):
+            self.faltas += 1
+            return None
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return item
+
+    def put(self, chave, valor):
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+        if len(self._itens) > self.capacidade:
+            self._itens.popitem(last=False)
+
+    def pop(self, chave):
+        self._itens.pop(chave, None)
+
+    def __contains__(self, chave) -> bool:
+        return chave in self._itens
+
+    def chaves(self) -> List:
+        return list(self._itens)
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+
+class ModeloIncremental(BackendSimilaridade):
+    """
+    TF-IDF mantido de forma incremental, com os mesmos pesos do
+    TfidfVectorizer (tf bruto, idf suavizado, norma L2).
+
+    Guarda as frequências de termos de cada definição e a contagem de
+    documentos por termo. Incluir, alterar ou remover uma definição ajusta
+    só os termos dela: a contagem, o IDF desses termos e a linha da palavra.
+    Os IDFs dos demais termos e os vetores já em cache ficam um pouco
+    defasados (o total de documentos mudou) até a compactação, que roda em
+    segundo plano, recalcula todos os IDFs e renormaliza os vetores em cache.
+    Cada vetor em cache guarda a versão da tabela de IDFs usada; vetor de
+    outra versão conta como falta e é recalculado.
+    """
+
+    nome = "incremental"
+
+    def __init__(self, analisador: Callable[[str], List[str]], max_df: float = 0.9,
+                 tamanho_cache: int = AVALIADOR_CACHE_VETORES,
+                 intervalo: float = AVALIADOR_COMPACTACAO_INTERVALO):
+        super().__init__(intervalo)
+        self.analisador = analisador
+        self.max_df = max_df
+        self.df: Counter = Counter()
+        self.idf: Dict[str, float] = {}
+        self.termos: Dict[int, Counter] = {}  # palavra_id -> frequências dos termos
+        self.vetores = LRUVetores(tamanho_cache)  # palavra_id -> (versão do IDF, vetor)
+        self.versao_idf = 0  # incrementada a cada recálculo completo dos IDFs
+        self._mutacoes = 0  # atualizações e remoções, para a compactação detectar concorrência
+
+        self._lock = threading.RLock()
+        self._contadores = {"atualizacoes": 0, "compactacoes": 0}
+        self._ultima_compactacao = 0.0
+
+    def _idf_termo(self, termo: str) -> float:
+        n = len(self.termos)
+        return math.log((1 + n) / (1 + self.df[termo])) + 1
+
+    def _aplicar_df(self, frequencias: Counter, delta: int):
+        for termo in frequencias:
+            self.df[termo] += delta
+            if self.df[termo] <= 0:
+                del self.df[termo]
+                self.idf.pop(termo, None)
+            else:
+                self.idf[termo] = self._idf_termo(termo)
+
+    def atualizar(self, palavra_id: int, definicao: str):
+        """Inclui ou substitui a definição de uma palavra"""
+        with self._lock:
+            anteriores = self.termos.pop(palavra_id, None)
+            if anteriores:
+                self._aplicar_df(anteriores, -1)
+            frequencias = Counter(self.analisador(definicao))
+            self.termos[palavra_id] = frequencias
+            self._aplicar_df(frequencias, +1)
+            self._mutacoes += 1
+            self.vetores.pop(palavra_id)
+            self._alteracoes += 1
+            self._contadores["atualizacoes"] += 1
+
+    def remover(self, palavra_id: int):
+        with self._lock:
+            anteriores = self.termos.pop(palavra_id, None)
+            if anteriores is None:
+                return
+            self._aplicar_df(anteriores, -1)
+            self._mutacoes += 1
+            self.vetores.pop(palavra_id)
+            self._alteracoes += 1
+
+    def _pesar(self, frequencias: Counter, idf: Optional[Dict[str, float]] = None,
+               df: Optional[Dict[str, int]] = None, documentos: Optional[int] = None) -> Vetor:
+        idf = self.idf if idf is None else idf
+        df = self.df if df is None else df
+        limite_df = self.max_df * (len(self.termos) if documentos is None else documentos)
+        return _normalizar({
+            termo: quantidade * idf[termo]
+            for termo, quantidade in frequencias.items()
+            if termo in idf and df[termo] <= limite_df
+        })
+
+    def vetor(self, palavra_id: int) -> Optional[Vetor]:
+        """Linha TF-IDF normalizada da definição da palavra"""
+        with self._lock:
+            item = self.vetores.get(palavra_id, self.versao_idf)
+            if item is not None:
+                return item[1]
+            frequencias = self.termos.get(palavra_id)
+            if frequencias is None:
+                return None
+            vetor = self._pesar(frequencias)
+            self.vetores.put(palavra_id, (self.versao_idf, vetor))
+            return vetor
+
+    def similaridade(self, texto: str, palavra_id: int) -> Optional[float]:
+        """Cosseno entre o texto e a definição da palavra; None se a palavra não estiver indexada"""
+        vetor_definicao = self.vetor(palavra_id)
+        if vetor_definicao is None:
+            return None
+        with self._lock:
+            vetor_texto = self._pesar(Counter(self.analisador(texto)))
+        return min(1.0, sum(p * vetor_definicao.get(termo, 0.0) for termo, p in vetor_texto.items()))
+
+    def carregar(self, definicoes: Iterable[Tuple[int, str]]):
+        """Indexa um conjunto inicial de (palavra_id, definição) de uma só vez"""
+        with self._lock:
+            for palavra_id, definicao in definicoes:
+                frequencias = Counter(self.analisador(definicao))
+                self.termos[palavra_id] = frequencias
+                self.df.update(frequencias.keys())
+            self.compactar()
+
+    def compactar(self):
+        """
+        Recalcula todos os IDFs e renormaliza os vetores em cache. O cálculo
+        usa uma cópia das contagens e roda fora da trava; sob a trava só há a
+        troca. Se houve atualizações nesse meio tempo, o resultado é
+        descartado e as alterações continuam pendentes para o próximo ciclo.
+        """
+        inicio = time.perf_counter()
+        with self._lock:
+            mutacoes = self._mutacoes
+            df = dict(self.df)
+            documentos = len(self.termos)
+            em_cache = [(palavra_id, self.termos.get(palavra_id)) for palavra_id in self.vetores.chaves()]
+
+        idf = {termo: math.log((1 + documentos) / (1 + n)) + 1 for termo, n in df.items()}
+        vetores = [
+            (palavra_id, None if frequencias is None else self._pesar(frequencias, idf, df, documentos))
+            for palavra_id, frequencias in em_cache
+        ]
+
+        with self._lock:
+            if self._mutacoes != mutacoes:
+                return
+            self.idf = idf
+            self.versao_idf += 1
+            for palavra_id, vetor in vetores:
+                if vetor is None:
+                    self.vetores.pop(palavra_id)
+                elif palavra_id in self.vetores:
+                    self.vetores.put(palavra_id, (self.versao_idf, vetor))
+            self._alteracoes = 0
+            self._contadores["compactacoes"] += 1
+        self._ultima_compactacao = time.perf_counter() - inicio
+
+    def metricas(self) -> dict:
+        with self._lock:
+            return {
+                **self._contadores,
+                "documentos": len(self.termos),
+                "termos": len(self.df),
+                "vetores_em_cache": len(self.vetores),
+                "cache_acertos": self.vetores.acertos,
+                "cache_faltas": self.vetores.faltas,
+                "alteracoes_pendentes": self._alteracoes,
+                "ultima_compactacao_ms": round(self._ultima_compactacao * 1000, 3),
+            }
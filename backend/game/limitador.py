@@ -0,0 +1,221 @@
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from openai import RateLimitError
+
+from backend.config import (
+    LIMITADOR_BACKGROUND,
+    LIMITADOR_INTERATIVO,
+    LIMITADOR_PATH,
+    LIMITADOR_TENTATIVAS_429,
+)
+
+CLASSE_INTERATIVA = 'interativa'
+CLASSE_BACKGROUND = 'background'
+
+
+class LimiteExcedido(Exception):
+    """Não houve orçamento disponível dentro da espera máxima da classe"""
+    pass
+
+
+def interpretar_orcamento(config: str) -> Tuple[float, float, float]:
+    """
+    'taxa:capacidade:espera_maxima' -> (chamadas/s, rajada, segundos). Taxa 0
+    deixa só a rajada inicial: esgotada, as chamadas são recusadas.
+    """
+    taxa, capacidade, espera = (float(valor) for valor in config.split(':'))
+    if taxa < 0 or capacidade < 0 or espera < 0:
+        raise ValueError(f"Orçamento inválido: '{config}'")
+    return taxa, capacidade, espera
+
+
+def _retry_after(erro: Exception) -> Optional[float]:
+    resposta = getattr(erro, 'response', None)
+    valor = resposta.headers.get('retry-after') if resposta is not None else None
+    try:
+        return float(valor) if valor is not None else None
+    except ValueError:
+        return None
+
+
+class LimitadorTaxa:
+    """
+    Balde de fichas (token bucket) por classe de chamador, com o estado em
+    um arquivo SQLite para que todos os workers e scripts que usam o mesmo
+    arquivo dividam o mesmo orçamento.
+
+    Cada chamada ao provedor consome uma ficha do balde da sua classe; as
+    fichas voltam à taxa configurada até a capacidade (rajada). Um 429 do
+    provedor pausa todas as classes pelo Retry-After informado. Chamadas,
+    tokens consumidos, esperas e 429s ficam contabilizados por classe no
+    mesmo arquivo.
+    """
+
+    def __init__(self, caminho: str | Path = LIMITADOR_PATH,
+                 orcamentos: Optional[Dict[str, Tuple[float, float, float]]] = None,
+                 tentativas_429: int = LIMITADOR_TENTATIVAS_429):
+        self.caminho = Path(caminho)
+        self.orcamentos = orcamentos or {
+            CLASSE_INTERATIVA: interpretar_orcamento(LIMITADOR_INTERATIVO),
+            CLASSE_BACKGROUND: interpretar_orcamento(LIMITADOR_BACKGROUND),
+        }
+        self.tentativas_429 = tentativas_429
+        self._local = threading.local()
+        self._criar_estado()
+
+    def _conexao(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.caminho), timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def _criar_estado(self):
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conexao()
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS baldes (
+                classe TEXT PRIMARY KEY,
+                fichas REAL NOT NULL,
+                atualizado REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS pausa (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                ate REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS custos (
+                classe TEXT PRIMARY KEY,
+                chamadas INTEGER NOT NULL DEFAULT 0,
+                tokens_prompt INTEGER NOT NULL DEFAULT 0,
+                tokens_resposta INTEGER NOT NULL DEFAULT 0,
+                respostas_429 INTEGER NOT NULL DEFAULT 0,
+                recusadas INTEGER NOT NULL DEFAULT 0,
+                espera_total REAL NOT NULL DEFAULT 0
+            );
+            INSERT OR IGNORE INTO pausa (id, ate) VALUES (1, 0);
+        """)
+        agora = time.time()
+        for classe, (_, capacidade, _) in self.orcamentos.items():
+            conn.execute("INSERT OR IGNORE INTO baldes VALUES (?, ?, ?)", (classe, capacidade, agora))
+            conn.execute("INSERT OR IGNORE INTO custos (classe) VALUES (?)", (classe,))
+
+    def _tentar_consumir(self, classe: str) -> float:
+        """Consome uma ficha e retorna 0, ou retorna quantos segundos esperar"""
+        taxa, capacidade, _ = self.orcamentos[classe]
+        conn = self._conexao()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            agora = time.time()
+            pausado_ate = conn.execute("SELECT ate FROM pausa WHERE id = 1").fetchone()[0]
+            if pausado_ate > agora:
+                conn.execute("COMMIT")
+                return pausado_ate - agora
+            fichas, atualizado = conn.execute(
+                "SELECT fichas, atualizado FROM baldes WHERE classe = ?", (classe,)
+            ).fetchone()
+            fichas = min(capacidade, fichas + max(0.0, agora - atualizado) * taxa)
+            espera = 0.0
+            if fichas >= 1:
+                fichas -= 1
+            elif taxa > 0:
+                espera = (1 - fichas) / taxa
+            else:
+                # Sem reposição a ficha nunca chega: estoura a espera máxima
+                espera = float('inf')
+            conn.execute("UPDATE baldes SET fichas = ?, atualizado = ? WHERE classe = ?",
+                         (fichas, agora, classe))
+            conn.execute("COMMIT")
+            return espera
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _contabilizar(self, classe: str, **incrementos):
+        colunas = ", ".join(f"{coluna} = {coluna} + ?" for coluna in incrementos)
+        self._conexao().execute(
+            f"UPDATE custos SET {colunas} WHERE classe = ?", (*incrementos.values(), classe)
+        )
+
+    def adquirir(self, classe: str = CLASSE_INTERATIVA):
+        """Bloqueia até obter uma ficha; levanta LimiteExcedido se passar da espera máxima"""
+        espera_maxima = self.orcamentos[classe][2]
+        inicio = time.monotonic()
+        while True:
+            espera = self._tentar_consumir(classe)
+            decorrido = time.monotonic() - inicio
+            if espera == 0:
+                if decorrido > 0.001:
+                    self._contabilizar(classe, espera_total=decorrido)
+                return
+            if decorrido + espera > espera_maxima:
+                self._contabilizar(classe, recusadas=1, espera_total=decorrido)
+                raise LimiteExcedido(f"Sem orçamento para '{classe}' em {espera_maxima:.1f}s")
+            time.sleep(espera)
+
+    def pausar(self, segundos: float):
+        """
+        Pausa todas as classes (em todos os processos) por `segundos` e esvazia
+        os baldes, para que a retomada siga a taxa e não vire uma nova rajada
+        """
+        ate = time.time() + segundos
+        conn = self._conexao()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("UPDATE pausa SET ate = MAX(ate, ?) WHERE id = 1", (ate,))
+        conn.execute("UPDATE baldes SET fichas = 0, atualizado = MAX(atualizado, ?)", (ate,))
+        conn.execute("COMMIT")
+
+    def executar(self, chamada: Callable, classe: str = CLASSE_INTERATIVA):
+        """
+        Executa `chamada` (uma requisição ao provedor) respeitando o orçamento.
+        Em 429 pausa o balde compartilhado pelo Retry-After e tenta de novo,
+        até `tentativas_429` vezes.
+        """
+        for tentativa in range(self.tentativas_429 + 1):
+            self.adquirir(classe)
+            try:
+                resposta = chamada()
+            except RateLimitError as e:
+                self._contabilizar(classe, chamadas=1, respostas_429=1)
+                if tentativa == self.tentativas_429:
+                    raise
+                pausa = _retry_after(e) or 2 ** tentativa
+                print(f"[WARN] 429 do provedor; pausando chamadas por {pausa:.1f}s")
+                self.pausar(pausa)
+                continue
+            uso = getattr(resposta, 'usage', None)
+            self._contabilizar(
+                classe, chamadas=1,
+                tokens_prompt=getattr(uso, 'prompt_tokens', 0) or 0,
+                tokens_resposta=getattr(uso, 'completion_tokens', 0) or 0,
+            )
+            return resposta
+
+    def metricas(self) -> dict:
+        """Custos acumulados por classe (somando todos os processos) e fichas atuais"""
+        conn = self._conexao()
+        linhas = conn.execute(
+            "SELECT c.classe, c.chamadas, c.tokens_prompt, c.tokens_resposta, c.respostas_429,"
+            " c.recusadas, c.espera_total, b.fichas FROM custos c LEFT JOIN baldes b USING (classe)"
+        ).fetchall()
+        pausado_ate = conn.execute("SELECT ate FROM pausa WHERE id = 1").fetchone()[0]
+        return {
+            "pausado_por": round(max(0.0, pausado_ate - time.time()), 3),
+            "classes": {
+                classe: {
+                    "chamadas": chamadas,
+                    "tokens_prompt": tokens_prompt,
+                    "tokens_resposta": tokens_resposta,
+                    "respostas_429": respostas_429,
+                    "recusadas": recusadas,
+                    "espera_total_s": round(espera_total, 3),
+                    "fichas": round(fichas or 0.0, 3),
+                }
+                for classe, chamadas, tokens_prompt, tokens_resposta, respostas_429,
+                    recusadas, espera_total, fichas in linhas
+            },
+        }
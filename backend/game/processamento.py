@@ -2,8 +2,28 @@ from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import re
 import unicodedata
-from typing import Tuple, List
+import zlib
+from pathlib import Path
+from typing import Callable, NamedTuple, Tuple, List, Optional
 from nltk.stem import RSLPStemmer
+from backend.config import AVALIADOR_CACHE_VETORES
+from backend.game.correcao import IndiceCorrecao
+from backend.game.incremental import LRUVetores, ModeloIncremental
+from backend.game.similaridade import BackendHashing, BackendSimilaridade
+
+ARQUIVO_INDICE_CORRECAO = "indice_correcao.pkl"
+
+
+class ArtefatosSnapshot(NamedTuple):
+    """Artefatos de um snapshot, indexados pela linha do catálogo dele"""
+    linha_por_id: Callable[[int], Optional[int]]
+    radicais: object  # radicais de cada definição, por linha
+    matriz: object = None  # matriz TF-IDF das definições (se o snapshot tiver)
+
+
+def assinatura_textos(textos: List[str]) -> str:
+    """Identifica o conjunto de textos usado para montar um artefato"""
+    return format(zlib.crc32("\x1f".join(sorted(textos)).encode('utf-8')), '08x')
 
 
 class AvaliadorRespostas:
@@ -19,7 +39,12 @@ class AvaliadorRespostas:
         )
         self.stemmer = RSLPStemmer()
         self.modelo_treinado = False
-        self.definicoes_vetorizadas = {}  # Cache de vetores das definições
+        self.definicoes_vetorizadas = LRUVetores(AVALIADOR_CACHE_VETORES)  # Vetores das definições por palavra_id
+        self.backend = None  # Similaridade indexada por palavra_id, atualizada conforme o banco muda (opcional)
+        self.indice_correcao = None  # Correção ortográfica das respostas (opcional)
+        # Artefatos anexados de um snapshot; trocados de uma vez (uma só
+        # referência), então cada avaliação lê um conjunto consistente
+        self.artefatos: Optional[ArtefatosSnapshot] = None
 
     def _preprocessar_texto(self, texto: str) -> str:
         """Pré-processamento aprimorado para português"""
@@ -42,6 +67,7 @@ class AvaliadorRespostas:
             textos_validos = list(set(filter(lambda t: isinstance(t, str) and t.strip(), textos)))
             if textos_validos:
                 self.vectorizer.fit(textos_validos)
+                self.definicoes_vetorizadas = LRUVetores(AVALIADOR_CACHE_VETORES)
                 self.modelo_treinado = True
             else:
                 self.modelo_treinado = False
@@ -49,24 +75,110 @@ class AvaliadorRespostas:
             print(f"Erro no treinamento: {str(e)}")
             self.modelo_treinado = False
 
-    def _calcular_similaridade(self, resposta: str, definicao: str) -> float:
+    def construir_indice_correcao(self, textos: List[str]):
+        """Monta o índice de correção com o vocabulário das definições e variações"""
+        indice = IndiceCorrecao()
+        indice.construir(textos, self._preprocessar_texto, self.stemmer.stem)
+        indice.assinatura_fonte = assinatura_textos(textos)
+        self.indice_correcao = indice
+
+    def ativar_backend(self, nome: str, db_path: str | Path) -> BackendSimilaridade:
+        """
+        Indexa as definições do banco no backend de similaridade `nome`
+        (incremental ou hashing); a partir daí as mudanças no banco chegam à
+        pontuação e ao índice de correção sem retreinar nada
+        """
+        if nome == ModeloIncremental.nome:
+            backend = ModeloIncremental(self.vectorizer.build_analyzer())
+        elif nome == BackendHashing.nome:
+            backend = BackendHashing(self._preprocessar_texto)
+        else:
+            raise ValueError(f"Backend de similaridade desconhecido: {nome}")
+        backend.sincronizar(db_path)
+        backend.ao_sincronizar(self.incorporar_textos)
+        self.backend = backend
+        return backend
+
+    def incorporar_textos(self, textos: List[str]):
+        """Leva o vocabulário de definições e variações novas ao índice de correção"""
+        if self.indice_correcao:
+            self.indice_correcao.adicionar(textos, self._preprocessar_texto, self.stemmer.stem)
+
+    def salvar_artefatos(self, diretorio: str | Path):
+        """Grava os artefatos de pontuação pré-calculados"""
+        if self.indice_correcao:
+            self.indice_correcao.salvar(Path(diretorio) / ARQUIVO_INDICE_CORRECAO)
+
+    def carregar_artefatos(self, diretorio: str | Path, textos: List[str]) -> bool:
+        """Carrega os artefatos gravados se foram gerados a partir dos mesmos textos"""
+        indice = IndiceCorrecao.carregar(Path(diretorio) / ARQUIVO_INDICE_CORRECAO)
+        if indice is None or indice.assinatura_fonte != assinatura_textos(textos):
+            return False
+        self.indice_correcao = indice
+        return True
+
+    def radicais(self, texto: str) -> set:
+        """Conjunto de radicais das palavras do texto"""
+        return {self.stemmer.stem(p) for p in self._preprocessar_texto(texto).split()}
+
+    def anexar_snapshot(self, snapshot, usar_tfidf: bool = False):
+        """
+        Usa os artefatos de um snapshot (radicais das definições e, se pedido,
+        o modelo TF-IDF com a matriz das definições) sem recalculá-los
+        """
+        matriz = None
+        if usar_tfidf:
+            self.vectorizer.vocabulary_ = {termo: i for i, termo in enumerate(snapshot.vocabulario)}
+            self.vectorizer.idf_ = snapshot.idf
+            matriz = snapshot.matriz_definicoes()
+            self.modelo_treinado = True
+        self.artefatos = ArtefatosSnapshot(snapshot.catalogo.linha_por_id, snapshot.radicais, matriz)
+
+    def desanexar_snapshot(self):
+        """
+        Deixa de usar os artefatos por linha do snapshot (o catálogo mudou e
+        as linhas não correspondem mais); o modelo TF-IDF continua treinado
+        """
+        self.artefatos = None
+        self.definicoes_vetorizadas = LRUVetores(AVALIADOR_CACHE_VETORES)
+
+    def _calcular_similaridade(self, resposta: str, definicao: str, linha: Optional[int] = None,
+                               palavra_id: Optional[int] = None,
+                               artefatos: Optional[ArtefatosSnapshot] = None) -> float:
         """Calcula similaridade aproveitando vetores pré-gerados"""
         try:
+            if self.backend and palavra_id is not None:
+                similaridade = self.backend.similaridade(resposta, palavra_id)
+                if similaridade is not None:
+                    return similaridade
+
             if not self.modelo_treinado:
-                return self._similaridade_simples(resposta, definicao)
+                return self._similaridade_simples(resposta, definicao, linha, artefatos)
 
-            if definicao not in self.definicoes_vetorizadas:
-                self.definicoes_vetorizadas[definicao] = self.vectorizer.transform([definicao])
+            if linha is not None and artefatos is not None and artefatos.matriz is not None:
+                vetor_definicao = artefatos.matriz[linha]
+            elif palavra_id is not None:
+                vetor_definicao = self.definicoes_vetorizadas.get(palavra_id)
+                if vetor_definicao is None:
+                    vetor_definicao = self.vectorizer.transform([definicao])
+                    self.definicoes_vetorizadas.put(palavra_id, vetor_definicao)
+            else:
+                vetor_definicao = self.vectorizer.transform([definicao])
 
             vetor_resposta = self.vectorizer.transform([resposta])
-            return cosine_similarity(vetor_resposta, self.definicoes_vetorizadas[definicao])[0][0]
+            # A matriz do snapshot é float32: limita arredondamentos acima de 1
+            return min(1.0, cosine_similarity(vetor_resposta, vetor_definicao)[0][0])
         except Exception:
-            return self._similaridade_simples(resposta, definicao)
+            return self._similaridade_simples(resposta, definicao, linha, artefatos)
 
-    def _similaridade_simples(self, resposta: str, definicao: str) -> float:
+    def _similaridade_simples(self, resposta: str, definicao: str, linha: Optional[int] = None,
+                              artefatos: Optional[ArtefatosSnapshot] = None) -> float:
         """Fallback melhorado com stemming"""
-        resposta_palavras = {self.stemmer.stem(p) for p in self._preprocessar_texto(resposta).split()}
-        definicao_palavras = {self.stemmer.stem(p) for p in self._preprocessar_texto(definicao).split()}
+        resposta_palavras = self.radicais(resposta)
+        if linha is not None and artefatos is not None:
+            definicao_palavras = set(artefatos.radicais[linha].split())
+        else:
+            definicao_palavras = self.radicais(definicao)
         
         if not definicao_palavras:
             return 0.0
@@ -74,17 +186,28 @@ class AvaliadorRespostas:
         intersecao = resposta_palavras & definicao_palavras
         return len(intersecao) / len(definicao_palavras)
 
-    def avaliar_resposta(self, resposta: str, definicao_correta: str) -> Tuple[float, bool]:
-        """Avaliação robusta com múltiplas estratégias"""
+    def avaliar_resposta(self, resposta: str, definicao_correta: str,
+                         palavra_id: Optional[int] = None) -> Tuple[float, bool]:
+        """
+        Avaliação robusta com múltiplas estratégias.
+        Com `palavra_id` e um snapshot anexado, usa os vetores e radicais
+        pré-calculados da definição.
+        """
         if not resposta or not definicao_correta:
             return 0.0, False
+        # Uma única leitura: o catálogo pode desanexar o snapshot a qualquer momento
+        artefatos = self.artefatos
+        linha = artefatos.linha_por_id(palavra_id) if artefatos and palavra_id is not None else None
         
         resposta_pp = self._preprocessar_texto(resposta)
         definicao_pp = self._preprocessar_texto(definicao_correta)
+        if self.indice_correcao:
+            # Troca tokens com erro de digitação pelo vizinho mais próximo do vocabulário
+            resposta_pp = self.indice_correcao.corrigir_texto(resposta_pp)
         
         # Combina similaridade vetorial e simples
-        similaridade_vetorial = self._calcular_similaridade(resposta_pp, definicao_pp)
-        similaridade_simples = self._similaridade_simples(resposta_pp, definicao_pp)
+        similaridade_vetorial = self._calcular_similaridade(resposta_pp, definicao_pp, linha, palavra_id, artefatos)
+        similaridade_simples = self._similaridade_simples(resposta_pp, definicao_pp, linha, artefatos)
         similaridade_final = max(similaridade_vetorial, similaridade_simples)
         
         # Limiares ajustados
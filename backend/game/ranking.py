@@ -0,0 +1,239 @@
+import sqlite3
+import threading
+import uuid
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.config import RANKING_K, RANKING_PERIODOS_RETIDOS
+from backend.database.models import Tentativa
+
+ESCOPOS = ('global', 'categoria', 'dia', 'semana')
+
+Placar = Tuple[str, str]  # (escopo, valor)
+
+# Reconstrução sob demanda dos placares (cobertas pelos índices de tentativas)
+SQL_PLACAR_CATEGORIA = """
+    SELECT jogador, SUM(pontos) FROM tentativas
+    WHERE categoria = ?
+    GROUP BY jogador
+"""
+SQL_PLACAR_PERIODO = """
+    SELECT jogador, SUM(pontos) FROM tentativas
+    WHERE data_criacao >= ? AND data_criacao < ?
+    GROUP BY jogador
+"""
+
+
+def periodo_dia(data: date) -> str:
+    return data.isoformat()
+
+
+def periodo_semana(data: date) -> str:
+    ano, semana, _ = data.isocalendar()
+    return f"{ano}-W{semana:02d}"
+
+
+def limites_periodo(escopo: str, valor: str) -> Tuple[str, str]:
+    """Intervalo [inicio, fim) de `data_criacao` coberto por um período"""
+    if escopo == 'dia':
+        inicio = date.fromisoformat(valor)
+        fim = inicio + timedelta(days=1)
+    else:
+        ano, semana = valor.split('-W')
+        inicio = date.fromisocalendar(int(ano), int(semana), 1)
+        fim = inicio + timedelta(days=7)
+    return inicio.isoformat(), fim.isoformat()
+
+
+class PlacarTopK:
+    """
+    Pontuação de todos os jogadores de um placar e os K primeiros mantidos
+    em uma lista ordenada por (-pontos, jogador).
+
+    Como a pontuação só aumenta, um jogador fora do topo só pode entrar nele
+    quando recebe pontos; basta compará-lo com o último colocado. Cada
+    atualização custa O(K) e a leitura do topo também.
+    """
+
+    __slots__ = ('k', 'pontos', 'topo', 'versao')
+
+    def __init__(self, k: int):
+        self.k = k
+        self.pontos: Dict[str, int] = {}
+        self.topo: List[Tuple[int, str]] = []
+        self.versao = 0
+
+    @classmethod
+    def de_pontuacoes(cls, k: int, pontuacoes: Dict[str, int]) -> 'PlacarTopK':
+        placar = cls(k)
+        placar.pontos = pontuacoes
+        placar.topo = sorted((-p, j) for j, p in pontuacoes.items() if p > 0)[:k]
+        return placar
+
+    def somar(self, jogador: str, delta: int) -> bool:
+        """Soma `delta` (>= 0) aos pontos do jogador; retorna True se o topo mudou"""
+        anterior = self.pontos.get(jogador, 0)
+        atual = anterior + delta
+        self.pontos[jogador] = atual
+        if delta <= 0:
+            return False
+
+        chave = (-atual, jogador)
+        if anterior > 0:
+            antiga = (-anterior, jogador)
+            i = bisect_left(self.topo, antiga)
+            if i < len(self.topo) and self.topo[i] == antiga:
+                del self.topo[i]
+                insort(self.topo, chave)
+                self.versao += 1
+                return True
+
+        if len(self.topo) < self.k or chave < self.topo[-1]:
+            insort(self.topo, chave)
+            if len(self.topo) > self.k:
+                self.topo.pop()
+            self.versao += 1
+            return True
+        return False
+
+    def primeiros(self, k: int) -> List[Tuple[str, int]]:
+        return [(jogador, -pontos) for pontos, jogador in self.topo[:k]]
+
+
+class ServicoRanking:
+    """
+    Placares global, por categoria, por dia e por semana.
+
+    Os placares são carregados do banco na inicialização (consultas cobertas
+    pelos índices de `tentativas` e `pontuacoes`) e depois atualizados a cada
+    lote de tentativas gravado pelo BufferTentativas. Placares de períodos
+    passados ficam em LRU (no máximo `periodos_retidos` por escopo) e são
+    reconstruídos sob demanda, com a consulta ao banco fora da trava.
+    """
+
+    def __init__(self, db_path: str | Path, k: int = RANKING_K,
+                 periodos_retidos: int = RANKING_PERIODOS_RETIDOS):
+        self.db_path = str(db_path)
+        self.k = k
+        self.periodos_retidos = periodos_retidos
+        self._placares: OrderedDict[Placar, PlacarTopK] = OrderedDict()
+        self._categorias: Set[str] = set()
+        self._lock = threading.Lock()
+        # Diferencia ETags entre reinícios, já que as versões recomeçam do zero
+        self.instancia = uuid.uuid4().hex[:8]
+
+    def _consultar_pontuacoes(self, sql: str, params: tuple = ()) -> Dict[str, int]:
+        with sqlite3.connect(self.db_path) as conn:
+            return {jogador: pontos for jogador, pontos in conn.execute(sql, params)}
+
+    def _carregar_placar(self, escopo: str, valor: Optional[str]) -> PlacarTopK:
+        if escopo == 'global':
+            pontuacoes = self._consultar_pontuacoes("SELECT jogador, pontos FROM pontuacoes")
+        elif escopo == 'categoria':
+            pontuacoes = self._consultar_pontuacoes(SQL_PLACAR_CATEGORIA, (valor,))
+        else:
+            inicio, fim = limites_periodo(escopo, valor)
+            pontuacoes = self._consultar_pontuacoes(SQL_PLACAR_PERIODO, (inicio, fim))
+        return PlacarTopK.de_pontuacoes(self.k, pontuacoes)
+
+    def carregar(self):
+        """Reconstrói os placares global, por categoria e dos períodos atuais"""
+        hoje = datetime.now(timezone.utc).date()
+        with sqlite3.connect(self.db_path) as conn:
+            categorias = [row[0] for row in conn.execute("SELECT nome FROM categorias")]
+
+        placares = OrderedDict({('global', None): self._carregar_placar('global', None)})
+        for categoria in categorias:
+            placares[('categoria', categoria)] = self._carregar_placar('categoria', categoria)
+        for escopo, valor in (('dia', periodo_dia(hoje)), ('semana', periodo_semana(hoje))):
+            placares[(escopo, valor)] = self._carregar_placar(escopo, valor)
+
+        with self._lock:
+            self._placares = placares
+            self._categorias = set(categorias)
+
+    def _publicar(self, chave: Placar, placar: PlacarTopK) -> PlacarTopK:
+        """Guarda um placar reconstruído (chamado com a trava); vence o que já estiver lá"""
+        existente = self._placares.get(chave)
+        if existente is not None:
+            self._placares.move_to_end(chave)
+            return existente
+        self._placares[chave] = placar
+        self._descartar_periodos_antigos(chave)
+        return placar
+
+    def _descartar_periodos_antigos(self, servido: Placar):
+        """Mantém até `periodos_retidos` placares do escopo, descartando os menos usados"""
+        escopo = servido[0]
+        if escopo not in ('dia', 'semana'):
+            return
+        hoje = datetime.now(timezone.utc).date()
+        atual = (escopo, periodo_dia(hoje) if escopo == 'dia' else periodo_semana(hoje))
+        # O placar que está sendo servido e o do período atual nunca saem
+        retidos = [c for c in self._placares if c[0] == escopo]
+        descartaveis = [c for c in retidos if c not in (servido, atual)]
+        for chave in descartaveis[:max(0, len(retidos) - self.periodos_retidos)]:
+            del self._placares[chave]
+
+    def aplicar(self, lote: List[Tentativa]):
+        """
+        Atualiza os placares em memória com um lote de tentativas já gravado.
+        Placares fora da memória não são carregados aqui: quando forem
+        consultados, a reconstrução já lê o lote do banco.
+        """
+        with self._lock:
+            for t in lote:
+                if t.pontos <= 0:
+                    continue
+                if t.categoria:
+                    self._categorias.add(t.categoria)
+                data = date.fromisoformat(t.data_criacao[:10])
+                for chave in (
+                    ('global', None),
+                    ('categoria', t.categoria),
+                    ('dia', periodo_dia(data)),
+                    ('semana', periodo_semana(data)),
+                ):
+                    placar = self._placares.get(chave)
+                    if placar is not None:
+                        placar.somar(t.jogador, t.pontos)
+
+    def consultar(self, escopo: str, valor: Optional[str] = None,
+                  k: Optional[int] = None) -> Tuple[str, Optional[str], int, List[Tuple[str, int]]]:
+        """
+        Retorna (escopo, valor, versão, [(jogador, pontos), ...]) com os k
+        primeiros do placar. Para 'dia' e 'semana' o valor padrão é o período atual.
+        """
+        if escopo not in ESCOPOS:
+            raise ValueError(f"Escopo inválido: {escopo}")
+        if escopo == 'global':
+            valor = None
+        elif escopo == 'categoria':
+            if not valor:
+                raise ValueError("Informe a categoria")
+            with self._lock:
+                conhecida = valor in self._categorias
+            if not conhecida:
+                raise ValueError(f"Categoria desconhecida: {valor}")
+        elif escopo in ('dia', 'semana'):
+            hoje = datetime.now(timezone.utc).date()
+            if not valor:
+                valor = periodo_dia(hoje) if escopo == 'dia' else periodo_semana(hoje)
+            limites_periodo(escopo, valor)  # valida o formato
+
+        k = min(k or self.k, self.k)
+        chave = (escopo, valor)
+        with self._lock:
+            placar = self._placares.get(chave)
+            if placar is not None:
+                self._placares.move_to_end(chave)
+                return escopo, valor, placar.versao, placar.primeiros(k)
+
+        # Reconstrução fora da trava; se outra requisição publicar antes, usa a dela
+        placar = self._carregar_placar(escopo, valor)
+        with self._lock:
+            placar = self._publicar(chave, placar)
+            return escopo, valor, placar.versao, placar.primeiros(k)
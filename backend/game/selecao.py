@@ -0,0 +1,222 @@
+import random
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from backend.config import LIMITE_FRASES
+
+# Distribuição de dificuldade (1 a 5) sorteada para cada nível de jogador
+DISTRIBUICAO_POR_NIVEL: Dict[int, Dict[int, float]] = {
+    1: {1: 0.50, 2: 0.30, 3: 0.15, 4: 0.05, 5: 0.00},
+    2: {1: 0.25, 2: 0.40, 3: 0.25, 4: 0.10, 5: 0.00},
+    3: {1: 0.10, 2: 0.25, 3: 0.35, 4: 0.20, 5: 0.10},
+    4: {1: 0.05, 2: 0.10, 3: 0.25, 4: 0.35, 5: 0.25},
+    5: {1: 0.00, 2: 0.05, 3: 0.15, 4: 0.35, 5: 0.45},
+}
+
+Balde = Tuple[str, int]  # (categoria, dificuldade)
+
+
+class TabelaAlias:
+    """Tabela de alias de Walker (construção de Vose): sorteio ponderado em O(1)"""
+
+    __slots__ = ('itens', 'prob', 'alias')
+
+    def __init__(self, pesos: Sequence[Tuple[Hashable, float]]):
+        pesos = [(item, peso) for item, peso in pesos if peso > 0]
+        self.itens = [item for item, _ in pesos]
+        n = len(pesos)
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        if not n:
+            return
+
+        total = sum(peso for _, peso in pesos)
+        escalados = [peso * n / total for _, peso in pesos]
+        pequenos = [i for i, p in enumerate(escalados) if p < 1.0]
+        grandes = [i for i, p in enumerate(escalados) if p >= 1.0]
+
+        while pequenos and grandes:
+            menor, maior = pequenos.pop(), grandes.pop()
+            self.prob[menor] = escalados[menor]
+            self.alias[menor] = maior
+            escalados[maior] = (escalados[maior] + escalados[menor]) - 1.0
+            (pequenos if escalados[maior] < 1.0 else grandes).append(maior)
+
+        # Sobras ficam com probabilidade 1 (erros de arredondamento)
+        for i in pequenos + grandes:
+            self.prob[i] = 1.0
+
+    def __bool__(self) -> bool:
+        return bool(self.itens)
+
+    def sortear(self, rng: random.Random) -> Hashable:
+        i = rng.randrange(len(self.itens))
+        return self.itens[i] if rng.random() < self.prob[i] else self.itens[self.alias[i]]
+
+
+class SeletorPalavras:
+    """
+    Sorteio de palavras elegíveis (com menos de LIMITE_FRASES frases) por
+    categoria, dificuldade alvo ou nível do jogador.
+
+    As palavras ficam em baldes por (categoria, dificuldade) com remoção por
+    troca com o último elemento. Cada filtro tem uma tabela de alias sobre os
+    baldes, reconstruída só quando um balde do filtro muda; o sorteio escolhe
+    o balde pela tabela e a palavra uniformemente dentro dele.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self._baldes: Dict[Balde, List[int]] = {}
+        self._posicoes: Dict[int, Tuple[Balde, int]] = {}
+        self._tabelas: Dict[tuple, TabelaAlias] = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+
+    def carregar(self, db_path: str | Path):
+        """Recria os baldes com as palavras elegíveis do banco"""
+        with sqlite3.connect(str(db_path)) as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT p.id, c.nome, p.dificuldade
+                FROM palavras p
+                JOIN categorias c ON p.categoria_id = c.id
+                LEFT JOIN (
+                    SELECT palavra_id, COUNT(*) AS cnt FROM frases GROUP BY palavra_id
+                ) f ON p.id = f.palavra_id
+                WHERE IFNULL(f.cnt, 0) < ?
+                """,
+                (LIMITE_FRASES,),
+            )
+            linhas = cursor.fetchall()
+
+        with self._lock:
+            self._baldes.clear()
+            self._posicoes.clear()
+            self._tabelas.clear()
+            for palavra_id, categoria, dificuldade in linhas:
+                self._inserir(palavra_id, categoria, dificuldade or 1)
+
+    def _inserir(self, palavra_id: int, categoria: str, dificuldade: int):
+        balde = (categoria, dificuldade)
+        ids = self._baldes.setdefault(balde, [])
+        self._posicoes[palavra_id] = (balde, len(ids))
+        ids.append(palavra_id)
+        self._invalidar(categoria)
+
+    def _invalidar(self, categoria: str):
+        for chave in [k for k in self._tabelas if k[0] in (categoria, None)]:
+            del self._tabelas[chave]
+
+    def adicionar(self, palavra_id: int, categoria: str, dificuldade: Optional[int]):
+        """Torna uma palavra (nova ou recém-liberada) elegível para sorteio"""
+        with self._lock:
+            if palavra_id not in self._posicoes:
+                self._inserir(palavra_id, categoria, dificuldade or 1)
+
+    def reavaliar(self, conn: sqlite3.Connection, palavra_ids: Iterable[int]):
+        """
+        Reconta as frases das palavras informadas (ex.: depois de podar ou
+        deduplicar frases) e as devolve ao sorteio ou retira dele conforme
+        ainda tenham vaga para frases.
+        """
+        palavra_ids = list(palavra_ids)
+        for inicio in range(0, len(palavra_ids), 500):
+            lote = palavra_ids[inicio:inicio + 500]
+            marcadores = ",".join("?" * len(lote))
+            linhas = conn.execute(
+                f"""
+                SELECT p.id, c.nome, p.dificuldade,
+                       (SELECT COUNT(*) FROM frases f WHERE f.palavra_id = p.id)
+                FROM palavras p
+                JOIN categorias c ON p.categoria_id = c.id
+                WHERE p.id IN ({marcadores})
+                """,
+                lote,
+            ).fetchall()
+            encontradas = set()
+            for palavra_id, categoria, dificuldade, total in linhas:
+                encontradas.add(palavra_id)
+                if total < LIMITE_FRASES:
+                    self.adicionar(palavra_id, categoria, dificuldade)
+                else:
+                    self.remover(palavra_id)
+            for palavra_id in set(lote) - encontradas:
+                self.remover(palavra_id)
+
+    def remover(self, palavra_id: int):
+        """Retira a palavra do sorteio (ex.: atingiu o limite de frases)"""
+        with self._lock:
+            posicao = self._posicoes.pop(palavra_id, None)
+            if posicao is None:
+                return
+            balde, indice = posicao
+            ids = self._baldes[balde]
+            ultimo = ids.pop()
+            if ultimo != palavra_id:
+                ids[indice] = ultimo
+                self._posicoes[ultimo] = (balde, indice)
+            if not ids:
+                del self._baldes[balde]
+            self._invalidar(balde[0])
+
+    def _pesos(self, categoria: Optional[str], modo: tuple) -> List[Tuple[Balde, float]]:
+        baldes = [
+            (balde, len(ids)) for balde, ids in self._baldes.items()
+            if categoria is None or balde[0] == categoria
+        ]
+        if modo[0] == 'dificuldade':
+            return [(balde, n) for balde, n in baldes if balde[1] == modo[1]]
+        if modo[0] == 'nivel':
+            # Probabilidade da dificuldade dividida entre as categorias
+            # proporcionalmente ao tamanho de cada balde
+            distribuicao = DISTRIBUICAO_POR_NIVEL[modo[1]]
+            por_dificuldade: Dict[int, int] = {}
+            for (_, dificuldade), n in baldes:
+                por_dificuldade[dificuldade] = por_dificuldade.get(dificuldade, 0) + n
+            pesos = [
+                (balde, distribuicao.get(balde[1], 0.0) * n / por_dificuldade[balde[1]])
+                for balde, n in baldes
+            ]
+            # Sem palavras nas dificuldades do nível: cai para o sorteio uniforme
+            if any(peso > 0 for _, peso in pesos):
+                return pesos
+        return baldes
+
+    def sortear(self, categoria: Optional[str] = None, dificuldade: Optional[int] = None,
+                nivel: Optional[int] = None) -> Optional[int]:
+        """
+        Sorteia o id de uma palavra elegível.
+
+        Args:
+            categoria: Restringe a uma categoria (opcional)
+            dificuldade: Dificuldade exata desejada (opcional)
+            nivel: Nível do jogador, usa DISTRIBUICAO_POR_NIVEL (ignorado se
+                `dificuldade` for informada)
+
+        Returns:
+            Id da palavra ou None se nenhuma palavra atende ao filtro
+        """
+        if dificuldade is not None:
+            modo = ('dificuldade', dificuldade)
+        elif nivel is not None:
+            if nivel not in DISTRIBUICAO_POR_NIVEL:
+                raise ValueError(f"Nível inválido: {nivel}")
+            modo = ('nivel', nivel)
+        else:
+            modo = ('uniforme',)
+
+        with self._lock:
+            chave = (categoria, modo)
+            tabela = self._tabelas.get(chave)
+            if tabela is None:
+                tabela = self._tabelas[chave] = TabelaAlias(self._pesos(categoria, modo))
+            if not tabela:
+                return None
+            ids = self._baldes[tabela.sortear(self._rng)]
+            return ids[self._rng.randrange(len(ids))]
+
+    def __len__(self) -> int:
+        return len(self._posicoes)
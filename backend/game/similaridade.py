@@ -0,0 +1,258 @@
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+import time
+import zlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix, vstack
+from sklearn.feature_extraction.text import HashingVectorizer
+
+from backend.config import (
+    AVALIADOR_COMPACTACAO_INTERVALO,
+    AVALIADOR_HASHING_DIMENSAO,
+    AVALIADOR_HASHING_NGRAMAS,
+    DB_PATH,
+)
+from backend.database.schema import get_versao_dados
+
+
+def crc_texto(texto: str) -> int:
+    return zlib.crc32(texto.encode('utf-8'))
+
+
+class BackendSimilaridade(ABC):
+    """
+    Interface dos backends de similaridade vetorial do AvaliadorRespostas.
+
+    Um backend indexa as definições por palavra_id e responde o cosseno
+    entre uma resposta (já pré-processada) e a definição de uma palavra.
+    As subclasses implementam carregar, atualizar, remover, similaridade e,
+    se precisarem, compactar; a sincronização com o banco é comum a todas:
+    quando a versão dos dados muda, as definições são comparadas por CRC e
+    só as diferenças chegam ao backend.
+    """
+
+    nome = ""
+
+    def __init__(self, intervalo: float = AVALIADOR_COMPACTACAO_INTERVALO):
+        self.intervalo = intervalo
+        self.crc: Dict[int, int] = {}  # palavra_id -> CRC da definição indexada
+        self.versao_dados: Optional[Tuple[str, int]] = None
+        self.ultimo_id_variacao = 0
+        self._alteracoes = 0
+        self._callbacks: List[Callable[[List[str]], None]] = []
+        self._parar = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # Operações de cada backend
+
+    @abstractmethod
+    def carregar(self, definicoes: Sequence[Tuple[int, str]]):
+        """Indexa um conjunto inicial de (palavra_id, definição) de uma só vez"""
+
+    @abstractmethod
+    def atualizar(self, palavra_id: int, definicao: str):
+        """Inclui ou substitui a definição de uma palavra"""
+
+    @abstractmethod
+    def remover(self, palavra_id: int):
+        """Retira a definição de uma palavra do índice"""
+
+    @abstractmethod
+    def similaridade(self, texto: str, palavra_id: int) -> Optional[float]:
+        """Cosseno entre o texto e a definição da palavra; None se a palavra não estiver indexada"""
+
+    def compactar(self):
+        """Reorganiza o índice depois de atualizações (opcional)"""
+        self._alteracoes = 0
+
+    def metricas(self) -> dict:
+        return {"documentos": len(self.crc), "alteracoes_pendentes": self._alteracoes}
+
+    # Sincronização com o banco
+
+    def ao_sincronizar(self, callback: Callable[[List[str]], None]):
+        """Registra uma função chamada com os textos novos de cada sincronização"""
+        self._callbacks.append(callback)
+
+    def sincronizar(self, db_path: str | Path = DB_PATH) -> int:
+        """Aplica as definições novas, alteradas e removidas no banco; retorna quantas mudaram"""
+        with sqlite3.connect(str(db_path)) as conn:
+            versao = get_versao_dados(conn)
+            if versao == self.versao_dados:
+                return 0
+            definicoes = conn.execute("SELECT id, definicao FROM palavras").fetchall()
+            variacoes = conn.execute(
+                "SELECT id, variacao FROM variacoes_aceitas WHERE id > ? ORDER BY id",
+                (self.ultimo_id_variacao,),
+            ).fetchall()
+
+        if self.versao_dados is None:
+            # Primeira carga: os demais artefatos já partem destes textos
+            self.carregar(definicoes)
+            self.crc = {palavra_id: crc_texto(definicao) for palavra_id, definicao in definicoes}
+            self.ultimo_id_variacao = variacoes[-1][0] if variacoes else 0
+            self.versao_dados = versao
+            return len(definicoes)
+
+        novos_textos = []
+        vistos = set()
+        for palavra_id, definicao in definicoes:
+            vistos.add(palavra_id)
+            crc = crc_texto(definicao)
+            if self.crc.get(palavra_id) != crc:
+                self.atualizar(palavra_id, definicao)
+                self.crc[palavra_id] = crc
+                novos_textos.append(definicao)
+        removidos = [palavra_id for palavra_id in self.crc if palavra_id not in vistos]
+        for palavra_id in removidos:
+            self.remover(palavra_id)
+            del self.crc[palavra_id]
+        if variacoes:
+            self.ultimo_id_variacao = variacoes[-1][0]
+            novos_textos += [variacao for _, variacao in variacoes]
+
+        self.versao_dados = versao
+        if novos_textos:
+            for callback in self._callbacks:
+                callback(novos_textos)
+        return len(novos_textos) + len(removidos)
+
+    def _executar(self, db_path: str | Path):
+        while not self._parar.wait(self.intervalo):
+            try:
+                self.sincronizar(db_path)
+            except sqlite3.Error as e:
+                print(f"[WARN] Falha ao sincronizar o backend '{self.nome}': {e}")
+            if self._alteracoes:
+                self.compactar()
+
+    def iniciar(self, db_path: str | Path = DB_PATH):
+        """Inicia a sincronização e compactação periódicas"""
+        self._parar.clear()
+        self._thread = threading.Thread(
+            target=self._executar, args=(db_path,), name=f"backend-{self.nome}", daemon=True
+        )
+        self._thread.start()
+
+    def parar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+class BackendHashing(BackendSimilaridade):
+    """
+    Similaridade por n-gramas de caracteres com HashingVectorizer.
+
+    Não há treino nem vocabulário: os n-gramas caem direto em
+    `dimensao` colunas, então o modelo tem tamanho fixo e uma palavra nova
+    só precisa ter sua linha calculada. As linhas das definições ficam
+    normalizadas (L2) em uma matriz CSR float32; linhas novas ou alteradas
+    ficam à parte até a compactação, que as junta à matriz.
+    """
+
+    nome = "hashing"
+
+    def __init__(self, preprocessar: Callable[[str], str], dimensao: int = AVALIADOR_HASHING_DIMENSAO,
+                 ngramas: Tuple[int, int] = AVALIADOR_HASHING_NGRAMAS,
+                 intervalo: float = AVALIADOR_COMPACTACAO_INTERVALO):
+        super().__init__(intervalo)
+        self.vectorizer = HashingVectorizer(
+            preprocessor=preprocessar,
+            analyzer='char_wb',
+            ngram_range=ngramas,
+            n_features=dimensao,
+            alternate_sign=False,
+            norm='l2',
+            dtype=np.float32,
+        )
+        self.matriz = csr_matrix((0, dimensao), dtype=np.float32)
+        self.linha_por_id: Dict[int, int] = {}
+        self.pendentes: Dict[int, Optional[csr_matrix]] = {}  # None marca remoção
+        self._lock = threading.Lock()
+        self._contadores = {"atualizacoes": 0, "compactacoes": 0}
+        self._ultima_compactacao = 0.0
+
+    def _vetorizar(self, textos: Iterable[str]) -> csr_matrix:
+        return self.vectorizer.transform(textos).astype(np.float32, copy=False)
+
+    def carregar(self, definicoes: Sequence[Tuple[int, str]]):
+        ids = [palavra_id for palavra_id, _ in definicoes]
+        matriz = self._vetorizar([definicao for _, definicao in definicoes]) if ids else self.matriz[:0]
+        with self._lock:
+            self.matriz = matriz.tocsr()
+            self.linha_por_id = {palavra_id: i for i, palavra_id in enumerate(ids)}
+            self.pendentes = {}
+
+    def atualizar(self, palavra_id: int, definicao: str):
+        linha = self._vetorizar([definicao])
+        with self._lock:
+            self.pendentes[palavra_id] = linha
+            self._alteracoes += 1
+            self._contadores["atualizacoes"] += 1
+
+    def remover(self, palavra_id: int):
+        with self._lock:
+            self.pendentes[palavra_id] = None
+            self._alteracoes += 1
+
+    def _linha(self, palavra_id: int) -> Optional[csr_matrix]:
+        if palavra_id in self.pendentes:
+            return self.pendentes[palavra_id]
+        i = self.linha_por_id.get(palavra_id)
+        return None if i is None else self.matriz[i]
+
+    def similaridade(self, texto: str, palavra_id: int) -> Optional[float]:
+        with self._lock:
+            linha = self._linha(palavra_id)
+        if linha is None:
+            return None
+        vetor = self._vetorizar([texto])
+        return min(1.0, float(linha.multiply(vetor).sum()))
+
+    def compactar(self):
+        """
+        Junta as linhas pendentes à matriz principal. A nova matriz é montada
+        fora da trava a partir de uma cópia do estado; sob a trava só há a
+        troca das referências, mantendo pendentes as linhas que chegaram
+        durante a montagem.
+        """
+        inicio = time.perf_counter()
+        with self._lock:
+            matriz, linha_por_id, pendentes = self.matriz, self.linha_por_id, dict(self.pendentes)
+            self._alteracoes = 0
+
+        if pendentes:
+            mantidos = [(palavra_id, i) for palavra_id, i in linha_por_id.items() if palavra_id not in pendentes]
+            novos = [(palavra_id, linha) for palavra_id, linha in pendentes.items() if linha is not None]
+            indices = np.fromiter((i for _, i in mantidos), dtype=np.int64, count=len(mantidos))
+            partes = [matriz[indices]] + [linha for _, linha in novos]
+            nova_matriz = vstack(partes, format='csr', dtype=np.float32)
+            ids = [palavra_id for palavra_id, _ in mantidos] + [palavra_id for palavra_id, _ in novos]
+            nova_linha_por_id = {palavra_id: i for i, palavra_id in enumerate(ids)}
+
+        with self._lock:
+            if pendentes:
+                self.matriz, self.linha_por_id = nova_matriz, nova_linha_por_id
+                self.pendentes = {
+                    palavra_id: linha for palavra_id, linha in self.pendentes.items()
+                    if palavra_id not in pendentes or pendentes[palavra_id] is not linha
+                }
+            self._contadores["compactacoes"] += 1
+        self._ultima_compactacao = time.perf_counter() - inicio
+
+    def metricas(self) -> dict:
+        with self._lock:
+            return {
+                **self._contadores,
+                "documentos": len(self.crc),
+                "linhas_pendentes": len(self.pendentes),
+                "bytes_matriz": self.matriz.data.nbytes + self.matriz.indices.nbytes + self.matriz.indptr.nbytes,
+                "alteracoes_pendentes": self._alteracoes,
+                "ultima_compactacao_ms": round(self._ultima_compactacao * 1000, 3),
+            }
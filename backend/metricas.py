@@ -0,0 +1,19 @@
+from typing import Callable, Dict
+
+# Provedores de métricas registrados pelos serviços (nome -> função que
+# devolve um dicionário com os valores atuais)
+_provedores: Dict[str, Callable[[], dict]] = {}
+
+def registrar_provedor(nome: str, provedor: Callable[[], dict]):
+    """Registra (ou substitui) a função que expõe as métricas de um serviço"""
+    _provedores[nome] = provedor
+
+def coletar() -> Dict[str, dict]:
+    """Retorna um retrato das métricas de todos os serviços registrados"""
+    resultado = {}
+    for nome, provedor in list(_provedores.items()):
+        try:
+            resultado[nome] = provedor()
+        except Exception as e:
+            resultado[nome] = {"erro": str(e)}
+    return resultado
@@ -0,0 +1,214 @@
+import hashlib
+import mmap
+import os
+import sqlite3
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+
+from backend.database.catalogo import CatalogoPalavras, ColunaTexto
+from backend.database.schema import get_versao_dados
+
+# Layout do arquivo (little-endian):
+#   cabeçalho: mágica, versão do formato, nº de seções, versão dos dados,
+#              instância do banco (16 bytes) e SHA-256 de tudo após o cabeçalho
+#   tabela de seções: nome, tipo (typecode do array), deslocamento, tamanho
+#   dados de cada seção, alinhados em 8 bytes
+MAGICA = b'SPJSNAP\0'
+VERSAO_FORMATO = 1
+_CABECALHO = struct.Struct('<8sIIQ16s32s')
+_SECAO = struct.Struct('<24s1s7xQQ')
+_ALINHAMENTO = 8
+
+# Typecodes de array e os dtypes numpy equivalentes
+_DTYPES = {'i': np.int32, 'I': np.uint32, 'f': np.float32, 'd': np.float64}
+
+_COLUNAS_TEXTO = ('termos', 'definicoes', 'categorias_nomes', 'vocabulario', 'radicais')
+
+
+class SnapshotInvalido(Exception):
+    pass
+
+
+def _secoes_texto(nome: str, coluna: ColunaTexto) -> List[Tuple[str, str, bytes]]:
+    return [
+        (f"{nome}.dados", 'B', bytes(coluna.dados)),
+        (f"{nome}.offsets", 'I', array('I', coluna.offsets).tobytes()),
+    ]
+
+
+def _escrever(caminho: Path, versao_dados: Tuple[str, int], secoes: List[Tuple[str, str, bytes]]):
+    inicio_dados = _CABECALHO.size + _SECAO.size * len(secoes)
+    tabela, corpo = [], bytearray()
+    for nome, tipo, dados in secoes:
+        deslocamento = inicio_dados + len(corpo)
+        pad = -deslocamento % _ALINHAMENTO
+        corpo += b'\0' * pad
+        deslocamento += pad
+        tabela.append(_SECAO.pack(nome.encode('ascii'), tipo.encode('ascii'), deslocamento, len(dados)))
+        corpo += dados
+
+    conteudo = b''.join(tabela) + bytes(corpo)
+    instancia, versao = versao_dados
+    cabecalho = _CABECALHO.pack(
+        MAGICA, VERSAO_FORMATO, len(secoes), versao,
+        instancia.encode('ascii')[:16], hashlib.sha256(conteudo).digest(),
+    )
+
+    # Grava em arquivo temporário e troca de forma atômica
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    temporario = caminho.with_suffix(caminho.suffix + '.tmp')
+    with open(temporario, 'wb') as f:
+        f.write(cabecalho)
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+def gerar_snapshot(db_path: str | Path, caminho: str | Path, avaliador=None) -> Tuple[str, int]:
+    """
+    Monta catálogo, índice de termos, modelo TF-IDF (vocabulário, IDF e
+    matriz das definições) e radicais das definições, e grava tudo em um
+    único arquivo versionado.
+
+    Returns:
+        Carimbo (instância, versão) do banco usado
+    """
+    if avaliador is None:
+        from backend.game.processamento import AvaliadorRespostas
+        avaliador = AvaliadorRespostas()
+
+    with sqlite3.connect(str(db_path)) as conn:
+        versao_dados = get_versao_dados(conn)
+    catalogo = CatalogoPalavras.construir(db_path)
+
+    definicoes = [d.lower() for d in catalogo.definicoes]
+    avaliador.treinar_modelo(definicoes)
+    secoes = []
+    if avaliador.modelo_treinado:
+        vocabulario = sorted(avaliador.vectorizer.vocabulary_, key=avaliador.vectorizer.vocabulary_.get)
+        matriz = avaliador.vectorizer.transform(
+            [avaliador._preprocessar_texto(d) for d in definicoes]
+        ).astype(np.float32)
+        secoes += _secoes_texto('vocabulario', ColunaTexto.de_textos(vocabulario))
+        secoes += [
+            ('idf', 'd', np.asarray(avaliador.vectorizer.idf_, dtype=np.float64).tobytes()),
+            ('matriz.dados', 'f', matriz.data.tobytes()),
+            ('matriz.indices', 'i', matriz.indices.astype(np.int32).tobytes()),
+            ('matriz.indptr', 'i', matriz.indptr.astype(np.int32).tobytes()),
+        ]
+    radicais = ColunaTexto.de_textos(" ".join(sorted(avaliador.radicais(d))) for d in definicoes)
+    secoes += _secoes_texto('radicais', radicais)
+
+    secoes += [
+        ('ids', 'i', catalogo.ids.tobytes()),
+        ('dificuldades', 'b', catalogo.dificuldades.tobytes()),
+        ('categorias', 'H', catalogo.categorias.tobytes()),
+        ('categorias_ids', 'i', array('i', catalogo.ids_categorias).tobytes()),
+        ('linha_por_id', 'i', catalogo.linha_por_id_.tobytes()),
+        ('tabela_termos', 'i', catalogo.tabela_termos.tobytes()),
+    ]
+    secoes += _secoes_texto('termos', catalogo.termos)
+    secoes += _secoes_texto('definicoes', catalogo.definicoes)
+    secoes += _secoes_texto('categorias_nomes', ColunaTexto.de_textos(catalogo.nomes_categorias))
+
+    _escrever(Path(caminho), versao_dados, secoes)
+    return versao_dados
+
+
+class Snapshot:
+    """
+    Snapshot aberto via mmap. As seções são memoryviews sobre o arquivo
+    mapeado, sem cópia nem desserialização; o catálogo e a matriz TF-IDF
+    usam essas visões diretamente.
+    """
+
+    def __init__(self, caminho: str | Path, verificar: bool = True):
+        self.caminho = Path(caminho)
+        with open(self.caminho, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._visao = memoryview(self._mmap)
+
+        if len(self._visao) < _CABECALHO.size:
+            raise SnapshotInvalido("Arquivo truncado")
+        magica, versao_formato, n_secoes, versao, instancia, checksum = \
+            _CABECALHO.unpack_from(self._visao)
+        if magica != MAGICA or versao_formato != VERSAO_FORMATO:
+            raise SnapshotInvalido("Formato de snapshot desconhecido")
+        if verificar and hashlib.sha256(self._visao[_CABECALHO.size:]).digest() != checksum:
+            raise SnapshotInvalido("Checksum não confere")
+        self.versao_dados = (instancia.rstrip(b'\0').decode('ascii'), versao)
+
+        self._secoes: Dict[str, memoryview] = {}
+        for i in range(n_secoes):
+            nome, tipo, deslocamento, tamanho = _SECAO.unpack_from(
+                self._visao, _CABECALHO.size + i * _SECAO.size
+            )
+            bruto = self._visao[deslocamento:deslocamento + tamanho]
+            self._secoes[nome.rstrip(b'\0').decode('ascii')] = bruto.cast(tipo.decode('ascii'))
+
+        textos = {
+            nome: ColunaTexto(self._secoes[f"{nome}.dados"], self._secoes[f"{nome}.offsets"])
+            for nome in _COLUNAS_TEXTO if f"{nome}.dados" in self._secoes
+        }
+        self.catalogo = CatalogoPalavras(
+            ids=self._secoes['ids'],
+            dificuldades=self._secoes['dificuldades'],
+            categorias=self._secoes['categorias'],
+            nomes_categorias=list(textos['categorias_nomes']),
+            ids_categorias=self._secoes['categorias_ids'].tolist(),
+            termos=textos['termos'],
+            definicoes=textos['definicoes'],
+            linha_por_id=self._secoes['linha_por_id'],
+            tabela_termos=self._secoes['tabela_termos'],
+        )
+        self.radicais = textos['radicais']
+        self.vocabulario = textos.get('vocabulario')
+
+    @property
+    def tem_tfidf(self) -> bool:
+        return self.vocabulario is not None
+
+    def _array(self, nome: str) -> np.ndarray:
+        secao = self._secoes[nome]
+        return np.frombuffer(secao, dtype=_DTYPES[secao.format])
+
+    @property
+    def idf(self) -> np.ndarray:
+        return self._array('idf')
+
+    def matriz_definicoes(self) -> csr_matrix:
+        """Matriz TF-IDF das definições (uma linha por linha do catálogo)"""
+        indptr = self._array('matriz.indptr')
+        return csr_matrix(
+            (self._array('matriz.dados'), self._array('matriz.indices'), indptr),
+            shape=(len(indptr) - 1, len(self.vocabulario)),
+            copy=False,
+        )
+
+
+def carregar_snapshot(caminho: str | Path, db_path: str | Path,
+                      verificar: bool = True) -> Optional[Snapshot]:
+    """
+    Abre o snapshot se ele existir, estiver íntegro e tiver sido gerado a
+    partir da versão atual do banco; caso contrário retorna None.
+    """
+    if not Path(caminho).exists():
+        return None
+    try:
+        snapshot = Snapshot(caminho, verificar=verificar)
+    except (OSError, ValueError, KeyError, struct.error, SnapshotInvalido) as e:
+        print(f"[WARN] Snapshot ignorado: {e}")
+        return None
+
+    with sqlite3.connect(str(db_path)) as conn:
+        atual = get_versao_dados(conn)
+    if snapshot.versao_dados != atual:
+        print(f"[INFO] Snapshot desatualizado ({snapshot.versao_dados} != {atual})")
+        return None
+    return snapshot
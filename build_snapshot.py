@@ -0,0 +1,21 @@
+import time
+from backend.config import DB_PATH, SNAPSHOT_PATH
+from backend.database.schema import criar_banco
+from backend.snapshot import gerar_snapshot
+
+def main():
+    """Gera o snapshot pré-compilado do caminho de leitura"""
+    print(f"🔧 Gerando snapshot de {DB_PATH}...")
+
+    # Garante a tabela de versão em bancos antigos
+    if not criar_banco(DB_PATH):
+        print("❌ Erro ao preparar o banco")
+        return
+
+    inicio = time.perf_counter()
+    instancia, versao = gerar_snapshot(DB_PATH, SNAPSHOT_PATH)
+    duracao = time.perf_counter() - inicio
+    print(f"✅ Snapshot gravado em {SNAPSHOT_PATH} (banco {instancia} v{versao}, {duracao:.2f}s)")
+
+if __name__ == "__main__":
+    main()
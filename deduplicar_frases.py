@@ -0,0 +1,30 @@
+import sqlite3
+from backend.config import DB_PATH
+from backend.database.migracoes import migrar
+from backend.database.schema import criar_banco
+from backend.game.deduplicacao import DetectorDuplicatas
+
+def main():
+    """Script de manutenção: remove frases quase duplicadas já gravadas"""
+    print(f"🔧 Deduplicando frases em {DB_PATH}...")
+
+    # Garante colunas e tabelas de assinatura em bancos antigos
+    if not criar_banco(DB_PATH):
+        print("❌ Erro ao preparar o banco")
+        return
+    migrar(DB_PATH)
+
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        resumo = DetectorDuplicatas().deduplicar(conn)
+    finally:
+        conn.close()
+
+    print(f"ℹ Frases analisadas: {resumo['analisadas']}")
+    print(f"ℹ Assinaturas preenchidas: {resumo['assinadas']}")
+    print(f"✅ Quase duplicatas removidas: {resumo['removidas']}")
+    if resumo['removidas']:
+        print("ℹ Palavras que voltaram a ter vaga para frases entram no sorteio quando o servidor reiniciar")
+
+if __name__ == "__main__":
+    main()
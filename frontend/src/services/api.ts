@@ -20,6 +20,7 @@ export interface PalavraResposta {
 export interface VerificacaoRequest {
   palavra: string;
   resposta: string;
+  jogador?: string;
 }
 
 export interface VerificacaoResposta {
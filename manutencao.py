@@ -0,0 +1,41 @@
+import argparse
+from backend.config import DB_PATH, MANUTENCAO_TAREFAS
+from backend.database.manutencao import AgendadorManutencao, ativar_vacuo_incremental, interpretar_tarefas
+from backend.database.migracoes import migrar
+from backend.database.schema import criar_banco
+from backend.game.gerador_frases import GeradorFrases
+from backend.game.limitador import CLASSE_BACKGROUND
+
+def main():
+    """Script de manutenção: executa uma vez as tarefas de manutenção do banco"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--tarefas", default=",".join(interpretar_tarefas(MANUTENCAO_TAREFAS)),
+                        help="Tarefas separadas por vírgula (checkpoint, estatisticas, vacuo, "
+                             "podar_frases, substituir_frases)")
+    parser.add_argument("--vacuo-incremental", action="store_true",
+                        help="Converte o banco para auto_vacuum INCREMENTAL (VACUUM completo, uma vez)")
+    args = parser.parse_args()
+
+    print(f"🔧 Manutenção de {DB_PATH}...")
+    if not criar_banco(DB_PATH):
+        print("❌ Erro ao preparar o banco")
+        return
+    migrar(DB_PATH)
+
+    if args.vacuo_incremental:
+        if ativar_vacuo_incremental(DB_PATH):
+            print("✅ Banco convertido para auto_vacuum INCREMENTAL")
+        else:
+            print("ℹ O banco já usa auto_vacuum INCREMENTAL")
+
+    nomes = [nome.strip() for nome in args.tarefas.split(',') if nome.strip()]
+    gerador = GeradorFrases(classe=CLASSE_BACKGROUND) if "substituir_frases" in nomes else None
+    agendador = AgendadorManutencao(DB_PATH, gerador=gerador, tarefas={nome: 0 for nome in nomes})
+    for nome in nomes:
+        resultado = agendador.executar_tarefa(nome)
+        metricas = agendador.metricas()[nome]
+        print(f"ℹ {nome} ({metricas['ultima_ms']} ms, maior trava {metricas['maior_trava_ms']} ms): {resultado}")
+    print("✅ Manutenção concluída")
+
+if __name__ == "__main__":
+    main()
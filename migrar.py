@@ -0,0 +1,42 @@
+import argparse
+import sys
+from backend.config import DB_PATH
+from backend.database.migracoes import migrar, planos_consultas, verificar_planos, versao_esquema
+from backend.database.schema import criar_banco
+import sqlite3
+
+def main():
+    """Aplica as migrações pendentes e, com --verificar, confere os planos das consultas quentes"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--verificar", action="store_true",
+                        help="Falha se alguma consulta quente fizer varredura completa de tabela")
+    args = parser.parse_args()
+
+    print(f"🔧 Migrando {DB_PATH}...")
+    if not criar_banco(DB_PATH):
+        print("❌ Erro ao preparar o banco")
+        sys.exit(2)
+    aplicadas = migrar(DB_PATH)
+    with sqlite3.connect(DB_PATH) as conn:
+        versao = versao_esquema(conn)
+    print(f"✅ Esquema na versão {versao} ({len(aplicadas)} migração(ões) aplicada(s))")
+
+    if not args.verificar:
+        return
+
+    print("\n=== Planos das consultas quentes ===")
+    for nome, detalhes in planos_consultas(DB_PATH):
+        print(f"{nome}:")
+        for detalhe in detalhes:
+            print(f"    {detalhe}")
+
+    problemas = verificar_planos(DB_PATH)
+    if problemas:
+        print("\n❌ Varreduras completas encontradas:")
+        for nome, detalhe in problemas:
+            print(f"  {nome}: {detalhe}")
+        sys.exit(1)
+    print("\n✅ Nenhuma consulta quente faz varredura completa")
+
+if __name__ == "__main__":
+    main()
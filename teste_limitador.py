@@ -0,0 +1,127 @@
+"""
+Teste manual do limitador de chamadas ao LLM contra um servidor local que
+imita a API de chat do Mistral e responde 429 acima de uma taxa fixa.
+
+Vários processos geram frases ao mesmo tempo usando o mesmo arquivo de
+estado; o servidor conta quantas chamadas recebeu e quantas recusou.
+
+Uso: python teste_limitador.py [processos] [frases_por_processo]
+"""
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Taxa aceita pelo servidor simulado (chamadas por segundo)
+TAXA_SERVIDOR = 2.0
+
+
+class ServidorSimulado(BaseHTTPRequestHandler):
+    lock = threading.Lock()
+    ultimas = []
+    aceitas = 0
+    recusadas = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        tamanho = int(self.headers.get('Content-Length', 0))
+        corpo = json.loads(self.rfile.read(tamanho) or b'{}')
+        agora = time.time()
+        cls = ServidorSimulado
+        with cls.lock:
+            cls.ultimas = [t for t in cls.ultimas if agora - t < 1.0]
+            excedeu = len(cls.ultimas) >= TAXA_SERVIDOR
+            if excedeu:
+                cls.recusadas += 1
+            else:
+                cls.ultimas.append(agora)
+                cls.aceitas += 1
+
+        if excedeu:
+            resposta, status = {"message": "Requests rate limit exceeded"}, 429
+        else:
+            status = 200
+            resposta = {
+                "id": "simulado", "object": "chat.completion", "created": int(agora),
+                "model": corpo.get("model", "mistral-tiny"),
+                "choices": [{
+                    "index": 0, "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "Uma frase de exemplo simulada."},
+                }],
+                "usage": {"prompt_tokens": 50, "completion_tokens": 12, "total_tokens": 62},
+            }
+        dados = json.dumps(resposta).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(dados)))
+        if excedeu:
+            self.send_header('Retry-After', '1')
+        self.end_headers()
+        self.wfile.write(dados)
+
+
+def trabalhador(classe: str, quantidade: int, resultados):
+    from backend.game.gerador_frases import GeradorFrases
+
+    gerador = GeradorFrases(classe=classe)
+    padrao = gerador.gerar_frase_padrao("teste")
+    geradas = sum(
+        gerador.gerar_frase_unica("teste", "algo de teste", "Geral") != padrao
+        for _ in range(quantidade)
+    )
+    resultados.put((classe, geradas, quantidade))
+
+
+def main():
+    processos = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    por_processo = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorSimulado)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    estado = os.path.join(tempfile.mkdtemp(), "limitador.db")
+    os.environ.update(
+        MISTRAL_API_KEY=os.environ.get('MISTRAL_API_KEY', 'chave-de-teste'),
+        MISTRAL_BASE_URL=f"http://127.0.0.1:{servidor.server_port}/v1",
+        LIMITADOR_PATH=estado,
+        # Orçamento acima da taxa do servidor, para provocar alguns 429
+        LIMITADOR_INTERATIVO=os.environ.get('LIMITADOR_INTERATIVO', "3:3:10"),
+        LIMITADOR_BACKGROUND=os.environ.get('LIMITADOR_BACKGROUND', "1:1:30"),
+    )
+
+    print(f"=== {processos} processos x {por_processo} frases, servidor aceita {TAXA_SERVIDOR}/s ===")
+    resultados = multiprocessing.Queue()
+    inicio = time.time()
+    filhos = [
+        multiprocessing.Process(
+            target=trabalhador,
+            args=("interativa" if i % 2 == 0 else "background", por_processo, resultados),
+        )
+        for i in range(processos)
+    ]
+    for filho in filhos:
+        filho.start()
+    for filho in filhos:
+        filho.join()
+    duracao = time.time() - inicio
+
+    while not resultados.empty():
+        classe, geradas, total = resultados.get()
+        print(f"{classe}: {geradas}/{total} frases geradas pelo modelo")
+
+    from backend.game.limitador import LimitadorTaxa
+    print(f"\nServidor: {ServidorSimulado.aceitas} aceitas, {ServidorSimulado.recusadas} com 429 "
+          f"em {duracao:.1f}s ({ServidorSimulado.aceitas / duracao:.2f}/s)")
+    print("Custos registrados no arquivo compartilhado:")
+    print(json.dumps(LimitadorTaxa(estado).metricas(), indent=2, ensure_ascii=False))
+    servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()